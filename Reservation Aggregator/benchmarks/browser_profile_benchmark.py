@@ -0,0 +1,78 @@
+# Dependencies
+import sys
+import os
+import time
+import argparse
+
+# Construct Python path env variable
+# Get the directory of the current script (benchmarks/browser_profile_benchmark.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the project root to the Python path so the services can be resolved
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+# Optional, per driver memory is only reported when it's installed
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Services
+from src.services.resy_scraper import ResyScraper
+from src.services.resy_browser_profile import BrowserProfiles
+
+# To run this benchmark, use this terminal command: python benchmarks/browser_profile_benchmark.py --links-file venues.txt
+# Parses the same fixed sample of venue pages (one URL per line) in a single headless browser per profile and reports
+# pages/min and the driver's peak memory (Chrome + chromedriver processes, requires psutil). Requires Chrome and the scraper's .env
+# ex.) python benchmarks/browser_profile_benchmark.py --links-file venues.txt --profiles default lean
+def driver_memory_bytes(scraper: ResyScraper) -> int | None:
+    """Resident memory of the scraper's chromedriver and every browser process it started."""
+    if psutil is None:
+        return None
+
+    try:
+        driver_process = psutil.Process(scraper.web_driver.service.process.pid)
+        processes = [driver_process, *driver_process.children(recursive=True)]
+
+        return sum(process.memory_info().rss for process in processes)
+    except psutil.Error:
+        return None
+
+def run_benchmark(venue_page_links: list[str], browser_profile: BrowserProfiles):
+    scraper = ResyScraper(browser_profile=browser_profile)
+    parsed_page_count = 0
+    peak_memory_bytes = None
+
+    try:
+        start_time = time.perf_counter()
+
+        for venue_page_link in venue_page_links:
+            if scraper.parse_restaurant_page_details_for(venue_page_link) is not None:
+                parsed_page_count += 1
+
+            memory_bytes = driver_memory_bytes(scraper)
+
+            if memory_bytes is not None:
+                peak_memory_bytes = max(peak_memory_bytes or 0, memory_bytes)
+
+        elapsed_seconds = time.perf_counter() - start_time
+    finally:
+        scraper.stop_web_driver()
+
+    pages_per_minute = len(venue_page_links) / elapsed_seconds * 60
+    memory = f"{peak_memory_bytes / 1024 / 1024:.0f} MB" if peak_memory_bytes is not None else "n/a (pip install psutil)"
+
+    print(f"{browser_profile.value:<8} | {pages_per_minute:.1f} pages/min | peak driver memory {memory} | {parsed_page_count}/{len(venue_page_links)} pages parsed")
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Throughput and memory of the headless browser profiles over a fixed venue sample")
+    argument_parser.add_argument('--links-file', required=True, help="File with one venue page URL per line")
+    argument_parser.add_argument('--profiles', nargs='+', choices=[profile.value for profile in BrowserProfiles], default=[profile.value for profile in BrowserProfiles])
+    arguments = argument_parser.parse_args()
+
+    with open(arguments.links_file) as links_file:
+        venue_page_links = [line.strip() for line in links_file if line.strip()]
+
+    for profile in arguments.profiles:
+        run_benchmark(venue_page_links, BrowserProfiles(profile))
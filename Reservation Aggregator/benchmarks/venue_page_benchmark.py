@@ -0,0 +1,117 @@
+# Dependencies
+import sys
+import os
+import time
+import glob
+import argparse
+import tempfile
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# Construct Python path env variable
+# Get the directory of the current script (benchmarks/venue_page_benchmark.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the project root to the Python path so the services can be resolved
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+# Services
+from src.services.resy_venue_page_parser import ResyVenuePageFetcher
+
+# To run this benchmark, use this terminal command: python benchmarks/venue_page_benchmark.py
+# Serves locally saved venue pages (ex.) "Save Page As..." on https://resy.com/cities/ny/venues/<alias>) and parses each one
+# through the HTTP fast path and, with --browser, through the headless browser (requires Chrome and the scraper's .env)
+# ex.) python benchmarks/venue_page_benchmark.py --pages-directory ~/resy_pages --repeat 5 --browser
+# Without saved pages a synthetic page mirroring the venue page markup is used
+SYNTHETIC_VENUE_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta property="og:image" content="https://image.resy.com/3/003/2/{venue_id}/hero.jpg">
+<title>{alias} - New York, NY | Resy</title>
+{padding}
+</head>
+<body>
+<div class="VenuePage">
+<h1 class="VenuePage__venue-title">Synthetic Venue {venue_id}</h1>
+<div class="VenueLocationSummary__content__info">
+<span>West Village</span>
+<span>{venue_id} Bleecker St, New York, NY 10014</span>
+</div>
+</div>
+</body>
+</html>
+"""
+
+def write_synthetic_pages(directory: str, page_count: int = 20):
+    # Venue pages are mostly inlined scripts and styles, pad the page to a comparable size
+    padding = "<script>" + "window.__resy = window.__resy || {};" * 8000 + "</script>"
+
+    for venue_id in range(page_count):
+        alias = f"synthetic-venue-{venue_id}"
+
+        with open(os.path.join(directory, f"{alias}.html"), 'w') as page_file:
+            page_file.write(SYNTHETIC_VENUE_PAGE.format(venue_id=venue_id, alias=alias, padding=padding))
+
+"""
+Parses every page once per repeat with the given parse function, returns the average seconds per page
+and the amount of pages whose details could be parsed.
+"""
+def time_pages(parse_restaurant_page_details_for, page_links: list[str], repeat: int) -> tuple[float, int]:
+    parsed_page_count = 0
+    start_time = time.perf_counter()
+
+    for _ in range(repeat):
+        for page_link in page_links:
+            if parse_restaurant_page_details_for(page_link) is not None:
+                parsed_page_count += 1
+
+    return (time.perf_counter() - start_time) / (len(page_links) * repeat), parsed_page_count // repeat
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def run_benchmark(pages_directory: str, repeat: int, browser: bool):
+    handler = partial(QuietRequestHandler, directory=pages_directory)
+
+    with ThreadingHTTPServer(('127.0.0.1', 0), handler) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        page_links = [f"{base_url}/{os.path.basename(page_path)}" for page_path in sorted(glob.glob(os.path.join(pages_directory, '*.html')))]
+
+        fetcher = ResyVenuePageFetcher()
+        seconds_per_page, parsed_page_count = time_pages(fetcher.parse_restaurant_page_details_for, page_links, repeat)
+        print(f"http fast path | {seconds_per_page * 1000:.1f} ms/page | {parsed_page_count}/{len(page_links)} pages parsed")
+
+        if browser:
+            # Imported here, the scraper needs Chrome and the .env
+            from src.services.resy_scraper import ResyScraper
+
+            scraper = ResyScraper()
+
+            try:
+                browser_seconds_per_page, parsed_page_count = time_pages(scraper.parse_restaurant_page_details_for, page_links, repeat)
+            finally:
+                scraper.stop_web_driver()
+
+            print(f"browser        | {browser_seconds_per_page * 1000:.1f} ms/page | {parsed_page_count}/{len(page_links)} pages parsed")
+            print(f"speedup        | {browser_seconds_per_page / seconds_per_page:.1f}x")
+
+        server.shutdown()
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Per page benchmark of the venue page HTTP fast path against the browser")
+    argument_parser.add_argument('--pages-directory', help="Directory of saved venue pages (*.html)")
+    argument_parser.add_argument('--repeat', type=int, default=3)
+    argument_parser.add_argument('--browser', action='store_true', help="Also parse the pages in headless Chrome")
+    arguments = argument_parser.parse_args()
+
+    if arguments.pages_directory:
+        run_benchmark(arguments.pages_directory, arguments.repeat, arguments.browser)
+    else:
+        with tempfile.TemporaryDirectory() as pages_directory:
+            write_synthetic_pages(pages_directory)
+            run_benchmark(pages_directory, arguments.repeat, arguments.browser)
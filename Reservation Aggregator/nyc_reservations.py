@@ -2,17 +2,43 @@
 # File system
 import os
 
+# Arguments
+import argparse
+
 # Services
 from src.services.resy_scraper import ResyScraper
+from src.services.resy_venue_worker_pool import DEFAULT_VENUE_PAGE_WORKER_COUNT
+from src.services.resy_browser_profile import BrowserProfiles
+from src.services.resy_crawl_state_store import DEFAULT_CRAWL_STATE_PATH
 
 # Add the parent directory of the current directory to the Python path
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 os.environ["PYTHONPATH"] = parent_dir + ":" + os.environ.get("PYTHONPATH", "")
 
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Aggregates and uploads the reservation details of every restaurant in NYC listed on Resy")
+    parser.add_argument("--workers", type=int, default=DEFAULT_VENUE_PAGE_WORKER_COUNT, help="Amount of headless browsers restaurant pages are parsed on in parallel")
+    parser.add_argument("--browser-profile", choices=[profile.value for profile in BrowserProfiles], default=BrowserProfiles.lean.value, help="Lean browsers skip images, fonts, media and trackers")
+    parser.add_argument("--resume", action="store_true", help="Continue the last crawl from its checkpoint instead of starting over")
+    parser.add_argument("--incremental", action="store_true", help="Only revisit venues that are due and only upload the ones that are new or changed")
+    parser.add_argument("--state-path", default=DEFAULT_CRAWL_STATE_PATH, help="SQLite database the crawl is checkpointed to")
+    parser.add_argument("--browser-only", action="store_true", help="Render every restaurant page instead of fetching its HTML first")
+
+    return parser.parse_args()
+
 # Script entry point
 def start():
-    resy_scraper = ResyScraper()
+    arguments = parse_arguments()
+
+    resy_scraper = ResyScraper(
+        venue_page_worker_count=arguments.workers,
+        browser_only=arguments.browser_only,
+        browser_profile=BrowserProfiles(arguments.browser_profile),
+        crawl_state_path=arguments.state_path,
+        resume=arguments.resume,
+        incremental=arguments.incremental
+        )
     resy_scraper.start_nyc_restaurant_aggregation_workflow()
 
 if __name__ == "__main__":
-    start()
\ No newline at end of file
+    start()
@@ -2,8 +2,8 @@
 # Networking
 import requests
 
-# Control Flow
-import time
+# Services
+from src.services.resy_streaming_uploader import ResyReservationDetailsUploader
 
 # Types
 from typing import Optional, Dict
@@ -21,6 +21,9 @@ foncii_api_key = str(config['FONCII_API_KEY'])
 prod_api_endpoint = str(config['FONCII_PROD_SERVER_ENDPOINT'])
 dev_api_endpoint = str(config['FONCII_DEV_SERVER_ENDPOINT'])
 
+# Max time to wait on the API in seconds (connecting, reading the response), a hung request is retried instead of stalling uploads
+API_REQUEST_TIMEOUT_SECONDS = (10, 120)
+
 """
 Simple interactor service class for communicating with the Foncii API
 """
@@ -36,16 +39,13 @@ class FonciiAPIService:
         self.api_endpoint = dev_api_endpoint if is_debug else prod_api_endpoint
 
     def perform_mutation(self, mutation: Dict[str, any], variables: Dict[str, any]) -> Optional[Dict[str, any]]:
-        # GraphQL mutation query with variables
-        mutation_operation = {
-            'query': mutation,
-            'variables': variables
-        }
-
         # Make a POST request to the GraphQL API endpoint
-        response = requests.post(self.api_endpoint, 
-                                 json=mutation_operation,
-                                 headers=self.HEADERS)
+        try:
+            response = self.send_mutation(mutation, variables)
+        except requests.RequestException as e:
+            # Timed out or couldn't connect, log error and move on
+            print(f"[FonciiAPIService][perform_mutation] Error occurred: {e}")
+            return None
 
         # Check if the request was successful
         if response.status_code == 200:
@@ -55,6 +55,22 @@ class FonciiAPIService:
             print(f"[FonciiAPIService][perform_mutation] Error occurred: {response.status_code} | {response.text}")
             return None
 
+    """
+    Sends the mutation and returns the raw response, for callers that pace themselves off of the response's
+    status code and headers (ex.) Retry-After)
+    """
+    def send_mutation(self, mutation: Dict[str, any], variables: Dict[str, any]) -> requests.Response:
+        # GraphQL mutation query with variables
+        mutation_operation = {
+            'query': mutation,
+            'variables': variables
+        }
+
+        return requests.post(self.api_endpoint,
+                             json=mutation_operation,
+                             headers=self.HEADERS,
+                             timeout=API_REQUEST_TIMEOUT_SECONDS)
+
 """
 Service adapter class for the Foncii API service that allows for unique mutations
 and queries to be triggered from outside of the context for which the operation
@@ -66,46 +82,37 @@ class FonciiAPIServiceAdapter:
         self.api_service = FonciiAPIService()
 
     # Mutations
+    INGEST_RESTAURANT_RESERVATION_DETAILS_MUTATION = """
+            mutation IngestRestaurantReservationDetails($input: IngestRestaurantReservationDetailsInput) {
+            ingestRestaurantReservationDetails(input: $input)
+            }
+        """
+
     """
     Uploads the given restaurant reservation details to the Foncii API in batches of `100` from the original 
     list of restaurant reservation details. Returns `True` if all batches were successfully uploaded, false otherwise.
     Batching helps to break up very large dataset uploads into managable chunks, which prevents the API from timing out
-    while also allowing the API to spin up other instances to handle requests in parallel if needed.
+    while also allowing the API to spin up other instances to handle requests in parallel if needed. Batches are paced
+    off of the API's responses, see ResyReservationDetailsUploader.
     """
     def upload_resy_restaurant_reservation_details(self, restaurant_reservation_details: list[Dict[str, any]]) -> bool:
-        mutation = """
-            mutation IngestRestaurantReservationDetails($input: IngestRestaurantReservationDetailsInput) {
-            ingestRestaurantReservationDetails(input: $input)
-            }
-        """
-
-         # Define batch size
-        batch_size = 100
-        batches_uploaded = 0
+        uploader = ResyReservationDetailsUploader(self)
 
-        # Loop through the list in batches
-        for i in range(0, len(restaurant_reservation_details), batch_size):
-            batches_uploaded += 1
-            print(f"Uploading batch: {batches_uploaded}")
+        for restaurant_page_details in restaurant_reservation_details:
+            uploader.add(restaurant_page_details)
 
-            # Get a slice of the list for the current batch by offsetting the list by the current batch size
-            # and slicing the list up to the current batch
-            current_batch = restaurant_reservation_details[i:i + batch_size]
+        return uploader.finish()
 
-            variables = {
-                "input": {
-                    "provider": "RESY",
-                    "restaurantReservationDetails": current_batch
-                }
+    """
+    Uploads a single batch of restaurant reservation details, returns the raw response so the caller can pace
+    the next batch off of it.
+    """
+    def upload_resy_restaurant_reservation_details_batch(self, restaurant_reservation_details: list[Dict[str, any]]) -> requests.Response:
+        variables = {
+            "input": {
+                "provider": "RESY",
+                "restaurantReservationDetails": restaurant_reservation_details
             }
+        }
 
-            # Perform mutation for the current batch
-            success = self.api_service.perform_mutation(mutation, variables) != None
-
-            if not success:
-                return False  # Break the loop or handle the failure as needed
-
-            # Wait 1 minute before uploading the next batch
-            time.sleep(60) 
-
-        return True  # Return True if all batches were successfully uploaded
\ No newline at end of file
+        return self.api_service.send_mutation(self.INGEST_RESTAURANT_RESERVATION_DETAILS_MUTATION, variables)
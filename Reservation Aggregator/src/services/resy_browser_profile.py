@@ -0,0 +1,87 @@
+# Dependencies
+# Types
+from enum import Enum
+
+# Selenium Web Driver Tools
+from selenium.webdriver.chrome.options import Options
+
+"""
+Browser profiles the scraper's headless Chrome can be started with. The lean profile is meant for crawling,
+it only loads what's needed to read the page's markup.
+"""
+class BrowserProfiles(Enum):
+    # Plain headless Chrome, loads every page like a regular browser would
+    default = "default"
+    # Skips images, fonts, media and trackers, hands pages over once their DOM is ready and keeps Chrome's background work to a minimum
+    lean = "lean"
+
+# Max size of a lean browser's disk cache, each browser gets its own cache directory
+LEAN_DISK_CACHE_SIZE_BYTES = 32 * 1024 * 1024
+
+# Requests blocked by lean browsers, none of these are read by the scraper
+LEAN_BLOCKED_URL_PATTERNS = [
+    # Images, the venue ID is parsed from the og:image meta tag, not the image itself
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Media
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    # Analytics / Trackers / Ads
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*segment.io*", "*segment.com*",
+    "*amplitude.com*", "*branch.io*", "*nr-data.net*", "*newrelic.com*", "*sentry.io*", "*optimizely.com*"
+]
+
+# Chrome features lean browsers don't need for crawling
+LEAN_CHROME_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-notifications",
+    "--disable-dev-shm-usage",
+    "--mute-audio",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false"
+]
+
+# Content settings turned off for lean browsers, 2 = Block
+LEAN_CONTENT_SETTING_PREFERENCES = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    "profile.default_content_setting_values.media_stream": 2
+}
+
+def build_chrome_options(browser_profile: BrowserProfiles, disk_cache_directory: str | None = None) -> Options:
+    """Headless Chrome options for the given profile, lean browsers cache to the given directory."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Run Chrome in headless mode
+    # Disable GPU acceleration for headless mode
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")  # Bypass OS security model
+    chrome_options.add_argument("--window-size=1920x1080")  # Set window size
+
+    if browser_profile == BrowserProfiles.lean:
+        # Pages are handed over once their DOM is ready, the scraper waits on the elements it needs anyways
+        chrome_options.page_load_strategy = 'eager'
+
+        for argument in LEAN_CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
+
+        if disk_cache_directory:
+            chrome_options.add_argument(f"--disk-cache-dir={disk_cache_directory}")
+            chrome_options.add_argument(f"--disk-cache-size={LEAN_DISK_CACHE_SIZE_BYTES}")
+
+        chrome_options.add_experimental_option("prefs", LEAN_CONTENT_SETTING_PREFERENCES)
+
+    return chrome_options
+
+def apply_network_blocking(web_driver, browser_profile: BrowserProfiles):
+    """Blocks the lean profile's heavy resources and trackers on the given driver through the DevTools protocol."""
+    if browser_profile != BrowserProfiles.lean:
+        return
+
+    web_driver.execute_cdp_cmd("Network.enable", {})
+    web_driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
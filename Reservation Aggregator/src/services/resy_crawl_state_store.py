@@ -0,0 +1,189 @@
+# Dependencies
+# Types
+from typing import Optional, Dict
+from enum import Enum
+
+# Local persistence
+import sqlite3
+import json
+
+# Utils
+import time
+import threading
+
+# Database the crawl is checkpointed to, relative to the working directory
+DEFAULT_CRAWL_STATE_PATH = "resy_crawl_state.db"
+
+# Times a restaurant page is tried across resumed runs before it's skipped
+MAX_RESTAURANT_PAGE_ATTEMPTS = 3
+
+# Restaurant page link statuses
+class LinkStatuses(Enum):
+    pending = "pending"
+    parsed = "parsed"
+    failed = "failed"
+
+"""
+Persistent state of the Resy crawls, one per crawl name (ex.) 'nyc'). Holds every restaurant page link discovered so far,
+whether it was parsed (and its parsed details), how many times it was tried and whether its details were uploaded, so a
+crawl that dies partway through can resume from its last checkpoint instead of starting over from the home page.
+"""
+class ResyCrawlStateStore:
+    def __init__(self, database_path: str = DEFAULT_CRAWL_STATE_PATH):
+        self.database_path = database_path
+        self.lock = threading.Lock()
+
+        # Shared by the worker threads, access is serialized through the lock
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.create_tables()
+
+    def create_tables(self):
+        with self.lock, self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_links (
+                    crawl_name TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    payload TEXT,
+                    external_url TEXT,
+                    uploaded INTEGER NOT NULL DEFAULT 0,
+                    discovered_at INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL,
+                    PRIMARY KEY (crawl_name, url)
+                )
+            """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS crawl_links_by_external_url ON crawl_links (external_url)")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_metadata (
+                    crawl_name TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (crawl_name, key)
+                )
+            """)
+
+    # Crawl lifecycle
+    def reset_crawl(self, crawl_name: str):
+        """Forgets everything about the given crawl, for starting over."""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM crawl_links WHERE crawl_name = ?", (crawl_name,))
+            self.connection.execute("DELETE FROM crawl_metadata WHERE crawl_name = ?", (crawl_name,))
+
+        self.set_metadata(crawl_name, 'started_at', str(self.__now()))
+
+    def get_metadata(self, crawl_name: str, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM crawl_metadata WHERE crawl_name = ? AND key = ?",
+                (crawl_name, key)
+                ).fetchone()
+
+        return row[0] if row else None
+
+    def set_metadata(self, crawl_name: str, key: str, value: str):
+        with self.lock, self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO crawl_metadata (crawl_name, key, value) VALUES (?, ?, ?)
+                ON CONFLICT (crawl_name, key) DO UPDATE SET value = excluded.value
+                """,
+                (crawl_name, key, value)
+                )
+
+    def is_link_aggregation_complete(self, crawl_name: str) -> bool:
+        """True once every listing page of the crawl was traversed."""
+        return self.get_metadata(crawl_name, 'links_aggregated') == 'true'
+
+    def mark_link_aggregation_complete(self, crawl_name: str):
+        self.set_metadata(crawl_name, 'links_aggregated', 'true')
+
+    # Links
+    def add_links(self, crawl_name: str, urls: list[str]):
+        """Records newly discovered links in discovery order, links that are already known keep their state."""
+        now = self.__now()
+
+        with self.lock, self.connection:
+            next_position = self.connection.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM crawl_links WHERE crawl_name = ?",
+                (crawl_name,)
+                ).fetchone()[0]
+
+            self.connection.executemany(
+                """
+                INSERT OR IGNORE INTO crawl_links (crawl_name, url, position, status, discovered_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [(crawl_name, url, next_position + k, LinkStatuses.pending.value, now, now) for k, url in enumerate(urls)]
+                )
+
+    def get_links(self, crawl_name: str) -> list[str]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT url FROM crawl_links WHERE crawl_name = ? ORDER BY position",
+                (crawl_name,)
+                ).fetchall()
+
+        return [url for (url,) in rows]
+
+    def get_links_to_parse(self, crawl_name: str, max_attempts: int = MAX_RESTAURANT_PAGE_ATTEMPTS) -> list[str]:
+        """Links that weren't parsed yet, minus the ones that already failed too many times."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT url FROM crawl_links WHERE crawl_name = ? AND status != ? AND attempts < ? ORDER BY position",
+                (crawl_name, LinkStatuses.parsed.value, max_attempts)
+                ).fetchall()
+
+        return [url for (url,) in rows]
+
+    def record_parse_result(self, crawl_name: str, url: str, restaurant_page_details: Optional[Dict[str, str]]):
+        """Checkpoints the outcome of parsing the given link, safe to call from the worker threads."""
+        status = (LinkStatuses.parsed if restaurant_page_details is not None else LinkStatuses.failed).value
+        payload = json.dumps(restaurant_page_details) if restaurant_page_details is not None else None
+        external_url = restaurant_page_details.get('externalURL') if restaurant_page_details is not None else None
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                """
+                UPDATE crawl_links SET status = ?, attempts = attempts + 1, payload = ?, external_url = ?, updated_at = ?
+                WHERE crawl_name = ? AND url = ?
+                """,
+                (status, payload, external_url, self.__now(), crawl_name, url)
+                )
+
+    # Uploads
+    def get_parsed_restaurant_page_details(self, crawl_name: str, uploaded: Optional[bool] = None) -> list[Dict[str, str]]:
+        """Parsed details of the crawl in link order, optionally only the ones that were (not) uploaded yet."""
+        query = "SELECT payload FROM crawl_links WHERE crawl_name = ? AND status = ?"
+        parameters = [crawl_name, LinkStatuses.parsed.value]
+
+        if uploaded is not None:
+            query += " AND uploaded = ?"
+            parameters.append(int(uploaded))
+
+        with self.lock:
+            rows = self.connection.execute(query + " ORDER BY position", parameters).fetchall()
+
+        return [json.loads(payload) for (payload,) in rows]
+
+    def mark_uploaded(self, restaurant_page_details: list[Dict[str, str]]):
+        """
+        Marks the given restaurants as uploaded in every crawl they were parsed in, batches can mix restaurants from
+        several crawls (ex.) cities) so they're matched by their external URL alone
+        """
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "UPDATE crawl_links SET uploaded = 1, updated_at = ? WHERE external_url = ?",
+                [(self.__now(), details.get('externalURL')) for details in restaurant_page_details]
+                )
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    @staticmethod
+    def __now() -> int:
+        return int(time.time() * 1000)
@@ -0,0 +1,83 @@
+# Dependencies
+# Types
+from typing import Optional, Callable
+
+# Parsing
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+# Services
+from src.services.resy_venue_worker_pool import ResyVenuePageWorkerPool, DEFAULT_VENUE_PAGE_WORKER_COUNT
+from src.services.resy_venue_page_parser import base_venue_page_url
+
+# Query parameter the restaurants list is paginated with ex.) https://resy.com/cities/ny/search?page=3
+LISTING_PAGE_QUERY_PARAMETER = "page"
+
+def listing_page_url(listing_url: str, page_number: int) -> str:
+    """The URL of the given page (1-indexed) of the restaurants list, keeping the list's other query parameters."""
+    parsed_url = urlparse(listing_url)
+    query_parameters = [(key, value) for key, value in parse_qsl(parsed_url.query) if key != LISTING_PAGE_QUERY_PARAMETER]
+    query_parameters.append((LISTING_PAGE_QUERY_PARAMETER, str(page_number)))
+
+    return urlunparse(parsed_url._replace(query=urlencode(query_parameters)))
+
+def canonicalize_restaurant_page_links(restaurant_page_links: list[str]) -> list[str]:
+    """
+    Strips the restaurant page links down to the venue page itself (no query parameters, fragments or trailing slashes)
+    and drops duplicates ex.) restaurants promoted on several pages, keeping the order they were found in
+    """
+    canonical_links = [base_venue_page_url(link).rstrip('/') for link in restaurant_page_links if link]
+
+    return list(dict.fromkeys(canonical_links))
+
+"""
+Aggregates the restaurant page links of a restaurants list by loading its pages directly by URL, in parallel across a
+pool of headless browsers, instead of clicking through them one after another. The list's page count is worked out once
+from its first page, and direct page URLs are checked against the second page before the rest are loaded.
+"""
+class ResyListingHarvester:
+    def __init__(self, create_scraper: Callable[[], any], worker_count: int = DEFAULT_VENUE_PAGE_WORKER_COUNT):
+        # Builds a scraper with its own web driver ex.) ResyScraper
+        self.create_scraper = create_scraper
+        self.worker_count = worker_count
+
+    """
+    Harvests every page of the given restaurants list, `scraper` is the scraper currently on the list's first page.
+    Returns the canonical restaurant page links in list order, or None if the list can't be paginated by URL
+    (or pages couldn't be loaded) in which case the list has to be paginated by clicking through it.
+    """
+    def harvest(self, scraper, listing_url: str, page_count: int) -> Optional[list[str]]:
+        first_page_links = scraper.parse_restaurant_page_links()
+
+        if page_count <= 1:
+            return canonicalize_restaurant_page_links(first_page_links)
+
+        # The second page is loaded on the current browser, if it's the same as the first the page parameter isn't supported
+        second_page_links = scraper.parse_listing_page_links_at(listing_page_url(listing_url, 2))
+
+        if not second_page_links or set(second_page_links) == set(first_page_links):
+            print("[ResyListingHarvester][harvest] Restaurants list can't be paginated by URL")
+            return None
+
+        remaining_page_urls = [listing_page_url(listing_url, page_number) for page_number in range(3, page_count + 1)]
+        worker_pool = ResyVenuePageWorkerPool(
+            create_scraper=self.create_scraper,
+            worker_count=self.worker_count,
+            parse_page=lambda worker_scraper, page_url: worker_scraper.parse_listing_page_links_at(page_url) or None
+            )
+        remaining_page_links = worker_pool.parse_restaurant_pages(remaining_page_urls)
+
+        # Pages the workers couldn't load are given one more try on the current browser
+        for index, page_url in enumerate(remaining_page_urls):
+            if remaining_page_links[index] is None:
+                remaining_page_links[index] = scraper.parse_listing_page_links_at(page_url)
+
+            if not remaining_page_links[index]:
+                print(f"[ResyListingHarvester][harvest] Failed to load restaurants list page @:{page_url}")
+                return None
+
+        aggregated_restaurant_links = [*first_page_links, *second_page_links]
+
+        for page_links in remaining_page_links:
+            aggregated_restaurant_links.extend(page_links)
+
+        return canonicalize_restaurant_page_links(aggregated_restaurant_links)
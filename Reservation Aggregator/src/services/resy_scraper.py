@@ -1,14 +1,18 @@
 # Dependencies
 # Types
-from typing import Optional, Dict
+from typing import Optional, Dict, Callable
 
 # Parsing
 from urllib.parse import urlparse, urlunparse
 
+# File system
+import shutil
+import tempfile
+from functools import partial
+
 # Selenium Web Driver Tools
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -16,6 +20,13 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 # Services
 from src.services.foncii_api_service import FonciiAPIServiceAdapter
+from src.services.resy_streaming_uploader import ResyReservationDetailsUploader
+from src.services.resy_venue_worker_pool import ResyVenuePageWorkerPool, DEFAULT_VENUE_PAGE_WORKER_COUNT
+from src.services.resy_venue_page_parser import ResyVenuePageFetcher
+from src.services.resy_browser_profile import BrowserProfiles, build_chrome_options, apply_network_blocking
+from src.services.resy_crawl_state_store import ResyCrawlStateStore, DEFAULT_CRAWL_STATE_PATH
+from src.services.resy_venue_fingerprint_store import ResyVenueFingerprintStore
+from src.services.resy_listing_harvester import ResyListingHarvester, canonicalize_restaurant_page_links
 
 """
 Simple interactor service class for scraping resy's website
@@ -29,20 +40,40 @@ class ResyScraper:
     # Services
     api_service = FonciiAPIServiceAdapter()
 
-    def __init__(self):
+    def __init__(
+            self,
+            venue_page_worker_count: int = DEFAULT_VENUE_PAGE_WORKER_COUNT,
+            browser_only: bool = False,
+            browser_profile: BrowserProfiles = BrowserProfiles.default,
+            crawl_state_path: str = DEFAULT_CRAWL_STATE_PATH,
+            resume: bool = False,
+            incremental: bool = False
+            ):
+        # Amount of headless browsers restaurant pages are parsed on in parallel, each with its own web driver
+        self.venue_page_worker_count = venue_page_worker_count
+        # Skip fetching restaurant pages over plain HTTP and always render them
+        self.browser_only = browser_only
+        # Profile this scraper's browser and the worker browsers are started with
+        self.browser_profile = browser_profile
+        # Where the crawls are checkpointed, and whether to continue from the last checkpoint instead of starting over
+        self.crawl_state_path = crawl_state_path
+        self.resume = resume
+        # Only revisit venues that are due and only upload venues that are new or changed since they were last uploaded
+        self.incremental = incremental
+        self.disk_cache_directory = None
         self.web_driver = self.init_web_driver()
 
     def init_web_driver(self):
+        # Lean browsers get their own bounded cache, removed once the driver is stopped
+        if self.browser_profile == BrowserProfiles.lean:
+            self.disk_cache_directory = tempfile.mkdtemp(prefix="resy-chrome-cache-")
+
         # Set up the Chrome options for headless browsing
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Run Chrome in headless mode
-        # Disable GPU acceleration for headless mode
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")  # Bypass OS security model
-        chrome_options.add_argument("--window-size=1920x1080")  # Set window size
+        chrome_options = build_chrome_options(self.browser_profile, self.disk_cache_directory)
 
         # Initialize the Chrome webdriver with the options
         web_driver = webdriver.Chrome(options=chrome_options)
+        apply_network_blocking(web_driver, self.browser_profile)
 
         return web_driver
 
@@ -60,37 +91,45 @@ class ResyScraper:
         # Visit each restaurant page and parse all relevant details
         restaurant_page_details: list[Dict[str, any]]  = []
 
+        # Each city is checkpointed as its own crawl
+        crawl_state_store = ResyCrawlStateStore(self.crawl_state_path)
+        fingerprint_store = ResyVenueFingerprintStore(self.crawl_state_path)
+
+        # Restaurants are uploaded in the background as they're parsed, one uploader is shared by every city
+        uploader = self.create_uploader(crawl_state_store, fingerprint_store)
+
         # Iterate through each city selector to toggle the context of the city and view all restaurants within that city     
         for city_button in city_selectors:
-            self.toggle_city_selector_drop_down()
-            self.click_city_selection_button(city_button)
-
-            # Aggregate the restaurant links from the current city
-            aggregated_restaurant_links: list[str] = self.aggregate_restaurant_page_links()
-            local_restaurant_page_details: list[Dict[str, any]]  = []
+            crawl_name = f"city:{city_button.text}"
+            self.prepare_crawl(crawl_state_store, crawl_name)
 
-            for restaurant_page_link in aggregated_restaurant_links:
-                parsed_restaurant_page_details = self.parse_restaurant_page_details_for(restaurant_page_link)
+            # Links aggregated by a previous run are reused as is
+            if not crawl_state_store.is_link_aggregation_complete(crawl_name):
+                self.toggle_city_selector_drop_down()
+                self.click_city_selection_button(city_button)
 
-                if parsed_restaurant_page_details is not None:
-                    print(f"Successfully parsed restaurant page details for {restaurant_page_link}")
-                    
-                    local_restaurant_page_details.append(parsed_restaurant_page_details)
-                else:
-                    print(f"Failed to parse restaurant page details for {restaurant_page_link}")
+                # Aggregate the restaurant links from the current city
+                self.aggregate_restaurant_page_links(crawl_state_store, crawl_name)
 
-            # Upload aggregated restaurant data to the API
-            print(f"Uploading restaurant reservation details for city: {city_button.text}")
-            self.api_service.upload_resy_restaurant_reservation_details(local_restaurant_page_details)
-            print("Upload complete")
+            local_restaurant_page_details: list[Dict[str, any]] = self.crawl_restaurant_pages(crawl_state_store, fingerprint_store, crawl_name, uploader)
 
             # Add the aggregated restaurant page details for this city to the overall list
-            restaurant_page_details.append(local_restaurant_page_details)
+            restaurant_page_details.extend(local_restaurant_page_details)
 
             # Done aggregating restaurants from the current city, move on to the next
             print(f"Finished aggregating restaurant details for city: {city_button.text} | {len(local_restaurant_page_details)} Restaurant Detail Pages Restaurants Parsed")
-            self.stop_web_driver()
-            
+
+        # Restaurant pages are parsed by the worker pool, this driver only traverses the cities
+        self.stop_web_driver()
+
+        # Upload the restaurants that haven't filled a batch yet
+        print("Uploading remaining restaurant reservation details")
+        uploader.finish()
+        print("Upload complete")
+
+        crawl_state_store.close()
+        fingerprint_store.close()
+
         print(f"Finished Workflow: [start_popular_city_restaurant_aggregation_workflow] | {len(restaurant_page_details)} Restaurant Detail pages parsed across {len(city_selectors)} cities")
         
     """
@@ -100,34 +139,127 @@ class ResyScraper:
     and to fine-tune any issues as they arise.
     """
     def start_nyc_restaurant_aggregation_workflow(self):
-        self.start_web_driver()
-        self.navigate_to_nyc_cities_page()
+        crawl_name = "nyc"
+        crawl_state_store = ResyCrawlStateStore(self.crawl_state_path)
+        fingerprint_store = ResyVenueFingerprintStore(self.crawl_state_path)
+        self.prepare_crawl(crawl_state_store, crawl_name)
 
-        # Visit each restaurant page and parse all relevant details
-        restaurant_page_details: list[Dict[str, any]] = []
+        # Links aggregated by a previous run are reused as is, the home page doesn't have to be visited again
+        if not crawl_state_store.is_link_aggregation_complete(crawl_name):
+            self.start_web_driver()
+            self.navigate_to_nyc_cities_page()
+
+            # Aggregate the restaurant links from the current city
+            self.aggregate_restaurant_page_links(crawl_state_store, crawl_name)
+
+        # Done aggregating links from the current city, the restaurant pages are parsed by the worker pool
+        self.stop_web_driver()
 
-        # Aggregate the restaurant links from the current city
-        aggregated_restaurant_links = self.aggregate_restaurant_page_links()
+        # Visit each restaurant page and parse all relevant details, full batches are uploaded in the background as they're parsed
+        uploader = self.create_uploader(crawl_state_store, fingerprint_store)
+        restaurant_page_details: list[Dict[str, any]] = self.crawl_restaurant_pages(crawl_state_store, fingerprint_store, crawl_name, uploader)
 
-        for restaurant_page_link in aggregated_restaurant_links:
-            parsed_restaurant_page_details = self.parse_restaurant_page_details_for(restaurant_page_link)
+        # Upload the restaurants that haven't filled a batch yet
+        print(f"Uploading remaining restaurant reservation details for NYC")
+        uploader.finish()
+        print("Upload complete")
+
+        crawl_state_store.close()
+        fingerprint_store.close()
+
+        print(f"Finished Workflow: [start_popular_city_restaurant_aggregation_workflow] | {len(restaurant_page_details)} Restaurant Detail pages parsed across NYC")
+
+    # Checkpointing #
+    """
+    Starts the given crawl over unless resuming, in which case the crawl continues from its last checkpoint
+    """
+    def prepare_crawl(self, crawl_state_store: ResyCrawlStateStore, crawl_name: str):
+        if self.resume:
+            print(f"Resuming crawl: {crawl_name} | {len(crawl_state_store.get_links(crawl_name))} restaurant page links discovered so far")
+        else:
+            crawl_state_store.reset_crawl(crawl_name)
+
+    """
+    Uploads restaurants in the background, checkpointing and fingerprinting each batch the API accepts. Batches can span
+    several crawls so they're checkpointed by the restaurants' external URLs rather than by crawl.
+    """
+    def create_uploader(self, crawl_state_store: ResyCrawlStateStore, fingerprint_store: ResyVenueFingerprintStore) -> ResyReservationDetailsUploader:
+        def on_batch_uploaded(uploaded_restaurant_page_details: list[Dict[str, str]]):
+            crawl_state_store.mark_uploaded(uploaded_restaurant_page_details)
+            fingerprint_store.record_uploaded(uploaded_restaurant_page_details)
+
+        return ResyReservationDetailsUploader(self.api_service, on_batch_uploaded=on_batch_uploaded)
+
+    """
+    Parses every restaurant page of the crawl that wasn't parsed yet and uploads the parsed restaurants, checkpointing
+    each page as it's parsed and each batch as it's uploaded. Restaurants parsed by a previous run that were never uploaded
+    are uploaded as well. Returns every restaurant parsed for the crawl so far, in link order.
+
+    Every uploaded restaurant is fingerprinted. Incremental crawls only parse the venues that are due for a visit and
+    only upload the ones that are new or changed since they were last uploaded.
+    """
+    def crawl_restaurant_pages(
+            self,
+            crawl_state_store: ResyCrawlStateStore,
+            fingerprint_store: ResyVenueFingerprintStore,
+            crawl_name: str,
+            uploader: ResyReservationDetailsUploader
+            ) -> list[Dict[str, str]]:
+        fingerprint_store.record_seen(crawl_state_store.get_links(crawl_name))
+
+        def upload_if_needed(parsed_restaurant_page_details: Dict[str, str]):
+            if not self.incremental or fingerprint_store.is_new_or_changed(parsed_restaurant_page_details):
+                uploader.add(parsed_restaurant_page_details)
+
+        for parsed_restaurant_page_details in crawl_state_store.get_parsed_restaurant_page_details(crawl_name, uploaded=False):
+            upload_if_needed(parsed_restaurant_page_details)
+
+        def on_page_parsed(restaurant_page_link: str, parsed_restaurant_page_details: Optional[Dict[str, str]]):
+            crawl_state_store.record_parse_result(crawl_name, restaurant_page_link, parsed_restaurant_page_details)
 
+            if parsed_restaurant_page_details is not None:
+                upload_if_needed(parsed_restaurant_page_details)
+                fingerprint_store.record_visit(parsed_restaurant_page_details)
+
+        restaurant_page_links = crawl_state_store.get_links_to_parse(crawl_name)
+
+        if self.incremental:
+            due_restaurant_page_links = fingerprint_store.get_links_due_for_visit(restaurant_page_links)
+            print(f"Incremental crawl: {crawl_name} | {len(due_restaurant_page_links)}/{len(restaurant_page_links)} restaurant pages due for a visit")
+            restaurant_page_links = due_restaurant_page_links
+
+        self.parse_restaurant_pages(restaurant_page_links, on_page_parsed)
+
+        return crawl_state_store.get_parsed_restaurant_page_details(crawl_name)
+
+    """
+    Parses the given restaurant pages in parallel across a pool of headless browsers, separate from this scraper's own
+    web driver. Pages are fetched and parsed over plain HTTP first, the browsers only render the pages whose details
+    aren't in the server-rendered HTML. Pages that can't be parsed are left out, the rest keep the order of the given links.
+    `on_restaurant_page_parsed` receives each link and its details (None if it couldn't be parsed) as soon as it's parsed.
+    """
+    def parse_restaurant_pages(
+            self,
+            restaurant_page_links: list[str],
+            on_restaurant_page_parsed: Optional[Callable[[str, Optional[Dict[str, str]]], None]] = None
+            ) -> list[Dict[str, str]]:
+        def on_page_parsed(restaurant_page_link: str, parsed_restaurant_page_details: Optional[Dict[str, str]]):
             if parsed_restaurant_page_details is not None:
                 print(f"Successfully parsed restaurant page details for {restaurant_page_link}")
-                 
-                restaurant_page_details.append(parsed_restaurant_page_details)
             else:
                 print(f"Failed to parse restaurant page details for {restaurant_page_link}")
 
-        # Done aggregating restaurants from the current city
-        self.stop_web_driver()
+            if on_restaurant_page_parsed:
+                on_restaurant_page_parsed(restaurant_page_link, parsed_restaurant_page_details)
 
-        # Upload aggregated restaurant data to the API
-        print(f"Uploading restaurant reservation details for NYC")
-        self.api_service.upload_resy_restaurant_reservation_details(restaurant_page_details)
-        print("Upload complete")
+        worker_pool = ResyVenuePageWorkerPool(
+            create_scraper=partial(ResyScraper, browser_profile=self.browser_profile),
+            worker_count=self.venue_page_worker_count,
+            fast_path=None if self.browser_only else ResyVenuePageFetcher()
+            )
+        restaurant_page_details = worker_pool.parse_restaurant_pages(restaurant_page_links, on_page_parsed)
 
-        print(f"Finished Workflow: [start_popular_city_restaurant_aggregation_workflow] | {len(restaurant_page_details)} Restaurant Detail pages parsed across NYC")
+        return [details for details in restaurant_page_details if details is not None]
 
     # Control Flow #
     def start_web_driver(self):
@@ -141,6 +273,9 @@ class ResyScraper:
 
         self.web_driver.quit()
 
+        if self.disk_cache_directory:
+            shutil.rmtree(self.disk_cache_directory, ignore_errors=True)
+
     # Site Navigation
     # For when the script first starts / needs to navigate back when done traversing a separate part of the site
     def navigate_to_home_page(self):
@@ -189,21 +324,63 @@ class ResyScraper:
             print("NYC Cities page failed to load in time")
 
     # Aggregation #
-    def aggregate_restaurant_page_links(self) -> list[str]: 
+    """
+    Aggregates the restaurant page links of every page of the restaurants list, checkpointing the links to the crawl state
+    store (if given). The list's pages are loaded directly by URL in parallel when possible, otherwise the list is paginated
+    by clicking through it, page by page. Links are canonical and unique.
+    """
+    def aggregate_restaurant_page_links(self, crawl_state_store: Optional[ResyCrawlStateStore] = None, crawl_name: Optional[str] = None) -> list[str]: 
             # Navigate to the restaurants list | View All list, not a special collection with only select restaurants within
             self.toggle_search_bar_auto_complete_drop_down()
             self.click_view_all_restaurants_button()
 
-            print(f"Parsing restaurant list page @:{self.web_driver.current_url}")
+            listing_url = self.web_driver.current_url
+            print(f"Parsing restaurant list page @:{listing_url}")
+
+            # Direct page URLs, harvested in parallel
+            page_count = self.parse_listing_page_count()
+            aggregated_restaurant_links = None
+
+            if page_count is not None:
+                print(f"Harvesting {page_count} restaurant list pages")
+
+                harvester = ResyListingHarvester(
+                    create_scraper=partial(ResyScraper, browser_profile=self.browser_profile),
+                    worker_count=self.venue_page_worker_count
+                    )
+                aggregated_restaurant_links = harvester.harvest(self, listing_url, page_count)
+
+                if aggregated_restaurant_links is not None and crawl_state_store:
+                    crawl_state_store.add_links(crawl_name, aggregated_restaurant_links)
+
+            # Fallback, aggregate the list items and paginate all possible pages
+            if aggregated_restaurant_links is None:
+                aggregated_restaurant_links = self.aggregate_restaurant_page_links_by_clicking(listing_url, crawl_state_store, crawl_name)
+
+            print(f"Restaurant page links aggregated: {len(aggregated_restaurant_links)}")
+
+            # Every page was traversed, resumed runs can skip straight to parsing the restaurant pages
+            if crawl_state_store:
+                crawl_state_store.mark_link_aggregation_complete(crawl_name)
+
+            return aggregated_restaurant_links
+
+    def aggregate_restaurant_page_links_by_clicking(self, listing_url: str, crawl_state_store: Optional[ResyCrawlStateStore] = None, crawl_name: Optional[str] = None) -> list[str]:
+            # Start over from the first page, the harvester may have navigated away from it
+            if self.web_driver.current_url != listing_url:
+                self.web_driver.get(listing_url)
 
-            # Aggregate the list items and paginate all possible pages
             aggregated_restaurant_links = []
             pages_traversed = 0
             can_paginate = True
 
             while can_paginate:
                 # Aggregate links to all of the pages to visit
-                aggregated_restaurant_links.extend(self.parse_restaurant_page_links())
+                restaurant_page_links = canonicalize_restaurant_page_links(self.parse_restaurant_page_links())
+                aggregated_restaurant_links.extend(restaurant_page_links)
+
+                if crawl_state_store:
+                    crawl_state_store.add_links(crawl_name, restaurant_page_links)
         
                 # Done aggregating this current page, move on to the next page (if any) 
                 can_paginate = self.paginate_restaurants_list_forward()
@@ -212,7 +389,7 @@ class ResyScraper:
                 print(f"Current Pagination Index: {pages_traversed}")
                 print(f"Restaurant page links aggregated: {len(aggregated_restaurant_links)}")
 
-            return aggregated_restaurant_links
+            return canonicalize_restaurant_page_links(aggregated_restaurant_links)
         
     # Parsing #
     def parse_restaurant_page_details_for(self, restaurant_details_page_link: str) -> Optional[Dict[str, str]]:
@@ -313,6 +490,7 @@ class ResyScraper:
     """
     def parse_restaurant_page_links(self):
         restaurant_page_link_elements = []
+        restaurant_page_links = []
 
         try:
             print("Parsing restaurant list page links")
@@ -332,6 +510,35 @@ class ResyScraper:
         
         return restaurant_page_links
 
+    """
+    Loads the given restaurants list page directly by URL and parses its restaurant page links
+    """
+    def parse_listing_page_links_at(self, listing_page_url: str) -> list[str]:
+        print(f"Navigating to restaurant list page @:{listing_page_url}")
+        self.web_driver.get(listing_page_url)
+
+        return self.parse_restaurant_page_links()
+
+    """
+    Parses the amount of pages of the restaurants list currently loaded from its pagination controls, the last page's
+    number is always listed. None if the page count can't be determined.
+    """
+    def parse_listing_page_count(self) -> Optional[int]:
+        try:
+            # Wait for the required elements to load properly
+            WebDriverWait(self.web_driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'li.Pagination__next')))
+
+            page_number_elements = self.web_driver.find_elements(
+            By.CSS_SELECTOR, "li[class*='Pagination'] a")
+
+            page_numbers = [int(element.text.strip()) for element in page_number_elements if element.text.strip().isdigit()]
+
+            return max(page_numbers) if page_numbers else None
+        except TimeoutException:
+            print("Restaurant list pagination not interactable")
+            return None
+
     # Web Interactor #
     # Home page / Cities page interactions # - Interactions Specifically meant for when the driver is on the homepage at '/'
     """
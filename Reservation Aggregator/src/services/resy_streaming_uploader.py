@@ -0,0 +1,179 @@
+# Dependencies
+# Types
+from typing import Optional, Dict, Callable
+
+# Networking
+import requests
+
+# Parsing
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+# Control Flow
+import queue
+import threading
+import time
+
+# Amount of restaurants uploaded per request
+UPLOAD_BATCH_SIZE = 100
+
+# Pacing between batches in seconds, starts conservative and speeds up while the API keeps up
+UPLOAD_INITIAL_DELAY_SECONDS = 5
+UPLOAD_MIN_DELAY_SECONDS = 1
+UPLOAD_MAX_DELAY_SECONDS = 300
+
+# Times a batch is sent before it's given up on
+UPLOAD_MAX_ATTEMPTS = 5
+
+# Statuses the API answers with when it's overloaded or (re)starting, these batches are retried after backing off
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+def parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+    """Seconds to wait as instructed by a Retry-After header, either in seconds or as an HTTP date."""
+    if not retry_after:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+"""
+Paces uploads off of the API's responses instead of a fixed wait. The delay between batches is halved after each
+accepted batch and doubled when the API pushes back, unless it says how long to wait (Retry-After).
+"""
+class AdaptiveUploadPacer:
+    def __init__(
+            self,
+            initial_delay_seconds: float = UPLOAD_INITIAL_DELAY_SECONDS,
+            min_delay_seconds: float = UPLOAD_MIN_DELAY_SECONDS,
+            max_delay_seconds: float = UPLOAD_MAX_DELAY_SECONDS
+            ):
+        self.delay_seconds = initial_delay_seconds
+        self.min_delay_seconds = min_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+
+    def record_success(self):
+        self.delay_seconds = max(self.min_delay_seconds, self.delay_seconds / 2)
+
+    def record_pushback(self, retry_after_seconds: Optional[float] = None):
+        if retry_after_seconds is not None:
+            self.delay_seconds = min(self.max_delay_seconds, max(self.min_delay_seconds, retry_after_seconds))
+        else:
+            self.delay_seconds = min(self.max_delay_seconds, self.delay_seconds * 2)
+
+"""
+Uploads restaurant reservation details in the background while the crawl is still running. Parsed restaurants are
+added as they come in and shipped as soon as a full batch is ready, so a crawl that dies late only loses the restaurants
+that haven't filled a batch yet. `finish` ships the remainder and waits for every batch to be uploaded.
+"""
+class ResyReservationDetailsUploader:
+    def __init__(
+            self,
+            api_service,
+            batch_size: int = UPLOAD_BATCH_SIZE,
+            pacer: Optional[AdaptiveUploadPacer] = None,
+            on_batch_uploaded: Optional[Callable[[list[Dict[str, any]]], None]] = None
+            ):
+        # Foncii API service adapter, anything with `upload_resy_restaurant_reservation_details_batch`
+        self.api_service = api_service
+        self.batch_size = batch_size
+        self.pacer = pacer if pacer else AdaptiveUploadPacer()
+        # Called from the upload thread with each batch the API accepted ex.) to checkpoint it
+        self.on_batch_uploaded = on_batch_uploaded
+
+        self.pending_restaurant_details: list[Dict[str, any]] = []
+        self.lock = threading.Lock()
+        self.batch_queue = queue.Queue()
+
+        # Metrics
+        self.batches_uploaded = 0
+        self.batches_failed = 0
+        self.restaurants_uploaded = 0
+
+        self.upload_thread = threading.Thread(target=self.__upload_batches, name="resy-reservation-details-uploader", daemon=True)
+        self.upload_thread.start()
+
+    def add(self, restaurant_page_details: Dict[str, any]):
+        """Adds a parsed restaurant, safe to call from several threads at once."""
+        with self.lock:
+            self.pending_restaurant_details.append(restaurant_page_details)
+
+            if len(self.pending_restaurant_details) >= self.batch_size:
+                self.batch_queue.put(self.pending_restaurant_details)
+                self.pending_restaurant_details = []
+
+    def finish(self) -> bool:
+        """Uploads what's left and waits for every batch, returns True if all batches were uploaded."""
+        with self.lock:
+            if self.pending_restaurant_details:
+                self.batch_queue.put(self.pending_restaurant_details)
+                self.pending_restaurant_details = []
+
+        # No more batches after this one
+        self.batch_queue.put(None)
+        self.upload_thread.join()
+
+        print(f"[ResyReservationDetailsUploader][finish] {self.restaurants_uploaded} restaurants uploaded in {self.batches_uploaded} batches | {self.batches_failed} batches failed")
+
+        return self.batches_failed == 0
+
+    def __upload_batches(self):
+        is_first_batch = True
+
+        while True:
+            batch = self.batch_queue.get()
+
+            if batch is None:
+                break
+
+            # The first batch goes out right away
+            if not is_first_batch:
+                time.sleep(self.pacer.delay_seconds)
+
+            is_first_batch = False
+
+            if self.__upload_batch(batch):
+                self.batches_uploaded += 1
+                self.restaurants_uploaded += len(batch)
+
+                if self.on_batch_uploaded:
+                    # The batch is uploaded either way, a failing callback mustn't stop the batches after it
+                    try:
+                        self.on_batch_uploaded(batch)
+                    except Exception as e:
+                        print(f"[ResyReservationDetailsUploader][upload_batches] Failed to record uploaded batch: {e}")
+            else:
+                self.batches_failed += 1
+
+    def __upload_batch(self, batch: list[Dict[str, any]]) -> bool:
+        for attempt in range(1, UPLOAD_MAX_ATTEMPTS + 1):
+            print(f"Uploading batch: {self.batches_uploaded + self.batches_failed + 1} | Attempt {attempt}")
+
+            try:
+                response = self.api_service.upload_resy_restaurant_reservation_details_batch(batch)
+            except requests.RequestException as e:
+                print(f"[ResyReservationDetailsUploader][upload_batch] An error occurred: {e}")
+                response = None
+
+            if response is not None and response.status_code == 200:
+                self.pacer.record_success()
+                return True
+
+            if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+                # The API rejected the batch itself, sending it again won't help
+                print(f"[ResyReservationDetailsUploader][upload_batch] Batch rejected: {response.status_code} | {response.text}")
+                return False
+
+            self.pacer.record_pushback(parse_retry_after(response.headers.get('Retry-After')) if response is not None else None)
+
+            if attempt < UPLOAD_MAX_ATTEMPTS:
+                print(f"[ResyReservationDetailsUploader][upload_batch] API pushed back, retrying in {self.pacer.delay_seconds:.0f}s")
+                time.sleep(self.pacer.delay_seconds)
+
+        return False
@@ -0,0 +1,175 @@
+# Dependencies
+# Types
+from typing import Dict
+
+# Local persistence
+import sqlite3
+
+# Parsing
+import hashlib
+import json
+
+# Utils
+import time
+import threading
+
+# Services
+from src.services.resy_venue_page_parser import base_venue_page_url
+
+# Bounds of how long a venue is left alone before it's parsed again in incremental mode
+MIN_REVISIT_INTERVAL_MS = 24 * 60 * 60 * 1000 # 1 Day
+MAX_REVISIT_INTERVAL_MS = 30 * 24 * 60 * 60 * 1000 # 30 Days
+
+# Share of the time a venue has gone unchanged that it's left alone for ex.) unchanged for 40 days -> revisited every 10 days
+REVISIT_INTERVAL_AGE_FACTOR = 0.25
+
+def fingerprint_restaurant_page_details(restaurant_page_details: Dict[str, str]) -> str:
+    """Hash of the details the API ingests, changes whenever any of them changes."""
+    fingerprinted_details = [restaurant_page_details.get(key) for key in ('name', 'venueAlias', 'locationDetails')]
+
+    return hashlib.sha256(json.dumps(fingerprinted_details).encode('utf-8')).hexdigest()
+
+"""
+Remembers what each venue looked like the last time it was uploaded, keyed by its external URL. Incremental crawls use
+it to revisit venues on an age based schedule (the longer a venue goes unchanged, the less often it's revisited) and to
+upload only venues that are new or whose details changed.
+"""
+class ResyVenueFingerprintStore:
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self.lock = threading.Lock()
+
+        # Shared by the worker threads, access is serialized through the lock
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.create_tables()
+
+    def create_tables(self):
+        with self.lock, self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS venue_fingerprints (
+                    external_url TEXT PRIMARY KEY,
+                    venue_id TEXT,
+                    fingerprint TEXT,
+                    parsed_fingerprint TEXT,
+                    first_seen INTEGER NOT NULL,
+                    last_seen INTEGER NOT NULL,
+                    last_visited INTEGER,
+                    last_changed INTEGER
+                )
+            """)
+
+            # Databases created before the parsed details were fingerprinted
+            columns = [column[1] for column in self.connection.execute("PRAGMA table_info(venue_fingerprints)")]
+
+            if 'parsed_fingerprint' not in columns:
+                self.connection.execute("ALTER TABLE venue_fingerprints ADD COLUMN parsed_fingerprint TEXT")
+
+    def record_seen(self, restaurant_page_links: list[str]):
+        """Venues listed on Resy right now, venues that were never seen before are added without a fingerprint."""
+        now = self.__now()
+
+        with self.lock, self.connection:
+            self.connection.executemany(
+                """
+                INSERT INTO venue_fingerprints (external_url, first_seen, last_seen) VALUES (?, ?, ?)
+                ON CONFLICT (external_url) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                [(base_venue_page_url(link), now, now) for link in restaurant_page_links]
+                )
+
+    def get_links_due_for_visit(self, restaurant_page_links: list[str]) -> list[str]:
+        """
+        The given links whose venues were never parsed, haven't been visited within their revisit interval or
+        whose last parsed details never made it to the API (ex.) their upload failed).
+        """
+        now = self.__now()
+
+        with self.lock:
+            rows = self.connection.execute(
+                """
+                SELECT external_url, last_visited, last_changed FROM venue_fingerprints
+                WHERE last_visited IS NOT NULL AND parsed_fingerprint IS fingerprint
+                """
+                ).fetchall()
+
+        next_visits = {
+            external_url: last_visited + self.revisit_interval_ms(now - last_changed)
+            for external_url, last_visited, last_changed in rows
+        }
+
+        return [link for link in restaurant_page_links if next_visits.get(base_venue_page_url(link), 0) <= now]
+
+    @staticmethod
+    def revisit_interval_ms(unchanged_for_ms: int) -> int:
+        return int(min(MAX_REVISIT_INTERVAL_MS, max(MIN_REVISIT_INTERVAL_MS, unchanged_for_ms * REVISIT_INTERVAL_AGE_FACTOR)))
+
+    def is_new_or_changed(self, restaurant_page_details: Dict[str, str]) -> bool:
+        """True if the venue was never uploaded or its details differ from the ones last uploaded."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT fingerprint FROM venue_fingerprints WHERE external_url = ?",
+                (restaurant_page_details['externalURL'],)
+                ).fetchone()
+
+        return row is None or row[0] != fingerprint_restaurant_page_details(restaurant_page_details)
+
+    def record_visit(self, restaurant_page_details: Dict[str, str]):
+        """
+        The venue was parsed, its revisit interval starts over. Until the parsed details are uploaded (their fingerprint
+        matches the uploaded one) the venue stays due, so a failed upload is retried by the next run.
+        """
+        now = self.__now()
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO venue_fingerprints (external_url, venue_id, parsed_fingerprint, first_seen, last_seen, last_visited, last_changed) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (external_url) DO UPDATE SET
+                    venue_id = excluded.venue_id,
+                    parsed_fingerprint = excluded.parsed_fingerprint,
+                    last_seen = excluded.last_seen,
+                    last_visited = excluded.last_visited,
+                    last_changed = COALESCE(venue_fingerprints.last_changed, excluded.last_changed)
+                """,
+                (
+                    restaurant_page_details['externalURL'],
+                    restaurant_page_details.get('venueID'),
+                    fingerprint_restaurant_page_details(restaurant_page_details),
+                    now, now, now, now
+                )
+                )
+
+    def record_uploaded(self, restaurant_page_details: list[Dict[str, str]]):
+        """
+        Fingerprints the uploaded venues, only done once the API accepted them so venues whose upload failed are
+        still considered changed by the next run
+        """
+        now = self.__now()
+
+        with self.lock, self.connection:
+            self.connection.executemany(
+                """
+                INSERT INTO venue_fingerprints (external_url, venue_id, fingerprint, first_seen, last_seen, last_visited, last_changed) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (external_url) DO UPDATE SET
+                    venue_id = excluded.venue_id,
+                    fingerprint = excluded.fingerprint,
+                    last_changed = CASE
+                        WHEN venue_fingerprints.fingerprint IS excluded.fingerprint THEN venue_fingerprints.last_changed
+                        ELSE excluded.last_changed
+                    END
+                """,
+                [
+                    (details['externalURL'], details.get('venueID'), fingerprint_restaurant_page_details(details), now, now, now, now)
+                    for details in restaurant_page_details
+                ]
+                )
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    @staticmethod
+    def __now() -> int:
+        return int(time.time() * 1000)
@@ -0,0 +1,188 @@
+# Dependencies
+# Types
+from typing import Optional, Dict
+
+# Networking
+import requests
+from requests.adapters import HTTPAdapter
+
+# Parsing
+from html.parser import HTMLParser
+from urllib.parse import urlparse, urlunparse
+
+# Control Flow
+import threading
+
+# Max time to wait on a venue page before giving up and falling back to the browser
+VENUE_PAGE_REQUEST_TIMEOUT_SECONDS = 10
+
+# Connections kept open to Resy per worker thread
+VENUE_PAGE_CONNECTION_POOL_SIZE = 4
+
+# Plain browser headers, some pages aren't server-rendered for unknown clients
+VENUE_PAGE_REQUEST_HEADERS = {
+    'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    'Accept': "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    'Accept-Language': "en-US,en;q=0.9"
+}
+
+# Elements with no content, they never receive an end tag
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+# Elements rendered on their own line, the text inside any other element (ex.) <strong>, <a>, <span>) stays on the line it's in
+BLOCK_ELEMENTS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'details', 'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section',
+    'summary', 'table', 'td', 'th', 'tr', 'ul'
+}
+
+"""
+Collects the elements the restaurant page details are parsed from, the same ones the browser reads:
+the venue hero og:image, the venue page title and the venue location summary.
+"""
+class ResyVenuePageHTMLParser(HTMLParser):
+    # Elements the text is collected from
+    VENUE_TITLE = ('h1', 'VenuePage__venue-title')
+    VENUE_LOCATION_SUMMARY = ('div', 'VenueLocationSummary__content__info')
+
+    def __init__(self):
+        super().__init__()
+        self.og_image_content: Optional[str] = None
+        self.venue_title_lines: list[str] = []
+        self.venue_location_summary_lines: list[str] = []
+
+        # Open elements whose text is being collected, with the depth they were opened at and the text of their current line
+        self.__collecting: list[tuple[list[str], int, list[str]]] = []
+        self.__depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+
+        if tag == 'meta' and attributes.get('property') == 'og:image' and self.og_image_content is None:
+            self.og_image_content = attributes.get('content')
+
+        if tag in BLOCK_ELEMENTS:
+            self.__break_lines()
+
+        if tag in VOID_ELEMENTS:
+            return
+
+        self.__depth += 1
+        classes = (attributes.get('class') or '').split()
+
+        if tag == self.VENUE_TITLE[0] and self.VENUE_TITLE[1] in classes and not self.venue_title_lines:
+            self.__collecting.append((self.venue_title_lines, self.__depth, []))
+        elif tag == self.VENUE_LOCATION_SUMMARY[0] and self.VENUE_LOCATION_SUMMARY[1] in classes and not self.venue_location_summary_lines:
+            self.__collecting.append((self.venue_location_summary_lines, self.__depth, []))
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS:
+            return
+
+        if tag in BLOCK_ELEMENTS:
+            self.__break_lines()
+
+        while self.__collecting and self.__collecting[-1][1] >= self.__depth:
+            lines, _, line_text = self.__collecting.pop()
+            self.__end_line(lines, line_text)
+
+        self.__depth = max(0, self.__depth - 1)
+
+    def handle_data(self, data):
+        # Inline text is read into the current line as is, like the browser renders the summary's rows
+        for _, _, line_text in self.__collecting:
+            line_text.append(data)
+
+    def close(self):
+        super().close()
+        self.__break_lines()
+
+    def __break_lines(self):
+        for lines, _, line_text in self.__collecting:
+            self.__end_line(lines, line_text)
+
+    @staticmethod
+    def __end_line(lines: list[str], line_text: list[str]):
+        # Whitespace is collapsed the way the browser renders it, empty lines aren't rendered at all
+        line = ' '.join(''.join(line_text).split())
+        line_text.clear()
+
+        if line:
+            lines.append(line)
+
+def base_venue_page_url(restaurant_details_page_link: str) -> str:
+    """The venue page's URL without query parameters (ex.) dates and seat counts), used as the restaurant's external URL."""
+    parsed_url = urlparse(restaurant_details_page_link)
+
+    return urlunparse((parsed_url.scheme, parsed_url.netloc, parsed_url.path, '', '', ''))
+
+"""
+Parses the restaurant page details from the given venue page HTML, returns None when any of the required
+details aren't in the markup (ex.) the page is rendered client side), in which case the browser has to be used.
+"""
+def parse_restaurant_page_details_from_html(restaurant_details_page_link: str, html: str) -> Optional[Dict[str, str]]:
+    parser = ResyVenuePageHTMLParser()
+    parser.feed(html)
+    parser.close()
+
+    # Meta-tag Parsing | Venue ID from Venue Hero OG Image
+    parsed_image_content = (parser.og_image_content or '').split('/')
+    venue_id = parsed_image_content[6] if len(parsed_image_content) >= 7 else None
+
+    # Venue Page Title Parsing | Venue Name
+    restaurant_name = ' '.join(parser.venue_title_lines)
+
+    # Venue Location Summary Parsing | Auto-complete Details, CSV string like the browser path produces
+    venue_location_summary = ', '.join(parser.venue_location_summary_lines)
+
+    if not venue_id or not restaurant_name or not venue_location_summary:
+        return None
+
+    # URL Parsing | External URL w/o query parameters and Venue Alias
+    external_url = base_venue_page_url(restaurant_details_page_link)
+    venue_alias = urlparse(restaurant_details_page_link).path.split('/')[-1]
+
+    return {
+        "name": restaurant_name,
+        "venueID": venue_id,
+        "venueAlias": venue_alias,
+        "externalURL": external_url,
+        "locationDetails": venue_location_summary,
+    }
+
+"""
+Fetches venue pages over plain HTTP and parses their details without rendering them. Each thread gets its
+own pooled session (requests sessions aren't thread safe) so connections to Resy are kept alive between pages.
+"""
+class ResyVenuePageFetcher:
+    def __init__(self, timeout_seconds: float = VENUE_PAGE_REQUEST_TIMEOUT_SECONDS):
+        self.timeout_seconds = timeout_seconds
+        self.thread_local = threading.local()
+
+    def get_session(self) -> requests.Session:
+        session = getattr(self.thread_local, 'session', None)
+
+        if session is None:
+            session = requests.Session()
+            session.headers.update(VENUE_PAGE_REQUEST_HEADERS)
+
+            adapter = HTTPAdapter(pool_connections=VENUE_PAGE_CONNECTION_POOL_SIZE, pool_maxsize=VENUE_PAGE_CONNECTION_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+
+            self.thread_local.session = session
+
+        return session
+
+    def parse_restaurant_page_details_for(self, restaurant_details_page_link: str) -> Optional[Dict[str, str]]:
+        try:
+            response = self.get_session().get(restaurant_details_page_link, timeout=self.timeout_seconds)
+
+            if response.status_code != 200:
+                print(f"[ResyVenuePageFetcher][parse_restaurant_page_details_for] Unexpected status {response.status_code} for {restaurant_details_page_link}")
+                return None
+
+            return parse_restaurant_page_details_from_html(restaurant_details_page_link, response.text)
+        except requests.RequestException as e:
+            print(f"[ResyVenuePageFetcher][parse_restaurant_page_details_for] An error occurred: {e}")
+            return None
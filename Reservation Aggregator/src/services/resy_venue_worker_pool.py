@@ -0,0 +1,115 @@
+# Dependencies
+# Types
+from typing import Optional, Dict, Callable
+
+# Control Flow
+import os
+import queue
+import threading
+
+# Default amount of headless browsers parsing venue pages at once, roughly one per core
+DEFAULT_VENUE_PAGE_WORKER_COUNT = os.cpu_count() or 1
+
+"""
+Parses restaurant (venue) detail pages on a pool of independent headless browsers. Each worker owns its own
+scraper (and web driver) and pulls links off of a shared queue. A worker whose browser fails restarts it and moves
+on to the next link without affecting the other workers. Results are merged back in the order of the given links.
+
+When a fast path is given (ex.) ResyVenuePageFetcher) pages are parsed with it first, the browser is only
+started for pages it can't parse. Other kinds of pages (ex.) restaurant list pages) can be parsed by passing `parse_page`.
+"""
+class ResyVenuePageWorkerPool:
+    def __init__(
+            self,
+            create_scraper: Callable[[], any],
+            worker_count: int = DEFAULT_VENUE_PAGE_WORKER_COUNT,
+            fast_path: Optional[any] = None,
+            parse_page: Optional[Callable[[any, str], any]] = None
+            ):
+        # Builds a scraper with its own web driver ex.) ResyScraper
+        self.create_scraper = create_scraper
+        self.worker_count = max(1, worker_count)
+        self.fast_path = fast_path
+        # How a worker's scraper parses a page, restaurant (venue) pages by default
+        self.parse_page = parse_page if parse_page else lambda scraper, link: scraper.parse_restaurant_page_details_for(link)
+
+    """
+    Parses the details of each of the given restaurant pages, returns the parsed details (None for pages that couldn't be
+    parsed) in the same order as the links. `on_page_parsed` is called with each link and its details as soon as
+    the page is parsed, from the worker threads.
+    """
+    def parse_restaurant_pages(
+            self,
+            restaurant_page_links: list[str],
+            on_page_parsed: Optional[Callable[[str, Optional[Dict[str, str]]], None]] = None
+            ) -> list[Optional[Dict[str, str]]]:
+        restaurant_page_details: list[Optional[Dict[str, str]]] = [None] * len(restaurant_page_links)
+        restaurant_page_link_queue = queue.Queue()
+
+        for index, restaurant_page_link in enumerate(restaurant_page_links):
+            restaurant_page_link_queue.put((index, restaurant_page_link))
+
+        # No point in starting more browsers than there are pages
+        workers = [
+            threading.Thread(
+                target=self.__run_worker,
+                args=(worker_index, restaurant_page_link_queue, restaurant_page_details, on_page_parsed),
+                name=f"resy-venue-worker-{worker_index}"
+                )
+            for worker_index in range(min(self.worker_count, len(restaurant_page_links)))
+        ]
+
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join()
+
+        return restaurant_page_details
+
+    def __run_worker(self, worker_index: int, restaurant_page_link_queue: queue.Queue, restaurant_page_details: list, on_page_parsed):
+        scraper = None
+
+        # The worker's browser is stopped however the worker ends
+        try:
+            while True:
+                try:
+                    index, restaurant_page_link = restaurant_page_link_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                # Fast path first, the browser is only needed when the page's details aren't in its HTML
+                if self.fast_path is not None:
+                    restaurant_page_details[index] = self.fast_path.parse_restaurant_page_details_for(restaurant_page_link)
+
+                if restaurant_page_details[index] is None:
+                    try:
+                        # Started lazily, and again after a failure
+                        if scraper is None:
+                            scraper = self.create_scraper()
+
+                        restaurant_page_details[index] = self.parse_page(scraper, restaurant_page_link)
+                    except Exception as e:
+                        # Browser crashed or hung, throw it out and continue with a fresh one
+                        print(f"[ResyVenuePageWorkerPool][worker {worker_index}] Failed to parse {restaurant_page_link}, restarting browser: {e}")
+                        self.__stop_scraper(scraper)
+                        scraper = None
+
+                if on_page_parsed:
+                    # The page is parsed either way, a failing callback (ex.) checkpointing it) mustn't stop the worker
+                    try:
+                        on_page_parsed(restaurant_page_link, restaurant_page_details[index])
+                    except Exception as e:
+                        print(f"[ResyVenuePageWorkerPool][worker {worker_index}] Failed to record parsed page {restaurant_page_link}: {e}")
+        finally:
+            self.__stop_scraper(scraper)
+
+    @staticmethod
+    def __stop_scraper(scraper):
+        if scraper is None:
+            return
+
+        try:
+            scraper.stop_web_driver()
+        except Exception as e:
+            print(f"[ResyVenuePageWorkerPool][stop_scraper] Failed to stop web driver: {e}")
@@ -0,0 +1,66 @@
+# Dependencies
+import sys
+import os
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_resy_browser_profile.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.resy_browser_profile import (
+    BrowserProfiles,
+    build_chrome_options,
+    apply_network_blocking,
+    LEAN_BLOCKED_URL_PATTERNS,
+    LEAN_CHROME_ARGUMENTS,
+    LEAN_DISK_CACHE_SIZE_BYTES,
+    LEAN_CONTENT_SETTING_PREFERENCES
+)
+
+# Stand-in for a Chrome web driver, records the DevTools commands sent to it
+class FakeWebDriver:
+    def __init__(self):
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, command, parameters):
+        self.cdp_commands.append((command, parameters))
+
+def test_lean_browsers_hand_pages_over_early_and_cache_to_their_own_directory():
+    chrome_options = build_chrome_options(BrowserProfiles.lean, disk_cache_directory="/tmp/resy-worker-0")
+
+    assert chrome_options.page_load_strategy == 'eager'
+    assert "--headless" in chrome_options.arguments
+    assert all(argument in chrome_options.arguments for argument in LEAN_CHROME_ARGUMENTS)
+    assert "--disk-cache-dir=/tmp/resy-worker-0" in chrome_options.arguments
+    assert f"--disk-cache-size={LEAN_DISK_CACHE_SIZE_BYTES}" in chrome_options.arguments
+    assert chrome_options.experimental_options["prefs"] == LEAN_CONTENT_SETTING_PREFERENCES
+
+def test_lean_browsers_without_a_cache_directory_use_chromes_default_cache():
+    chrome_options = build_chrome_options(BrowserProfiles.lean)
+
+    assert not any(argument.startswith("--disk-cache") for argument in chrome_options.arguments)
+
+def test_default_browsers_load_pages_like_a_regular_browser():
+    chrome_options = build_chrome_options(BrowserProfiles.default, disk_cache_directory="/tmp/resy-worker-0")
+
+    assert chrome_options.page_load_strategy == 'normal'
+    assert "--headless" in chrome_options.arguments
+    assert not any(argument in chrome_options.arguments for argument in LEAN_CHROME_ARGUMENTS)
+    assert not any(argument.startswith("--disk-cache") for argument in chrome_options.arguments)
+    assert "prefs" not in chrome_options.experimental_options
+
+def test_lean_browsers_block_heavy_resources_and_trackers():
+    web_driver = FakeWebDriver()
+    apply_network_blocking(web_driver, BrowserProfiles.lean)
+
+    assert web_driver.cdp_commands == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})]
+    assert {"*.jpg", "*.woff2", "*.mp4", "*google-analytics.com*"} <= set(LEAN_BLOCKED_URL_PATTERNS)
+
+def test_default_browsers_block_nothing():
+    web_driver = FakeWebDriver()
+    apply_network_blocking(web_driver, BrowserProfiles.default)
+
+    assert web_driver.cdp_commands == []
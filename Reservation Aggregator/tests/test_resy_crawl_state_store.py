@@ -0,0 +1,117 @@
+# Dependencies
+import sys
+import os
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_resy_crawl_state_store.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.resy_crawl_state_store import ResyCrawlStateStore
+
+def restaurant_page_details(alias: str):
+    return {
+        "name": alias.replace('-', ' ').title(),
+        "venueID": alias,
+        "venueAlias": alias,
+        "externalURL": f"https://resy.com/cities/ny/{alias}",
+        "locationDetails": "Italian in West Village"
+    }
+
+@pytest.fixture()
+def crawl_state_store(tmp_path):
+    crawl_state_store = ResyCrawlStateStore(str(tmp_path / "crawl_state.db"))
+
+    yield crawl_state_store
+
+    crawl_state_store.close()
+
+def parse(crawl_state_store, crawl_name: str, aliases: list[str]):
+    crawl_state_store.add_links(crawl_name, [f"https://resy.com/cities/ny/{alias}?seats=2" for alias in aliases])
+
+    for alias in aliases:
+        crawl_state_store.record_parse_result(crawl_name, f"https://resy.com/cities/ny/{alias}?seats=2", restaurant_page_details(alias))
+
+def test_batches_spanning_several_crawls_are_marked_uploaded_in_each(crawl_state_store):
+    parse(crawl_state_store, "city:New York", ['via-carota', 'lilia'])
+    parse(crawl_state_store, "city:Brooklyn", ['lilia', 'francie'])
+
+    # One shared uploader batches restaurants from both cities together
+    crawl_state_store.mark_uploaded([restaurant_page_details('via-carota'), restaurant_page_details('francie')])
+
+    assert crawl_state_store.get_parsed_restaurant_page_details("city:New York", uploaded=False) == [restaurant_page_details('lilia')]
+    assert crawl_state_store.get_parsed_restaurant_page_details("city:Brooklyn", uploaded=False) == [restaurant_page_details('lilia')]
+
+    crawl_state_store.mark_uploaded([restaurant_page_details('lilia')])
+
+    assert crawl_state_store.get_parsed_restaurant_page_details("city:New York", uploaded=False) == []
+    assert crawl_state_store.get_parsed_restaurant_page_details("city:Brooklyn", uploaded=False) == []
+
+def test_crawls_resume_from_their_last_checkpoint(tmp_path):
+    database_path = str(tmp_path / "crawl_state.db")
+    crawl_state_store = ResyCrawlStateStore(database_path)
+    links = [f"https://resy.com/cities/ny/{alias}?seats=2" for alias in ['via-carota', 'lilia', 'francie']]
+
+    crawl_state_store.add_links("nyc", links[:2])
+    crawl_state_store.record_parse_result("nyc", links[0], restaurant_page_details('via-carota'))
+    crawl_state_store.close()
+
+    # A new run against the same database picks up where the crawl died
+    resumed_crawl_state_store = ResyCrawlStateStore(database_path)
+    assert not resumed_crawl_state_store.is_link_aggregation_complete("nyc")
+
+    # Links discovered again keep their state and position, new ones are appended
+    resumed_crawl_state_store.add_links("nyc", [links[2], links[0]])
+    resumed_crawl_state_store.mark_link_aggregation_complete("nyc")
+
+    assert resumed_crawl_state_store.is_link_aggregation_complete("nyc")
+    assert resumed_crawl_state_store.get_links("nyc") == links
+    assert resumed_crawl_state_store.get_links_to_parse("nyc") == links[1:]
+    assert resumed_crawl_state_store.get_parsed_restaurant_page_details("nyc") == [restaurant_page_details('via-carota')]
+
+    # Starting over forgets the crawl, other crawls are left alone
+    resumed_crawl_state_store.add_links("city:Brooklyn", links[:1])
+    resumed_crawl_state_store.reset_crawl("nyc")
+
+    assert resumed_crawl_state_store.get_links("nyc") == []
+    assert not resumed_crawl_state_store.is_link_aggregation_complete("nyc")
+    assert resumed_crawl_state_store.get_metadata("nyc", 'started_at') is not None
+    assert resumed_crawl_state_store.get_links("city:Brooklyn") == links[:1]
+
+    resumed_crawl_state_store.close()
+
+def test_pages_that_keep_failing_are_skipped(crawl_state_store):
+    link = "https://resy.com/cities/ny/lilia?seats=2"
+    crawl_state_store.add_links("nyc", [link])
+
+    for _ in range(2):
+        crawl_state_store.record_parse_result("nyc", link, None)
+
+    # Tried twice, one more attempt left
+    assert crawl_state_store.get_links_to_parse("nyc") == [link]
+    assert crawl_state_store.get_links_to_parse("nyc", max_attempts=2) == []
+
+    crawl_state_store.record_parse_result("nyc", link, None)
+
+    assert crawl_state_store.get_links_to_parse("nyc") == []
+    assert crawl_state_store.get_parsed_restaurant_page_details("nyc") == []
+
+def test_parsed_pages_are_uploaded_once(crawl_state_store):
+    parse(crawl_state_store, "nyc", ['via-carota', 'lilia', 'francie'])
+
+    assert crawl_state_store.get_parsed_restaurant_page_details("nyc", uploaded=False) == [
+        restaurant_page_details(alias) for alias in ['via-carota', 'lilia', 'francie']
+    ]
+
+    crawl_state_store.mark_uploaded([restaurant_page_details('lilia')])
+
+    assert crawl_state_store.get_parsed_restaurant_page_details("nyc", uploaded=True) == [restaurant_page_details('lilia')]
+    assert crawl_state_store.get_parsed_restaurant_page_details("nyc", uploaded=False) == [
+        restaurant_page_details(alias) for alias in ['via-carota', 'francie']
+    ]
+    # Parsed pages aren't parsed again
+    assert crawl_state_store.get_links_to_parse("nyc") == []
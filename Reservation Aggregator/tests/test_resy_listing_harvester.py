@@ -0,0 +1,97 @@
+# Dependencies
+import sys
+import os
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_resy_listing_harvester.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.resy_listing_harvester import ResyListingHarvester, listing_page_url, canonicalize_restaurant_page_links
+
+LISTING_URL = "https://resy.com/cities/ny/search?date=2024-05-01&seats=2"
+
+# Stand-in for ResyScraper on a restaurants list with `page_count` pages of two restaurants each
+class FakeScraper:
+    def __init__(self, page_count: int, paginates_by_url: bool = True, failing_page_urls: set[str] = set()):
+        self.page_count = page_count
+        self.paginates_by_url = paginates_by_url
+        self.failing_page_urls = failing_page_urls
+        self.visited_page_urls: list[str] = []
+
+    @staticmethod
+    def page_links(page_number: int) -> list[str]:
+        return [f"https://resy.com/cities/ny/venue-{page_number}-{k}?seats=2" for k in range(2)]
+
+    def parse_restaurant_page_links(self) -> list[str]:
+        return self.page_links(1)
+
+    def parse_listing_page_links_at(self, page_url: str) -> list[str]:
+        self.visited_page_urls.append(page_url)
+
+        if page_url in self.failing_page_urls:
+            return []
+
+        # Lists that ignore the page parameter show their first page
+        page_number = int(page_url.split("page=")[1]) if self.paginates_by_url else 1
+
+        return self.page_links(page_number)
+
+    def stop_web_driver(self):
+        pass
+
+def test_listing_page_urls_keep_the_lists_other_query_parameters():
+    assert listing_page_url(LISTING_URL, 3) == "https://resy.com/cities/ny/search?date=2024-05-01&seats=2&page=3"
+    assert listing_page_url(listing_page_url(LISTING_URL, 3), 4) == "https://resy.com/cities/ny/search?date=2024-05-01&seats=2&page=4"
+    assert listing_page_url("https://resy.com/cities/ny", 2) == "https://resy.com/cities/ny?page=2"
+
+def test_restaurant_page_links_are_canonicalized_and_deduplicated_in_order():
+    assert canonicalize_restaurant_page_links([
+        "https://resy.com/cities/ny/lilia?date=2024-05-01&seats=2",
+        "https://resy.com/cities/ny/via-carota/#reviews",
+        "",
+        "https://resy.com/cities/ny/lilia/",
+        "https://resy.com/cities/ny/via-carota",
+    ]) == ["https://resy.com/cities/ny/lilia", "https://resy.com/cities/ny/via-carota"]
+
+def test_every_page_is_harvested_in_list_order():
+    scraper = FakeScraper(page_count=5)
+    workers: list[FakeScraper] = []
+
+    def create_scraper():
+        workers.append(FakeScraper(page_count=5))
+        return workers[-1]
+
+    restaurant_page_links = ResyListingHarvester(create_scraper, worker_count=2).harvest(scraper, LISTING_URL, 5)
+
+    assert restaurant_page_links == canonicalize_restaurant_page_links([link for page_number in range(1, 6) for link in FakeScraper.page_links(page_number)])
+    # Only the second page is loaded on the current browser, the rest are spread across the workers
+    assert scraper.visited_page_urls == [listing_page_url(LISTING_URL, 2)]
+    assert sorted(url for worker in workers for url in worker.visited_page_urls) == [listing_page_url(LISTING_URL, k) for k in range(3, 6)]
+
+def test_single_page_lists_arent_paginated():
+    scraper = FakeScraper(page_count=1)
+
+    assert ResyListingHarvester(lambda: FakeScraper(page_count=1)).harvest(scraper, LISTING_URL, 1) == canonicalize_restaurant_page_links(FakeScraper.page_links(1))
+    assert scraper.visited_page_urls == []
+
+def test_lists_that_cant_be_paginated_by_url_are_left_to_clicking():
+    scraper = FakeScraper(page_count=5, paginates_by_url=False)
+
+    assert ResyListingHarvester(lambda: FakeScraper(page_count=5, paginates_by_url=False)).harvest(scraper, LISTING_URL, 5) is None
+
+def test_pages_the_workers_cant_load_are_retried_on_the_current_browser():
+    failing_page_url = listing_page_url(LISTING_URL, 4)
+    scraper = FakeScraper(page_count=4)
+
+    restaurant_page_links = ResyListingHarvester(lambda: FakeScraper(page_count=4, failing_page_urls={failing_page_url}), worker_count=2).harvest(scraper, LISTING_URL, 4)
+
+    assert restaurant_page_links == canonicalize_restaurant_page_links([link for page_number in range(1, 5) for link in FakeScraper.page_links(page_number)])
+    assert scraper.visited_page_urls == [listing_page_url(LISTING_URL, 2), failing_page_url]
+
+    # Pages that can't be loaded at all mean the list has to be clicked through
+    scraper = FakeScraper(page_count=4, failing_page_urls={failing_page_url})
+    assert ResyListingHarvester(lambda: FakeScraper(page_count=4, failing_page_urls={failing_page_url})).harvest(scraper, LISTING_URL, 4) is None
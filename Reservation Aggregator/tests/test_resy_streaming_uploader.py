@@ -0,0 +1,152 @@
+# Dependencies
+import sys
+import os
+import importlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_resy_streaming_uploader.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.resy_streaming_uploader as resy_streaming_uploader
+from src.services.resy_streaming_uploader import ResyReservationDetailsUploader, AdaptiveUploadPacer, parse_retry_after
+
+# Stand-in for the Foncii API
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+
+class FakeAPIServiceAdapter:
+    def __init__(self, responses: list[FakeResponse] | None = None):
+        # Responses answered in order, 200 once they run out
+        self.responses = list(responses or [])
+        self.uploaded_batches: list[list[dict]] = []
+        self.requests_sent = 0
+
+    def upload_resy_restaurant_reservation_details_batch(self, batch):
+        self.requests_sent += 1
+        response = self.responses.pop(0) if self.responses else FakeResponse(200)
+
+        if response.status_code == 200:
+            self.uploaded_batches.append(batch)
+
+        return response
+
+def unpaced():
+    return AdaptiveUploadPacer(initial_delay_seconds=0, min_delay_seconds=0, max_delay_seconds=0)
+
+def test_failing_batch_callbacks_dont_stop_the_uploads():
+    api_service = FakeAPIServiceAdapter()
+    recorded_batches = []
+
+    def on_batch_uploaded(batch):
+        recorded_batches.append(batch)
+
+        if len(recorded_batches) == 1:
+            raise RuntimeError("database is locked")
+
+    uploader = ResyReservationDetailsUploader(api_service, batch_size=2, pacer=unpaced(), on_batch_uploaded=on_batch_uploaded)
+
+    for k in range(5):
+        uploader.add({'venueID': str(k)})
+
+    assert uploader.finish()
+    assert [[details['venueID'] for details in batch] for batch in api_service.uploaded_batches] == [['0', '1'], ['2', '3'], ['4']]
+    assert len(recorded_batches) == 3
+
+def test_api_requests_time_out(tmp_path, monkeypatch):
+    # The API service reads its configuration from the working directory's .env on import
+    (tmp_path / ".env").write_text(
+        "DEBUG=True\nFONCII_API_KEY=key\nFONCII_PROD_SERVER_ENDPOINT=https://api.foncii.com\nFONCII_DEV_SERVER_ENDPOINT=https://dev.api.foncii.com\n"
+        )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delitem(sys.modules, 'src.services.foncii_api_service', raising=False)
+    foncii_api_service = importlib.import_module('src.services.foncii_api_service')
+
+    requests_sent = []
+    monkeypatch.setattr(foncii_api_service.requests, 'post', lambda url, **kwargs: requests_sent.append(kwargs) or FakeResponse(200))
+
+    foncii_api_service.FonciiAPIServiceAdapter().upload_resy_restaurant_reservation_details_batch([{'venueID': '1'}])
+
+    assert requests_sent[0]['timeout'] == foncii_api_service.API_REQUEST_TIMEOUT_SECONDS
+
+# Pacing
+def test_retry_after_is_read_in_seconds_or_as_a_date():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("-5") == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("soon") is None
+
+    retry_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=90), usegmt=True)
+    assert 85 <= parse_retry_after(retry_date) <= 90
+
+    # Dates in the past mean right away
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+def test_pacer_speeds_up_while_the_api_keeps_up_and_backs_off_when_it_pushes_back():
+    pacer = AdaptiveUploadPacer(initial_delay_seconds=8, min_delay_seconds=1, max_delay_seconds=20)
+
+    pacer.record_success()
+    assert pacer.delay_seconds == 4
+
+    for _ in range(5):
+        pacer.record_success()
+
+    assert pacer.delay_seconds == 1
+
+    pacer.record_pushback()
+    pacer.record_pushback()
+    assert pacer.delay_seconds == 4
+
+    for _ in range(5):
+        pacer.record_pushback()
+
+    assert pacer.delay_seconds == 20
+
+def test_pacer_follows_retry_after_within_its_bounds():
+    pacer = AdaptiveUploadPacer(initial_delay_seconds=8, min_delay_seconds=1, max_delay_seconds=20)
+
+    pacer.record_pushback(3)
+    assert pacer.delay_seconds == 3
+
+    pacer.record_pushback(0)
+    assert pacer.delay_seconds == 1
+
+    pacer.record_pushback(600)
+    assert pacer.delay_seconds == 20
+
+# Uploads
+def test_batches_the_api_pushes_back_on_are_retried(monkeypatch):
+    monkeypatch.setattr(resy_streaming_uploader.time, 'sleep', lambda seconds: None)
+    api_service = FakeAPIServiceAdapter([FakeResponse(429, {'Retry-After': "2"}), FakeResponse(503)])
+    pacer = unpaced()
+    uploader = ResyReservationDetailsUploader(api_service, batch_size=2, pacer=pacer)
+
+    uploader.add({'venueID': '1'})
+
+    assert uploader.finish()
+    assert api_service.requests_sent == 3
+    assert api_service.uploaded_batches == [[{'venueID': '1'}]]
+
+def test_rejected_batches_are_given_up_on(monkeypatch):
+    monkeypatch.setattr(resy_streaming_uploader.time, 'sleep', lambda seconds: None)
+    api_service = FakeAPIServiceAdapter([FakeResponse(400), *[FakeResponse(503)] * resy_streaming_uploader.UPLOAD_MAX_ATTEMPTS])
+    uploaded_batches = []
+    uploader = ResyReservationDetailsUploader(api_service, batch_size=1, pacer=unpaced(), on_batch_uploaded=uploaded_batches.append)
+
+    for k in range(3):
+        uploader.add({'venueID': str(k)})
+
+    # The first batch is rejected outright, the second runs out of attempts
+    assert not uploader.finish()
+    assert api_service.requests_sent == 1 + resy_streaming_uploader.UPLOAD_MAX_ATTEMPTS + 1
+    assert uploaded_batches == [[{'venueID': '2'}]]
+    assert (uploader.batches_uploaded, uploader.batches_failed) == (1, 2)
@@ -0,0 +1,133 @@
+# Dependencies
+import sys
+import os
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_resy_venue_fingerprint_store.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.resy_venue_fingerprint_store as resy_venue_fingerprint_store
+from src.services.resy_venue_fingerprint_store import ResyVenueFingerprintStore, MIN_REVISIT_INTERVAL_MS, MAX_REVISIT_INTERVAL_MS
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+VENUE_PAGE_LINK = "https://resy.com/cities/ny/via-carota?date=2024-05-01&seats=2"
+
+def restaurant_page_details(location_details: str = "Italian in West Village"):
+    return {
+        "name": "Via Carota",
+        "venueID": "6194",
+        "venueAlias": "via-carota",
+        "externalURL": "https://resy.com/cities/ny/via-carota",
+        "locationDetails": location_details
+    }
+
+class FakeClock:
+    def __init__(self):
+        self.now_ms = 1_700_000_000_000
+
+    def time(self) -> float:
+        return self.now_ms / 1000
+
+    def advance(self, milliseconds: int):
+        self.now_ms += milliseconds
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resy_venue_fingerprint_store.time, 'time', clock.time)
+
+    return clock
+
+@pytest.fixture()
+def fingerprint_store(tmp_path, clock):
+    fingerprint_store = ResyVenueFingerprintStore(str(tmp_path / "crawl_state.db"))
+
+    yield fingerprint_store
+
+    fingerprint_store.close()
+
+def test_revisit_interval_grows_with_the_time_a_venue_goes_unchanged():
+    assert ResyVenueFingerprintStore.revisit_interval_ms(0) == MIN_REVISIT_INTERVAL_MS
+    assert ResyVenueFingerprintStore.revisit_interval_ms(40 * DAY_MS) == 10 * DAY_MS
+    assert ResyVenueFingerprintStore.revisit_interval_ms(1000 * DAY_MS) == MAX_REVISIT_INTERVAL_MS
+
+def test_venues_are_revisited_on_an_age_based_schedule(fingerprint_store, clock):
+    other_link = "https://resy.com/cities/ny/lilia"
+    fingerprint_store.record_seen([VENUE_PAGE_LINK, other_link])
+
+    # Never parsed, due right away
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK, other_link]) == [VENUE_PAGE_LINK, other_link]
+
+    fingerprint_store.record_visit(restaurant_page_details())
+    fingerprint_store.record_uploaded([restaurant_page_details()])
+
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK, other_link]) == [other_link]
+
+    # Unchanged for under a day, left alone for the minimum interval
+    clock.advance(MIN_REVISIT_INTERVAL_MS - 1)
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK]) == []
+
+    clock.advance(1)
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK]) == [VENUE_PAGE_LINK]
+
+    # Visited after going unchanged for 30 days, due again once it's been unchanged for 40 (a quarter of which is 10)
+    clock.advance(29 * DAY_MS)
+    fingerprint_store.record_visit(restaurant_page_details())
+    fingerprint_store.record_uploaded([restaurant_page_details()])
+
+    clock.advance(10 * DAY_MS - 1000)
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK]) == []
+
+    clock.advance(1000)
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK]) == [VENUE_PAGE_LINK]
+
+def test_changed_venues_start_their_schedule_over(fingerprint_store, clock):
+    fingerprint_store.record_visit(restaurant_page_details())
+    fingerprint_store.record_uploaded([restaurant_page_details()])
+
+    clock.advance(40 * DAY_MS)
+    fingerprint_store.record_visit(restaurant_page_details("Italian in Greenwich Village"))
+    fingerprint_store.record_uploaded([restaurant_page_details("Italian in Greenwich Village")])
+
+    clock.advance(MIN_REVISIT_INTERVAL_MS)
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK]) == [VENUE_PAGE_LINK]
+
+def test_only_new_or_changed_venues_are_uploaded(fingerprint_store):
+    assert fingerprint_store.is_new_or_changed(restaurant_page_details())
+
+    # Visited but the upload never went through
+    fingerprint_store.record_visit(restaurant_page_details())
+    assert fingerprint_store.is_new_or_changed(restaurant_page_details())
+
+    fingerprint_store.record_uploaded([restaurant_page_details()])
+    assert not fingerprint_store.is_new_or_changed(restaurant_page_details())
+    assert fingerprint_store.is_new_or_changed(restaurant_page_details("Italian in Greenwich Village"))
+
+def test_venues_whose_upload_failed_stay_due(fingerprint_store, clock):
+    fingerprint_store.record_visit(restaurant_page_details())
+    fingerprint_store.record_uploaded([restaurant_page_details()])
+
+    # Unchanged for 200 days, then it changes and its upload fails
+    clock.advance(200 * DAY_MS)
+    fingerprint_store.record_visit(restaurant_page_details("Italian in Greenwich Village"))
+
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK]) == [VENUE_PAGE_LINK]
+    assert fingerprint_store.is_new_or_changed(restaurant_page_details("Italian in Greenwich Village"))
+
+    # Once the next run uploads it, it's back on its schedule
+    fingerprint_store.record_visit(restaurant_page_details("Italian in Greenwich Village"))
+    fingerprint_store.record_uploaded([restaurant_page_details("Italian in Greenwich Village")])
+
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK]) == []
+
+def test_new_venues_whose_upload_failed_stay_due(fingerprint_store):
+    fingerprint_store.record_seen([VENUE_PAGE_LINK])
+    fingerprint_store.record_visit(restaurant_page_details())
+
+    assert fingerprint_store.get_links_due_for_visit([VENUE_PAGE_LINK]) == [VENUE_PAGE_LINK]
@@ -0,0 +1,91 @@
+# Dependencies
+import sys
+import os
+import requests
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_resy_venue_page_parser.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.resy_venue_page_parser import ResyVenuePageFetcher, parse_restaurant_page_details_from_html, base_venue_page_url
+
+VENUE_PAGE_LINK = "https://resy.com/cities/ny/via-carota?date=2024-05-01&seats=2"
+
+def read_fixture(file_name: str) -> str:
+    with open(os.path.join(current_dir, 'fixtures', file_name), encoding='utf-8') as fixture:
+        return fixture.read()
+
+def test_saved_venue_page_matches_the_browser_path():
+    # What ResyScraper.parse_restaurant_page_details_for reads off of the same markup rendered in Chrome
+    browser_details = {
+        "name": "Via Carota",
+        "venueID": "6194",
+        "venueAlias": "via-carota",
+        "externalURL": "https://resy.com/cities/ny/via-carota",
+        "locationDetails": "Italian in West Village, 51 Grove St, New York, NY 10014, $$$ · Wine bar",
+    }
+
+    assert parse_restaurant_page_details_from_html(VENUE_PAGE_LINK, read_fixture('resy_venue_page.html')) == browser_details
+
+def test_inline_text_stays_on_its_line():
+    html = """
+        <meta property="og:image" content="https://image.resy.com/3/003/2/42/hero/jpg/640x360">
+        <h1 class="VenuePage__venue-title"><span>Le</span> <em>Bernardin</em></h1>
+        <div class="VenueLocationSummary__content__info"><span>Fr</span>ench in <b>Midtown</b><div>155 W 51st St</div></div>
+    """
+
+    details = parse_restaurant_page_details_from_html(VENUE_PAGE_LINK, html)
+
+    assert details['name'] == "Le Bernardin"
+    assert details['locationDetails'] == "French in Midtown, 155 W 51st St"
+
+def test_pages_rendered_client_side_are_left_to_the_browser():
+    html = """
+        <meta property="og:image" content="https://image.resy.com/3/003/2/42/hero/jpg/640x360">
+        <div id="root"></div>
+    """
+
+    assert parse_restaurant_page_details_from_html(VENUE_PAGE_LINK, html) is None
+
+def test_base_venue_page_url_drops_query_parameters():
+    assert base_venue_page_url(VENUE_PAGE_LINK) == "https://resy.com/cities/ny/via-carota"
+
+def test_pages_without_a_venue_id_are_left_to_the_browser():
+    html = read_fixture('resy_venue_page.html').replace('property="og:image"', 'property="og:image:alt"')
+
+    assert parse_restaurant_page_details_from_html(VENUE_PAGE_LINK, html) is None
+
+# Fetching
+class FakeResponse:
+    def __init__(self, status_code: int, text: str = ""):
+        self.status_code = status_code
+        self.text = text
+
+class FakeSession:
+    def __init__(self, respond):
+        self.respond = respond
+
+    def get(self, url, timeout):
+        return self.respond(url)
+
+def fetcher_answering(respond) -> ResyVenuePageFetcher:
+    fetcher = ResyVenuePageFetcher()
+    fetcher.thread_local.session = FakeSession(respond)
+
+    return fetcher
+
+def test_fetched_venue_pages_are_parsed_without_a_browser():
+    fetcher = fetcher_answering(lambda url: FakeResponse(200, read_fixture('resy_venue_page.html')))
+
+    assert fetcher.parse_restaurant_page_details_for(VENUE_PAGE_LINK)['locationDetails'] == "Italian in West Village, 51 Grove St, New York, NY 10014, $$$ · Wine bar"
+
+def test_venue_pages_that_cant_be_fetched_are_left_to_the_browser():
+    def time_out(url):
+        raise requests.Timeout("Read timed out")
+
+    assert fetcher_answering(lambda url: FakeResponse(403, "Forbidden")).parse_restaurant_page_details_for(VENUE_PAGE_LINK) is None
+    assert fetcher_answering(time_out).parse_restaurant_page_details_for(VENUE_PAGE_LINK) is None
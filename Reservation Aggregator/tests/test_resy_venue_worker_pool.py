@@ -0,0 +1,145 @@
+# Dependencies
+import sys
+import os
+import threading
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_resy_venue_worker_pool.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.resy_venue_worker_pool import ResyVenuePageWorkerPool
+
+# Stand-in for ResyScraper, a browser that crashes on the pages it's told to
+class FakeScraper:
+    def __init__(self, crashing_links: set[str]):
+        self.crashing_links = crashing_links
+        self.crashed = False
+        self.stopped = False
+
+    def parse_restaurant_page_details_for(self, link: str):
+        if self.stopped:
+            raise RuntimeError("Web driver used after being stopped")
+
+        if link in self.crashing_links:
+            self.crashed = True
+            raise RuntimeError("Chrome not reachable")
+
+        return {'externalURL': link}
+
+    def stop_web_driver(self):
+        self.stopped = True
+
+# Stand-in for ResyVenuePageFetcher, parses the pages whose details are server rendered
+class FakeFastPath:
+    def __init__(self, parsable_links: set[str]):
+        self.parsable_links = parsable_links
+
+    def parse_restaurant_page_details_for(self, link: str):
+        return {'externalURL': link, 'fastPath': True} if link in self.parsable_links else None
+
+class FakeScraperFactory:
+    def __init__(self, crashing_links: set[str] = set()):
+        self.crashing_links = crashing_links
+        self.scrapers: list[FakeScraper] = []
+        self.lock = threading.Lock()
+
+    def __call__(self) -> FakeScraper:
+        scraper = FakeScraper(self.crashing_links)
+
+        with self.lock:
+            self.scrapers.append(scraper)
+
+        return scraper
+
+LINKS = [f"https://resy.com/cities/ny/venue-{k}" for k in range(20)]
+
+def test_results_are_merged_in_link_order():
+    create_scraper = FakeScraperFactory()
+    worker_pool = ResyVenuePageWorkerPool(create_scraper, worker_count=4)
+
+    assert worker_pool.parse_restaurant_pages(LINKS) == [{'externalURL': link} for link in LINKS]
+    # At most one browser per worker, started lazily and stopped once the queue is drained
+    assert 1 <= len(create_scraper.scrapers) <= 4
+    assert all(scraper.stopped for scraper in create_scraper.scrapers)
+
+def test_failing_pages_are_isolated_and_the_browser_restarted():
+    crashing_links = {LINKS[3], LINKS[11]}
+    create_scraper = FakeScraperFactory(crashing_links)
+    worker_pool = ResyVenuePageWorkerPool(create_scraper, worker_count=3)
+    parsed_pages = {}
+
+    restaurant_page_details = worker_pool.parse_restaurant_pages(LINKS, on_page_parsed=parsed_pages.__setitem__)
+
+    assert restaurant_page_details == [None if link in crashing_links else {'externalURL': link} for link in LINKS]
+    # Every page is reported, failures included
+    assert parsed_pages == dict(zip(LINKS, restaurant_page_details))
+    # Each crash throws out its browser for a fresh one
+    assert len([scraper for scraper in create_scraper.scrapers if scraper.crashed]) == len(crashing_links)
+    assert len([scraper for scraper in create_scraper.scrapers if not scraper.crashed]) <= 3
+    assert all(scraper.stopped for scraper in create_scraper.scrapers)
+
+def test_browsers_only_start_for_pages_the_fast_path_cant_parse():
+    create_scraper = FakeScraperFactory()
+    worker_pool = ResyVenuePageWorkerPool(create_scraper, worker_count=4, fast_path=FakeFastPath(set(LINKS[1:])))
+
+    restaurant_page_details = worker_pool.parse_restaurant_pages(LINKS)
+
+    assert restaurant_page_details[0] == {'externalURL': LINKS[0]}
+    assert all(details['fastPath'] for details in restaurant_page_details[1:])
+    assert len(create_scraper.scrapers) == 1
+
+def test_pages_are_parsed_in_parallel_by_no_more_workers_than_pages():
+    # Every page is held until all of them are being parsed at once
+    all_pages_parsing = threading.Barrier(3, timeout=5)
+    worker_counts = []
+
+    def parse_page(scraper, link):
+        all_pages_parsing.wait()
+        worker_counts.append(len([thread for thread in threading.enumerate() if thread.name.startswith('resy-venue-worker')]))
+
+        return scraper.parse_restaurant_page_details_for(link)
+
+    create_scraper = FakeScraperFactory()
+    worker_pool = ResyVenuePageWorkerPool(create_scraper, worker_count=8, parse_page=parse_page)
+
+    assert worker_pool.parse_restaurant_pages(LINKS[:3]) == [{'externalURL': link} for link in LINKS[:3]]
+    assert max(worker_counts) == 3
+    assert len(create_scraper.scrapers) == 3
+    assert worker_pool.parse_restaurant_pages([]) == []
+
+def test_failing_callbacks_dont_stop_the_workers():
+    create_scraper = FakeScraperFactory()
+    worker_pool = ResyVenuePageWorkerPool(create_scraper, worker_count=2)
+    parsed_pages = {}
+
+    def on_page_parsed(link, details):
+        parsed_pages[link] = details
+
+        if link == LINKS[0]:
+            raise RuntimeError("database is locked")
+
+    assert worker_pool.parse_restaurant_pages(LINKS, on_page_parsed=on_page_parsed) == [{'externalURL': link} for link in LINKS]
+    assert len(parsed_pages) == len(LINKS)
+    assert all(scraper.stopped for scraper in create_scraper.scrapers)
+
+# The worker's own exception is expected to surface on its thread
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_browsers_are_stopped_when_a_worker_dies():
+    create_scraper = FakeScraperFactory()
+
+    class FailingFastPath:
+        def parse_restaurant_page_details_for(self, link):
+            # The first page goes to the browser, the fast path breaks on the next one
+            if link != LINKS[0]:
+                raise RuntimeError("Fast path crashed")
+
+    worker_pool = ResyVenuePageWorkerPool(create_scraper, worker_count=1, fast_path=FailingFastPath())
+    worker_pool.parse_restaurant_pages(LINKS[:2])
+
+    assert len(create_scraper.scrapers) == 1
+    assert create_scraper.scrapers[0].stopped
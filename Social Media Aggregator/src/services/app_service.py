@@ -9,9 +9,13 @@ from enum import Enum
 # Utils
 import functools
 import json
+import threading
 
 # Services
 import src.services.pipeline_driver as pipeline_driver
+from src.services.job_service import JobService, JobStatus
+from src.services.pipeline_metrics import process_metrics
+from src.services.request_deduplication import RequestDeduplicator
 
 # Environment
 import os
@@ -25,6 +29,8 @@ host = str(os.getenv('HOST'))
 class HTTPStatusCodes(Enum):
     # Request went through with no issues
     ok = 200
+    # Request was accepted and will be processed asynchronously
+    accepted = 202
     # Server can't fulfill the request for arbitrary some reason
     bad_request = 400
     # Client's access to this service is unauthorized
@@ -63,10 +69,99 @@ class Endpoints(Enum):
     # For creating a new Foncii user from some Instagram user account not yet present on Foncii
     ingest_new_user_ig = "/ingest_new_user_ig"
 
+    # Asynchronous Jobs | Any of the pipelines above executed in the background
+    # Request: POST
+    # For queueing a pipeline, returns the job immediately with its ID
+    submit_job = "/jobs"
+    # Request: GET
+    # For polling the status and per-stage progress of a job
+    job_status = "/jobs/<job_id>"
+    # Request: GET
+    # For retrieving the output of a finished job
+    job_result = "/jobs/<job_id>/result"
+
+    # Bulk Instagram Post Ingestion (Classification + Non-classification) | Cohort Import Pipeline
+    # Request: POST
+    # For ingesting the posts of many existing Foncii users at once, runs as a job whose result holds each
+    # account's outcome and the cohort's aggregate throughput
+    bulk_ingest_posts_ig = "/bulk_ingest_posts_ig"
+
+    # Start up
+    # Request: GET
+    # For building the pipelines' services and loading the classification modules ahead of the first request
+    # ex.) from a start up probe, so cold starts don't slow down the first ingestion
+    warmup = "/warmup"
+
+    # Instrumentation
+    # Request: GET
+    # For the spans (per stage timings) and counters (upstream requests, cache hits, bytes sent) recorded by this instance
+    metrics = "/metrics"
+
 class SharedRequestBodyKeys(Enum):
     instagram_username = "instagramUsername"
     foncii_username = "fonciiUsername"
     post_amount = "postAmount"
+    # Optional | Only ingest posts published since the account's last ingestion
+    sync_mode = "syncMode"
+
+class JobRequestBodyKeys(Enum):
+    pipeline = "pipeline"
+
+class BulkIngestionRequestBodyKeys(Enum):
+    # Each account holds the shared request body keys of [Endpoints.ingest_posts_ig]
+    accounts = "accounts"
+    # Optional | Classify the posts with restaurants before ingesting them
+    classify_posts = "classifyPosts"
+
+# Optional request header | Identical keys sent to the same endpoint are deduplicated regardless of the request body
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+# Max amount of accounts accepted by a single bulk ingestion request
+MAX_BULK_INGESTION_ACCOUNTS = int(os.getenv('MAX_BULK_INGESTION_ACCOUNTS', 1000))
+
+# Pipelines that support delta syncs via the optional sync mode request body key
+SYNC_MODE_PIPELINES = [
+    Endpoints.classify_and_ingest_posts_ig.value.strip('/'),
+    Endpoints.ingest_posts_ig.value.strip('/')
+]
+
+# Request body keys required by each pipeline that can be submitted as a job, mapped to the pipeline's parameter names
+JOB_PIPELINE_PARAMETERS = {
+    Endpoints.classify_and_ingest_posts_ig.value.strip('/'): {
+        SharedRequestBodyKeys.instagram_username.value: 'instagram_username',
+        SharedRequestBodyKeys.foncii_username.value: 'foncii_username',
+        SharedRequestBodyKeys.post_amount.value: 'post_amount'
+    },
+    Endpoints.ingest_posts_ig.value.strip('/'): {
+        SharedRequestBodyKeys.instagram_username.value: 'instagram_username',
+        SharedRequestBodyKeys.foncii_username.value: 'foncii_username',
+        SharedRequestBodyKeys.post_amount.value: 'post_amount'
+    },
+    Endpoints.ingest_new_user_classify_ingest_posts_ig.value.strip('/'): {
+        SharedRequestBodyKeys.instagram_username.value: 'instagram_username',
+        SharedRequestBodyKeys.post_amount.value: 'post_amount'
+    },
+    Endpoints.ingest_new_user_ingest_posts_ig.value.strip('/'): {
+        SharedRequestBodyKeys.instagram_username.value: 'instagram_username',
+        SharedRequestBodyKeys.post_amount.value: 'post_amount'
+    },
+    Endpoints.ingest_new_user_ig.value.strip('/'): {
+        SharedRequestBodyKeys.instagram_username.value: 'instagram_username'
+    }
+}
+
+# Key shared by identical requests to the given endpoint, the request's idempotency key header takes precedence when sent
+def request_deduplication_key(endpoint: Endpoints, *request_parameters) -> tuple:
+    idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+
+    if idempotency_key:
+        return (endpoint.value, idempotency_key)
+
+    return (endpoint.value, *request_parameters)
+
+# Boolean request body flag, only JSON true (or the string 'True', like the env flags) turns it on, ex.) "false" stays off
+def parse_flag(value) -> bool:
+    return value is True or value == 'True'
 
 # Authorization wrapper to prevent external unauthorized access to this service
 def api_required(func):
@@ -97,9 +192,26 @@ class AppService:
     # Environment Variables
     stored_api_key = str(os.getenv('API_KEY'))
 
+    # Services
+    # Created and started on first use so the job database and worker pool aren't spun up on import
+    job_service = None
+    job_service_lock = threading.Lock()
+    # Duplicate ingestion requests (ex. retries) attach to the run already in flight or reuse its recent result
+    request_deduplicator = RequestDeduplicator()
+
     def __init__(self):
         pass
 
+    @staticmethod
+    def shared_job_service() -> JobService:
+        # Concurrent first requests (threaded server) must share one job service and worker pool
+        with AppService.job_service_lock:
+            if AppService.job_service is None:
+                AppService.job_service = JobService()
+                AppService.job_service.start()
+
+        return AppService.job_service
+
     def start(self):
         self.app.run(host=host,
                      port=port,
@@ -118,6 +230,7 @@ class AppService:
         instagram_username = ""
         foncii_username = ""
         post_amount = 0
+        sync_mode = False
 
         # Parse the JSON string and retrieve the value of the "text" key
         try:
@@ -126,6 +239,7 @@ class AppService:
             instagram_username = data.get(SharedRequestBodyKeys.instagram_username.value, "")
             foncii_username = data.get(SharedRequestBodyKeys.foncii_username.value, "")
             post_amount = int(data.get(SharedRequestBodyKeys.post_amount.value, 0))
+            sync_mode = parse_flag(data.get(SharedRequestBodyKeys.sync_mode.value))
             
         except json.JSONDecodeError:
             abort(HTTPStatusCodes.bad_request.value)
@@ -134,10 +248,14 @@ class AppService:
         if not instagram_username or not foncii_username or not post_amount:
             abort(HTTPStatusCodes.bad_request.value)
             
-        ingested_classified_posts = pipeline_driver.user_post_ingest_classify_pipeline(
-            instagram_username=instagram_username,
-            foncii_username=foncii_username, 
-            post_amount=post_amount
+        ingested_classified_posts = AppService.request_deduplicator.run(
+            key=request_deduplication_key(Endpoints.classify_and_ingest_posts_ig, instagram_username.lower(), foncii_username, post_amount, sync_mode),
+            perform_request=lambda: pipeline_driver.user_post_ingest_classify_pipeline(
+                instagram_username=instagram_username,
+                foncii_username=foncii_username, 
+                post_amount=post_amount,
+                sync_mode=sync_mode
+                )
             )
         
         # Returns 
@@ -155,6 +273,7 @@ class AppService:
         instagram_username = ""
         foncii_username = ""
         post_amount = 0
+        sync_mode = False
 
         # Parse the JSON string and retrieve the value of the "text" key
         try:
@@ -163,6 +282,7 @@ class AppService:
             instagram_username = data.get(SharedRequestBodyKeys.instagram_username.value, "")
             foncii_username = data.get(SharedRequestBodyKeys.foncii_username.value, "")
             post_amount = int(data.get(SharedRequestBodyKeys.post_amount.value, 0))
+            sync_mode = parse_flag(data.get(SharedRequestBodyKeys.sync_mode.value))
             
         except json.JSONDecodeError:
             abort(HTTPStatusCodes.bad_request.value)
@@ -171,10 +291,14 @@ class AppService:
         if not instagram_username or not foncii_username or not post_amount:
             abort(HTTPStatusCodes.bad_request.value)
 
-        ingested_posts = pipeline_driver.user_post_ingestion_pipeline(
-            instagram_username=instagram_username,
-            foncii_username=foncii_username, 
-            post_amount=post_amount
+        ingested_posts = AppService.request_deduplicator.run(
+            key=request_deduplication_key(Endpoints.ingest_posts_ig, instagram_username.lower(), foncii_username, post_amount, sync_mode),
+            perform_request=lambda: pipeline_driver.user_post_ingestion_pipeline(
+                instagram_username=instagram_username,
+                foncii_username=foncii_username, 
+                post_amount=post_amount,
+                sync_mode=sync_mode
+                )
             )
         
         # Returns 
@@ -274,6 +398,144 @@ class AppService:
         # Returns 
         return {SupportedKeys.data.value: ingested_user}, HTTPStatusCodes.bad_request.value if ingested_user == None else HTTPStatusCodes.ok.value
 
+    @app.route(Endpoints.submit_job.value, methods=['POST'])
+    @api_required
+    def submit_job():
+        # Parse raw request JSON body data, decode, unwrap optional
+        raw_data = request.get_data()
+        encoding = "utf-8"
+        decoded_data = raw_data.decode(encoding)
+
+        # Parsing
+        pipeline = ""
+        parameters = {}
+
+        # Parse the JSON string and map the pipeline's required keys to its parameters
+        try:
+            data = json.loads(decoded_data)
+            pipeline = data.get(JobRequestBodyKeys.pipeline.value, "")
+
+            for body_key, parameter_name in JOB_PIPELINE_PARAMETERS.get(pipeline, {}).items():
+                parameters[parameter_name] = data.get(body_key, "")
+
+            if SharedRequestBodyKeys.post_amount.value in JOB_PIPELINE_PARAMETERS.get(pipeline, {}):
+                parameters['post_amount'] = int(parameters['post_amount'] or 0)
+
+            sync_mode = parse_flag(data.get(SharedRequestBodyKeys.sync_mode.value))
+            
+        except (json.JSONDecodeError, ValueError, TypeError):
+            abort(HTTPStatusCodes.bad_request.value)
+
+        # Exception Handling | Reject unsupported pipelines and falsy values
+        if pipeline not in JOB_PIPELINE_PARAMETERS or not all(parameters.values()):
+            abort(HTTPStatusCodes.bad_request.value)
+
+        # Optional parameters are only passed when set so they don't change the job's idempotency key otherwise
+        if sync_mode and pipeline in SYNC_MODE_PIPELINES:
+            parameters['sync_mode'] = True
+
+        job = AppService.shared_job_service().submit(pipeline=pipeline, parameters=parameters)
+
+        # Returns
+        return {SupportedKeys.data.value: job}, HTTPStatusCodes.accepted.value
+
+    @app.route(Endpoints.job_status.value, methods=['GET'])
+    @api_required
+    def job_status(job_id: str):
+        job = AppService.shared_job_service().get_job(job_id)
+
+        # Exception Handling | Unknown job
+        if job is None:
+            abort(HTTPStatusCodes.not_found.value)
+
+        # Returns
+        return {SupportedKeys.data.value: job}, HTTPStatusCodes.ok.value
+
+    @app.route(Endpoints.job_result.value, methods=['GET'])
+    @api_required
+    def job_result(job_id: str):
+        job_service = AppService.shared_job_service()
+        job = job_service.get_job(job_id)
+
+        # Exception Handling | Unknown job
+        if job is None:
+            abort(HTTPStatusCodes.not_found.value)
+
+        # The job hasn't finished yet, return its current status to keep polling with
+        if job['status'] in [JobStatus.queued.value, JobStatus.running.value]:
+            return {SupportedKeys.data.value: None, 'job': job}, HTTPStatusCodes.accepted.value
+        
+        if job['status'] == JobStatus.failed.value:
+            return {SupportedKeys.data.value: None, 'job': job}, HTTPStatusCodes.internal_server_error.value
+
+        # Returns
+        return {SupportedKeys.data.value: job_service.get_job_result(job_id), 'job': job}, HTTPStatusCodes.ok.value
+
+    @app.route(Endpoints.bulk_ingest_posts_ig.value, methods=['POST'])
+    @api_required
+    def bulk_ingest_posts_ig():
+        # Parse raw request JSON body data, decode, unwrap optional
+        raw_data = request.get_data()
+        encoding = "utf-8"
+        decoded_data = raw_data.decode(encoding)
+
+        # Parsing
+        accounts = []
+        classify_posts = False
+
+        # Parse the JSON string and map each account's keys to the pipeline's parameters
+        try:
+            data = json.loads(decoded_data)
+
+            raw_accounts = data.get(BulkIngestionRequestBodyKeys.accounts.value, [])
+            classify_posts = parse_flag(data.get(BulkIngestionRequestBodyKeys.classify_posts.value))
+
+            for raw_account in raw_accounts:
+                account = {
+                    'instagram_username': raw_account.get(SharedRequestBodyKeys.instagram_username.value, ""),
+                    'foncii_username': raw_account.get(SharedRequestBodyKeys.foncii_username.value, ""),
+                    'post_amount': int(raw_account.get(SharedRequestBodyKeys.post_amount.value, 0))
+                }
+
+                # Exception Handling | Reject falsy values
+                if not all(account.values()):
+                    abort(HTTPStatusCodes.bad_request.value)
+
+                # Optional parameters are only passed when set so they don't change the job's idempotency key otherwise
+                if parse_flag(raw_account.get(SharedRequestBodyKeys.sync_mode.value)):
+                    account['sync_mode'] = True
+
+                accounts.append(account)
+            
+        except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
+            abort(HTTPStatusCodes.bad_request.value)
+
+        # Exception Handling | Reject empty and oversized cohorts
+        if not accounts:
+            abort(HTTPStatusCodes.bad_request.value)
+        if len(accounts) > MAX_BULK_INGESTION_ACCOUNTS:
+            abort(HTTPStatusCodes.payload_too_large.value)
+
+        job = AppService.shared_job_service().submit(
+            pipeline=Endpoints.bulk_ingest_posts_ig.value.strip('/'), 
+            parameters={'accounts': accounts, 'classify_posts': classify_posts}
+            )
+
+        # Returns
+        return {SupportedKeys.data.value: job}, HTTPStatusCodes.accepted.value
+
+    @app.route(Endpoints.warmup.value, methods=['GET'])
+    @api_required
+    def warmup():
+        # Returns how long each component took to warm up in ms, already warm components take ~0ms
+        return {SupportedKeys.data.value: pipeline_driver.warm_up()}, HTTPStatusCodes.ok.value
+
+    @app.route(Endpoints.metrics.value, methods=['GET'])
+    @api_required
+    def metrics():
+        # Returns this process's pipeline counters and span timings recorded since it started
+        return {SupportedKeys.data.value: process_metrics.snapshot()}, HTTPStatusCodes.ok.value
+
     # Validates the given API key against the environment key
     @staticmethod
     def is_api_key_valid(api_key) -> bool:
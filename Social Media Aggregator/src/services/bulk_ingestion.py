@@ -0,0 +1,107 @@
+# Dependencies
+# Services
+import src.services.pipeline_driver as pipeline_driver
+from src.services.pipeline_progress import report_pipeline_stage, report_pipeline_stages_to
+from src.services.rate_limiter import RateLimiter, rate_limit_tenant
+
+# Types
+from typing import Dict, Callable
+
+# Utils
+import time
+import traceback
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+# Environment Variables
+import os
+
+# Constants
+# Max amount of accounts ingested concurrently by a single bulk ingestion
+BULK_INGESTION_WORKER_COUNT = int(os.getenv('BULK_INGESTION_WORKER_COUNT', 8))
+
+"""
+Ingests the posts of a cohort of accounts concurrently on a bounded pool of workers. Every account's
+pipeline calls the upstreams (HikerAPI, Google, Foncii) through the same shared rate limiters as its own
+tenant, so the limiters take turns between the accounts and a single huge account can't starve the others
+of the upstreams' capacity. Returns each account's outcome along with the cohort's aggregate throughput.
+"""
+class BulkIngestionScheduler:
+    def __init__(
+            self,
+            worker_count: int = BULK_INGESTION_WORKER_COUNT,
+            ingestion_pipeline: Callable[..., any] = pipeline_driver.user_post_ingestion_pipeline,
+            classification_pipeline: Callable[..., any] = pipeline_driver.user_post_ingest_classify_pipeline
+            ):
+        self.worker_count = worker_count
+        self.ingestion_pipeline = ingestion_pipeline
+        self.classification_pipeline = classification_pipeline
+
+    def run(self, accounts: list[Dict[str, any]], classify_posts: bool = False) -> Dict[str, any]:
+        """
+        Runs the ingestion (or classification) pipeline for each of the given accounts, each account
+        holds the pipeline's keyword parameters ex.) instagram_username, foncii_username, post_amount
+        """
+        pipeline = self.classification_pipeline if classify_posts else self.ingestion_pipeline
+        upstream_request_counts_before = RateLimiter.request_counts()
+        start_time = time.monotonic()
+
+        # Each account runs in its own copy of this context so its metrics are still recorded to the calling job
+        account_contexts = [contextvars.copy_context() for _ in accounts]
+
+        with ThreadPoolExecutor(max_workers=self.worker_count, thread_name_prefix="bulk-ingestion") as executor:
+            account_results = list(executor.map(
+                lambda account_context, account: account_context.run(self.__ingest_account, pipeline, account),
+                account_contexts,
+                accounts
+                ))
+
+        elapsed_time = time.monotonic() - start_time
+        upstream_request_counts = {
+            upstream: request_count - upstream_request_counts_before.get(upstream, 0)
+            for upstream, request_count in RateLimiter.request_counts().items()
+        }
+
+        return {
+            'accounts': account_results,
+            'throughput': {
+                'accountCount': len(accounts),
+                'succeededAccountCount': sum(1 for result in account_results if result['succeeded']),
+                'elapsedSeconds': elapsed_time,
+                'accountsPerMinute': len(accounts) / elapsed_time * 60 if elapsed_time > 0 else 0,
+                'upstreamRequests': upstream_request_counts,
+                'upstreamRequestsPerSecond': {
+                    upstream: request_count / elapsed_time if elapsed_time > 0 else 0
+                    for upstream, request_count in upstream_request_counts.items()
+                }
+            }
+        }
+
+    @staticmethod
+    def __ingest_account(pipeline: Callable[..., any], account: Dict[str, any]) -> Dict[str, any]:
+        instagram_username = account['instagram_username']
+        start_time = time.monotonic()
+        result = None
+
+        try:
+            # The accounts' own stages would interleave, only the cohort's stages are reported
+            with rate_limit_tenant(instagram_username), report_pipeline_stages_to(None):
+                result = pipeline(**account)
+        except Exception as e:
+            print(f"[BulkIngestionScheduler][ingest_account] Ingestion failed for {instagram_username}: {e}")
+            traceback.print_exc()
+
+        return {
+            'instagramUsername': instagram_username,
+            # Pipelines signal failures by returning None or False
+            'succeeded': result is not None and result is not False,
+            'elapsedSeconds': time.monotonic() - start_time
+        }
+
+"""
+Ingests the posts of each of the given accounts, see [BulkIngestionScheduler]. Meant to be run as a job.
+"""
+def bulk_ingestion_pipeline(accounts: list[Dict[str, any]], classify_posts: bool = False):
+    report_pipeline_stage('ingesting_accounts')
+
+    return BulkIngestionScheduler().run(accounts=accounts, classify_posts=classify_posts)
@@ -5,6 +5,10 @@ import requests
 # Types
 from typing import Optional, Dict
 
+# Services
+from src.services.rate_limiter import RateLimiter, Upstreams
+from src.services.pipeline_metrics import increment_counter
+
 # Environment Variables
 import os
 
@@ -38,9 +42,11 @@ class FonciiAPIService:
         }
 
         # Make a GET request to the GraphQL API endpoint
+        RateLimiter.shared(Upstreams.foncii).acquire()
         response = requests.post(self.api_endpoint, 
                                  json=query_operation,
                                  headers=self.HEADERS)
+        self.__record_request_metrics(response)
 
         # Check if the request was successful
         if response.status_code == 200:
@@ -58,9 +64,11 @@ class FonciiAPIService:
         }
 
         # Make a POST request to the GraphQL API endpoint
+        RateLimiter.shared(Upstreams.foncii).acquire()
         response = requests.post(self.api_endpoint, 
                                  json=mutation_operation,
                                  headers=self.HEADERS)
+        self.__record_request_metrics(response)
 
         # Check if the request was successful
         if response.status_code == 200:
@@ -70,6 +78,14 @@ class FonciiAPIService:
             print(f"[FonciiAPIService][perform_mutation] Error occurred: {response.status_code} | {response.text}")
             return None
 
+    @staticmethod
+    def __record_request_metrics(response: requests.Response):
+        request_body = response.request.body if response.request is not None else None
+        increment_counter('bytes_sent.foncii', len(request_body) if request_body else 0)
+
+        if response.status_code != 200:
+            increment_counter('upstream_errors.foncii')
+
 """
 Service adapter class for the Foncii API service that allows for unique mutations
 and queries to be triggered from outside of the context for which the operation
@@ -77,14 +93,20 @@ pertains to. This helps to limit the verbosity of other files and classes and is
 different complex functionalities between instances.
 """
 class FonciiAPIServiceAdapter: 
+    # Properties
+    # Max amount of posts uploaded per request, larger payloads are rejected with 413 Payload too large errors
+    POST_BATCH_SIZE = 40
+
     def __init__(self):
         self.api_service = FonciiAPIService()
 
     # Queries 
     # Note: Pass False for useGoogleFallback if you don't want to use the Google Places API as a fallback
     def find_google_place_id_for_place_search_query(self, search_query: str, useGoogleFallback: bool = True) -> Optional[str]:
-        print("[find_place_id]")
-        print(search_query)
+        # Debug logging
+        if is_debug:
+            print("[find_place_id]")
+            print(search_query)
 
         query = """
             query FindGooglePlaceIDForPlaceSearchQuery($searchQuery: String!, $useGoogleFallback: Boolean) {
@@ -124,8 +146,9 @@ class FonciiAPIServiceAdapter:
     # Mutations
     def ingest_instagram_user(self, instagram_user_info: Dict[str, any]):
         # Debug logging
-        print("[ingest_instagram_user]")
-        print(instagram_user_info)
+        if is_debug:
+            print("[ingest_instagram_user]")
+            print(instagram_user_info)
 
         mutation = """
             mutation IngestDiscoveredInstagramUser($input: DiscoveredInstagramUserInput!) {
@@ -153,8 +176,31 @@ class FonciiAPIServiceAdapter:
     
     def ingest_instagram_posts(self, username: str, posts: list[Dict[str, any]]):
         # Debug logging
-        print("[ingest_instagram_posts]", 'Username: ', username, ' Posts: ', len(posts))
+        if is_debug:
+            print("[ingest_instagram_posts]", 'Username: ', username, ' Posts: ', len(posts))
+
+        # Using batching to prevent 413 Payload too large errors
+        batches_uploaded = 0
+
+        # Loop through the list in batches
+        for i in range(0, len(posts), self.POST_BATCH_SIZE):
+            batches_uploaded += 1
+
+            if is_debug:
+                print(f"Uploading batch: {batches_uploaded}")
+
+            # Get a slice of the list for the current batch by offsetting the list by the current batch size
+            # and slicing the list up to the current batch
+            current_batch = posts[i:i + self.POST_BATCH_SIZE]
 
+            # Perform mutation for the current batch
+            if not self.ingest_instagram_post_batch(username, current_batch):
+                return False  # Break the loop or handle the failure as needed
+
+        return True  # Return True if all batches were successfully uploaded
+
+    # Uploads a single batch of posts, batches should hold at most [POST_BATCH_SIZE] posts
+    def ingest_instagram_post_batch(self, username: str, posts: list[Dict[str, any]]) -> bool:
         mutation = """
             mutation IngestDiscoveredInstagramPosts($input: DiscoveredInstagramPostsInput) {
                 ingestDiscoveredInstagramPosts(input: $input) {
@@ -191,38 +237,42 @@ class FonciiAPIServiceAdapter:
             }
         """
 
-        # Define batch size / Using batching to prevent 413 Payload too large errors
-        batch_size = 40
+        variables = {
+            "input": {
+                'username': username,
+                'posts': posts
+            }
+        }
+
+        return self.api_service.perform_mutation(mutation, variables) != None
+    
+    def ingest_classified_instagram_posts(self, username: str, posts: list[Dict[str, any]]):
+        # Debug logging
+        if is_debug:
+            print("[ingest_classified_instagram_posts]", 'Username: ', username, ' Posts: ', len(posts))
+
+        # Using batching to prevent 413 Payload too large errors
         batches_uploaded = 0
 
         # Loop through the list in batches
-        for i in range(0, len(posts), batch_size):
+        for i in range(0, len(posts), self.POST_BATCH_SIZE):
             batches_uploaded += 1
-            print(f"Uploading batch: {batches_uploaded}")
+
+            if is_debug:
+                print(f"Uploading batch: {batches_uploaded}")
 
             # Get a slice of the list for the current batch by offsetting the list by the current batch size
             # and slicing the list up to the current batch
-            current_batch = posts[i:i + batch_size]
-
-            variables = {
-            "input": {
-                'username': username,
-                'posts': current_batch
-                }
-            }
+            current_batch = posts[i:i + self.POST_BATCH_SIZE]
 
             # Perform mutation for the current batch
-            success = self.api_service.perform_mutation(mutation, variables) != None
-
-            if not success:
+            if not self.ingest_classified_instagram_post_batch(username, current_batch):
                 return False  # Break the loop or handle the failure as needed
 
         return True  # Return True if all batches were successfully uploaded
-    
-    def ingest_classified_instagram_posts(self, username: str, posts: list[Dict[str, any]]):
-        # Debug logging
-        print("[ingest_classified_instagram_posts]", 'Username: ', username, ' Posts: ', len(posts))
 
+    # Uploads a single batch of classified posts, batches should hold at most [POST_BATCH_SIZE] posts
+    def ingest_classified_instagram_post_batch(self, username: str, posts: list[Dict[str, any]]) -> bool:
         mutation = """
             mutation IngestClassifiedDiscoveredInstagramPosts($input: ClassifiedDiscoveredInstagramPostsInput) {
                 ingestClassifiedDiscoveredInstagramPosts(input: $input) {
@@ -259,30 +309,11 @@ class FonciiAPIServiceAdapter:
             }
         """
 
-        # Define batch size / Using batching to prevent 413 Payload too large errors
-        batch_size = 40
-        batches_uploaded = 0
-
-        # Loop through the list in batches
-        for i in range(0, len(posts), batch_size):
-            batches_uploaded += 1
-            print(f"Uploading batch: {batches_uploaded}")
-
-            # Get a slice of the list for the current batch by offsetting the list by the current batch size
-            # and slicing the list up to the current batch
-            current_batch = posts[i:i + batch_size]
-
-            variables = {
+        variables = {
             "input": {
                 'username': username,
-                'posts': current_batch
-                }
+                'posts': posts
             }
+        }
 
-            # Perform mutation for the current batch
-            success = self.api_service.perform_mutation(mutation, variables) != None
-
-            if not success:
-                return False  # Break the loop or handle the failure as needed
-
-        return True  # Return True if all batches were successfully uploaded
\ No newline at end of file
+        return self.api_service.perform_mutation(mutation, variables) != None
@@ -1,17 +1,21 @@
 # Import librairies
 import pandas as pd
 import json
-from tqdm import tqdm
 import re
-import difflib
 import googlemaps
 import os
 from google.cloud import storage
 import json
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 
 # Services
-from src.services.insta_scraper_irakli import InstaScraper
 from src.services.foncii_api_service import FonciiAPIServiceAdapter
+from src.services.name_matching import match_score
+from src.services.restaurant_gazetteer import RestaurantGazetteer
+from src.services.rate_limiter import RateLimiter, Upstreams
+from src.services.pipeline_metrics import increment_counter
+from src.services.instagram_post import InstagramPost
 
 # Environment Variables
 # Add the parent directory of the current directory to the Python path
@@ -22,6 +26,16 @@ os.environ["PYTHONPATH"] = parent_dir + ":" + os.environ.get("PYTHONPATH", "")
 # Debug environment flag
 is_debug = str(os.getenv('DEBUG')) == 'True'
 
+# Constants
+# Minimum similarity score for a Google place to be considered a true match for a post
+TRUE_MATCH_SCORE_THRESHOLD = 0.55
+
+# Max amount of usertags looked up on Google concurrently by the tag resolution stage
+USERTAG_RESOLUTION_WORKER_COUNT = int(os.getenv('USERTAG_RESOLUTION_WORKER_COUNT', 8))
+
+# Google place types that count as food related
+FOOD_PLACE_TYPES = ['restaurant', 'food', 'bar', 'cafe', 'bakery', 'meal_delivery', 'meal_takeaway']
+
 def extract_words_after_at(paragraph):
     """Extract the mention."""
     # This regular expression looks for '@' followed by any sequence of characters 
@@ -50,12 +64,7 @@ def contains_digit(s):
 
 def good_match_score(df_name, google_name, is_easy_map):
     """Calculate the similarity between two strings."""
-    # Calculate the similarity
-    if is_easy_map in ['No', 'Maybe', 'Unlikely']:
-        similarity = difflib.SequenceMatcher(None, df_name.lower(), google_name.replace(' ','').lower()[:len(df_name)]).ratio() 
-    else:
-        similarity = difflib.SequenceMatcher(None, df_name.lower(), google_name.lower()).ratio()
-    return similarity 
+    return match_score(df_name, google_name, is_easy_map)
 
 def create_dict_from_lists(L1, L2):
     return dict(zip(L1, L2))
@@ -65,6 +74,7 @@ def google_maps_api(query):
     GOOGLE_MAPS_API_KEY = str(os.getenv('GOOGLE_MAPS_API_KEY'))
     fields = ['place_id', 'name', 'types']
     gmaps = googlemaps.Client(key=GOOGLE_MAPS_API_KEY)
+    RateLimiter.shared(Upstreams.google).acquire()
     res = gmaps.find_place(
         query, 
         input_type = 'textquery',
@@ -84,7 +94,7 @@ def level_confidence(score):
 def get_true_matches(row):
     """Get the place_id for which the google name is similar to the name from Instagram."""
     try:
-        true_indices = [i for i, x in enumerate(row['score']) if x >= 0.55]
+        true_indices = [i for i, x in enumerate(row['score']) if x >= TRUE_MATCH_SCORE_THRESHOLD]
         place_ids = [row['place_id'][i] for i in true_indices]
         google_names = [row['google_name'][i] for i in true_indices]
         scores = [row['score'][i] for i in true_indices]
@@ -125,40 +135,23 @@ def upload_dict_to_gcs(bucket_name, dict_data, file_path):
     )
     print(f"Dictionary uploaded to {file_path} in bucket {bucket_name}.")
 
-def create_dataframe(medias):
+def create_dataframe(posts: list[InstagramPost]):
     """Function that create a dataframe that gives details for each post."""
     
     L = []
-    for media in tqdm(medias):
+    for post in posts:
         
-        mentions = extract_words_after_at(media['caption_text'])  
-        usertags = list(set([x['user']['username'] for x in media['usertags']]))
+        mentions = extract_words_after_at(post.caption)  
+        usertags = list(post.usertags)
     
-        if media['video_url']:
+        if post.is_video:
                 type = 'Reel'
         else:
                 type = 'Image'
     
-        if media['location'] :
-        
-            caption = media['caption_text']
-            name = media['location']['name']
-            postid = media['code']
-            address = media['location']['address']
-            city = media['location']['city']
-            date = media['taken_at']
-                
-            L.append((postid, caption , mentions, usertags, name, address, city, type, date))
-            continue
-    
-        else:
-            
-            postid = media['code']
-            caption = media['caption_text']
-            date = media['taken_at']
-            L.append((postid, caption , mentions ,usertags, '', '', '', type, date))
+        L.append((post.code, mentions, usertags, post.location_name, post.location_address, post.location_city, type, post.taken_at))
     
-    df = pd.DataFrame(L, columns = ['postID', 'caption', 'mentions', 'usertags', 'name', 'address', 'city', 'type','date'])
+    df = pd.DataFrame(L, columns = ['postID', 'mentions', 'usertags', 'name', 'address', 'city', 'type','date'])
 
     # Get only posts from 2021
     df = df[df.date > '2021']
@@ -186,12 +179,26 @@ def find_restaurant_for_yes(df, threshold = 0.3):
     # Call the Foncii API
     api_service = FonciiAPIServiceAdapter()
 
+    # Local index of previously resolved places, consulted before any upstream service
+    gazetteer = RestaurantGazetteer.shared()
+
     score = []
     place_ids = []
     display_name_google = []
-    for k in tqdm(range(len(df))):
+    for k in range(len(df)):
         
         query = f"{df.iloc[k]['name']} {df.iloc[k]['address']} {df.iloc[k]['city']}".replace('  ',' ')
+        location_address = f"{df.iloc[k]['address']} {df.iloc[k]['city']}".strip()
+
+        # Resolve the restaurant offline if it's already been seen at this address
+        gazetteer_match = gazetteer.find_place_for_name(df.iloc[k]['name'], address=location_address)
+
+        if gazetteer_match:
+            increment_counter('cache_hits.gazetteer')
+            place_ids.append([gazetteer_match['place_id']])
+            score.append([gazetteer_match['score']])
+            display_name_google.append([gazetteer_match['name']])
+            continue
         
         # Find a matching restaurant via the API
         result = api_service.find_google_place_id_for_place_search_query(query, useGoogleFallback = False)
@@ -209,6 +216,7 @@ def find_restaurant_for_yes(df, threshold = 0.3):
         # If restaurant exists in the API
         if google_place_id:
             name_google = ''
+            gazetteer.record_place(google_place_id, df.iloc[k]['name'], location_address)
             place_ids.append([google_place_id])
             score.append([100])
             display_name_google.append([''])
@@ -224,6 +232,7 @@ def find_restaurant_for_yes(df, threshold = 0.3):
                     is_easy_map = df['easy_map'].iloc[k]
                     name = df.iloc[k]['name']
                     score_match = good_match_score(name,name_google, is_easy_map)
+                    gazetteer.record_place(res['candidates'][0]['place_id'], name_google, location_address, types)
                     place_ids.append([res['candidates'][0]['place_id']])
                     score.append([score_match])
                     display_name_google.append([name_google])
@@ -243,114 +252,185 @@ def find_restaurant_for_yes(df, threshold = 0.3):
     df['ig_mentions'] = [[""]] * len(place_ids)
 
     # Only select the place_id that have a similarity between the Instagram restaurant name and Google name
+    return apply_true_matches(df)
+
+def collect_usertag_queries(df_maybe, df_no):
+    """Map each unique tag of the given posts to the Google query used to resolve it, None for tags that shouldn't be looked up on Google."""
+    usertag_queries = {}
+
+    # Only the tags of 'Maybe' posts are looked up on Google, built from the first post they appear in
+    if df_maybe is not None:
+        for usertags, name, city in zip(df_maybe['all_tags'], df_maybe['name'], df_maybe['city']):
+            for usertag in usertags:
+                if usertag not in usertag_queries:
+                    usertag_queries[usertag] = f"{usertag} {name} {city}".replace('  ',' ')
+
+    if df_no is not None:
+        for usertags in df_no['all_tags']:
+            for usertag in usertags:
+                usertag_queries.setdefault(usertag, None)
+
+    return usertag_queries
+
+def resolve_usertags(usertag_queries, dic_usertags):
+    """
+    Resolve each unique usertag once through the usertag dictionary, the gazetteer and then Google, the Google
+    lookups being done concurrently. New resolutions are saved in the dictionary. Returns usertag -> resolution
+    where the resolution's source is 'dictionary', 'gazetteer', 'google' or 'none' (unresolved).
+    """
+
+    # Local index of previously resolved places, consulted before Google
+    gazetteer = RestaurantGazetteer.shared()
+    gazetteer.import_usertag_dictionary(dic_usertags)
+
+    resolved_usertags = {}
+    google_usertags = []
+
+    for usertag, query in usertag_queries.items():
+
+        # If we have the info on usertag
+        if usertag in dic_usertags:
+            increment_counter('cache_hits.usertag_dictionary')
+            resolved_usertags[usertag] = {
+                'place_id': dic_usertags[usertag]['place_id'],
+                'name': dic_usertags[usertag]['name'],
+                'score': dic_usertags[usertag]['score'],
+                'source': 'dictionary'
+            }
+
+        # Usertag not seen, but it matches a place that's already been resolved before
+        elif gazetteer_match := gazetteer.find_place_for_handle(usertag):
+            increment_counter('cache_hits.gazetteer')
+            resolved_usertags[usertag] = {
+                'place_id': gazetteer_match['place_id'],
+                'name': gazetteer_match['name'],
+                'score': gazetteer_match['score'],
+                'source': 'gazetteer'
+            }
+
+            # Save the usertag in the dictionnary
+            dic_usertags[usertag] = {
+                'score': gazetteer_match['score'],
+                'place_id': gazetteer_match['place_id'],
+                'name': gazetteer_match['name'],
+                'type': []
+            }
+            gazetteer.record_handle(usertag, gazetteer_match['place_id'], gazetteer_match['name'], gazetteer_match['score'])
+
+        elif query is not None:
+            google_usertags.append(usertag)
+
+        else:
+            resolved_usertags[usertag] = {'place_id': '', 'name': '', 'score': 0, 'source': 'none'}
+
+    # Usertags not seen, each lookup runs in a copy of the caller's context so it's still rate limited on behalf of
+    # the caller's tenant and counted in the caller's pipeline metrics
+    lookup_contexts = [contextvars.copy_context() for _ in google_usertags]
+
+    with ThreadPoolExecutor(max_workers=USERTAG_RESOLUTION_WORKER_COUNT, thread_name_prefix="usertag-resolution") as executor:
+        futures = [
+            executor.submit(lookup_context.run, google_maps_api, usertag_queries[usertag])
+            for lookup_context, usertag in zip(lookup_contexts, google_usertags)
+        ]
+        google_results = [future.result() for future in futures]
+
+    for usertag, res in zip(google_usertags, google_results):
+        if 'candidates' in res and len(res['candidates']) > 0:
+            types = res['candidates'][0]['types']
+
+            if any(item in types for item in FOOD_PLACE_TYPES):
+                name_google = res['candidates'][0]['name']
+                score_match = good_match_score(usertag, name_google, 'Maybe')
+                place_id = res['candidates'][0]['place_id']
+                gazetteer.record_place(place_id, name_google, '', types)
+                gazetteer.record_handle(usertag, place_id, name_google, score_match, types)
+
+            # Save in the dictionary the tag that is not food-related
+            else:
+                name_google, score_match, place_id = '', 0, ''
+                gazetteer.record_handle(usertag, '', '', 0, types)
+
+            # Save the usertag in the dictionnary
+            dic_usertags[usertag] = {
+                'score': score_match,
+                'place_id': place_id,
+                'name': name_google,
+                'type': types
+            }
+            resolved_usertags[usertag] = {'place_id': place_id, 'name': name_google, 'score': score_match, 'source': 'google'}
+
+        else:
+            resolved_usertags[usertag] = {'place_id': '', 'name': '', 'score': 0, 'source': 'none'}
+
+    return resolved_usertags
+
+def resolve_usertags_for_posts(df_maybe, df_no, bucket_name, file_path):
+    """Resolve every unique tag of the given 'Maybe' and 'No' posts in a single pass, see resolve_usertags."""
+    dic_usertags = download_json_from_gcs(bucket_name, file_path)
+    resolved_usertags = resolve_usertags(collect_usertag_queries(df_maybe, df_no), dic_usertags)
+
+    # Update the dics_usertag in Google Cloud Storage, only if new tags were saved
+    if any(resolution['source'] in ('gazetteer', 'google') for resolution in resolved_usertags.values()):
+        upload_dict_to_gcs(bucket_name, dic_usertags, file_path)
+
+    return resolved_usertags
+
+def match_resolved_usertags(usertags, resolved_usertags, threshold, thresholded_sources):
+    """Return the place_ids, scores, google names and ig mentions of the given usertags from their resolutions."""
+    i_place_ids = []
+    i_score = []
+    i_display_name_google = []
+    i_ig_mentions = []
+
+    for usertag in usertags:
+        resolution = resolved_usertags[usertag]
+
+        # Not resolved, or not higher than threshold
+        if not resolution['place_id'] or (resolution['source'] in thresholded_sources and resolution['score'] < threshold):
+            i_score.append(0)
+            i_place_ids.append('')
+            i_display_name_google.append('')
+            i_ig_mentions.append('')
+        else:
+            i_score.append(resolution['score'])
+            i_place_ids.append(resolution['place_id'])
+            i_display_name_google.append(resolution['name'])
+            i_ig_mentions.append(usertag)
+
+    return i_place_ids, i_score, i_display_name_google, i_ig_mentions
+
+def apply_true_matches(df):
+    """Only keep the place_ids for which the google name is similar to the name from Instagram."""
     results = df.apply(lambda row: get_true_matches(row), axis=1)
     
-    place_ids = [result[0] for result in results]
-    google_names = [result[1] for result in results]
-    score = [result[2] for result in results]
-    confidence = [result[3] for result in results]
-    ig_mentions = [result[4] for result in results]
-    
-    df['place_id'] = place_ids
-    df['google_name'] = google_names
-    df['score'] = score
-    df['confidence'] = confidence
-    df['ig_mentions'] = ig_mentions
-    
+    df['place_id'] = [result[0] for result in results]
+    df['google_name'] = [result[1] for result in results]
+    df['score'] = [result[2] for result in results]
+    df['confidence'] = [result[3] for result in results]
+    df['ig_mentions'] = [result[4] for result in results]
+
     return df
 
-def find_restaurant_for_maybe(df, bucket_name, file_path, threshold = 0.6):
+def find_restaurant_for_maybe(df, bucket_name, file_path, threshold = 0.6, resolved_usertags = None):
     """Return a dataframe with the place id associated with 'Maybe' easy_map values."""
 
-
-    dic_usertags = download_json_from_gcs(bucket_name, file_path)
+    # Resolve the posts' tags on their own when they weren't resolved along with the rest of the run's
+    if resolved_usertags is None:
+        resolved_usertags = resolve_usertags_for_posts(df, None, bucket_name, file_path)
     
     score = []
     place_ids = []
     display_name_google = []
     ig_mentions = []
 
-    for k in tqdm(range(len(df))):
-        
-        #usertags = list(set(df.iloc[k]['usertags'] + df.iloc[k]['mentions']))
-        usertags =  df.iloc[k]['all_tags']
-        i_place_ids = []
-        i_score = []
-        i_display_name_google = []
-        i_ig_mentions = []
-    
-        for usertag in usertags:
-            
-            # If we have the info on usertag
-            if usertag in dic_usertags:
-                print(f'{usertag} in dic_usertags')
-                if dic_usertags[usertag]['score'] >= threshold:
-                    place_id = dic_usertags[usertag]['place_id']
-                    name_google = dic_usertags[usertag]['name']
-                    score_match = dic_usertags[usertag]['score']
-                    i_score.append(score_match)
-                    i_place_ids.append(place_id)
-                    i_display_name_google.append(name_google)
-                    i_ig_mentions.append(usertag)
-                else:
-                    i_score.append(0)
-                    i_place_ids.append('')
-                    i_display_name_google.append('')
-                    i_ig_mentions.append('')
-    
-            # Usertag not seen
-            else:
-                query = f"{usertag} {df.iloc[k]['name']} {df.iloc[k]['city']}".replace('  ',' ')
-                res = google_maps_api(query)
-                
-                if 'candidates' in res and len(res['candidates']) > 0:
-                    types = res['candidates'][0]['types']
-                    list_types = ['restaurant', 'food', 'bar', 'cafe', 'bakery', 'meal_delivery', 'meal_takeaway']
-                    if any(item in types for item in list_types):
-                        name_google = res['candidates'][0]['name']
-                        is_easy_map = df['easy_map'].iloc[k]
-                        score_match = good_match_score(usertag, name_google, is_easy_map)
-                        place_id = res['candidates'][0]['place_id']
-                        i_place_ids.append(place_id)
-                        i_score.append(score_match)
-                        i_display_name_google.append(name_google)
-                        i_ig_mentions.append(usertag)
-    
-                        # Save the usertag in the dictionnary
-                        if usertag not in dic_usertags:
-                            dic_usertags[usertag] = {}
-                        dic_usertags[usertag]['score'] = score_match
-                        dic_usertags[usertag]['place_id'] = place_id
-                        dic_usertags[usertag]['name'] = name_google
-                        dic_usertags[usertag]['type'] = types
-                        
-                    else:
-                        i_place_ids.append('')
-                        i_score.append(0)
-                        i_display_name_google.append('')
-                        i_ig_mentions.append('')
-                        
-                        # Save in the dictionary the tag that is not food-related
-                        if usertag not in dic_usertags:
-                            dic_usertags[usertag] = {}
-                        dic_usertags[usertag]['score'] = 0
-                        dic_usertags[usertag]['place_id'] = ''
-                        dic_usertags[usertag]['name'] = ''
-                        dic_usertags[usertag]['type'] = types
-                        
-                else:
-                    i_place_ids.append('')
-                    i_score.append(0)
-                    i_display_name_google.append('')
-                    i_ig_mentions.append('')
+    for usertags in df['all_tags']:
+        # Usertags freshly resolved on Google are kept regardless of the threshold, like on their first lookup
+        i_place_ids, i_score, i_display_name_google, i_ig_mentions = match_resolved_usertags(usertags, resolved_usertags, threshold, ('dictionary',))
         
         score.append(i_score)
         place_ids.append(i_place_ids)
         display_name_google.append(i_display_name_google)
         ig_mentions.append(i_ig_mentions)
-
-    # Update the dics_usertag in Google Cloud Storage
-    upload_dict_to_gcs(bucket_name, dic_usertags, file_path)
                                            
     # Add the new columns
     df['place_id'] = place_ids
@@ -360,77 +440,31 @@ def find_restaurant_for_maybe(df, bucket_name, file_path, threshold = 0.6):
     
     # Threahold for 'Yes' is 0.3
     #df = df[df['score'] >= threshold]
-    
-    results = df.apply(lambda row: get_true_matches(row), axis=1)
-    
-    place_ids = [result[0] for result in results]
-    google_names = [result[1] for result in results]
-    score = [result[2] for result in results]
-    confidence = [result[3] for result in results]
-    ig_mentions = [result[4] for result in results]
-    
-    df['place_id'] = place_ids
-    df['google_name'] = google_names
-    df['score'] = score
-    df['confidence'] = confidence
-    df['ig_mentions'] = ig_mentions
 
-    return df
+    return apply_true_matches(df)
 
-def find_restaurant_for_no(df, bucket_name, file_path, threshold = 0.7):
+def find_restaurant_for_no(df, bucket_name, file_path, threshold = 0.7, resolved_usertags = None):
     """Return a dataframe with the place id associated with 'No' easy_map values."""
 
-    dic_usertags = download_json_from_gcs(bucket_name, file_path)
+    # 'No' posts' tags are only resolved offline, never on Google
+    if resolved_usertags is None:
+        resolved_usertags = resolve_usertags_for_posts(None, df, bucket_name, file_path)
     
     score = []
     place_ids = []
     display_name_google = []
     ig_mentions = []
 
-    for k in tqdm(range(len(df))):
-    
-        usertags = list(set(df.iloc[k]['usertags'] + df.iloc[k]['mentions']))
-        i_place_ids = []
-        i_score = []
-        i_display_name_google = []
-        i_ig_mentions = []
+    for usertags in df['all_tags']:
     
         # No location + tag
         if usertags:
-            
-            for usertag in usertags:
-                
-                # Look if we have this usertag in the dictionnary
-                if usertag in dic_usertags:
-                     
-                     if dic_usertags[usertag]['score'] >= threshold:
-                         place_id = dic_usertags[usertag]['place_id']
-                         name_google = dic_usertags[usertag]['name']
-                         score_match = dic_usertags[usertag]['score']
-                         i_score.append(score_match)
-                         i_place_ids.append(place_id)
-                         i_display_name_google.append(name_google)
-                         i_ig_mentions.append(usertag)
-
-                    # Not higher than threshold
-                     else:
-                        i_score.append(0)
-                        i_place_ids.append('')
-                        i_display_name_google.append('')
-                        i_ig_mentions.append('')
-            
-                else:
-                    i_score.append(0)
-                    i_place_ids.append('')
-                    i_display_name_google.append('')
-                    i_ig_mentions.append('')
-    
+            i_place_ids, i_score, i_display_name_google, i_ig_mentions = match_resolved_usertags(usertags, resolved_usertags, threshold, ('dictionary', 'google'))
     
             score.append(i_score)
             place_ids.append(i_place_ids)
             display_name_google.append(i_display_name_google)
             ig_mentions.append(i_ig_mentions)
-
     
         # No usertag in the post
         else:
@@ -444,31 +478,18 @@ def find_restaurant_for_no(df, bucket_name, file_path, threshold = 0.7):
     df['score'] = score
     df['google_name'] = display_name_google  
     df['ig_mentions'] = ig_mentions
-
     
     # Threahold for 'Yes' is 0.5
     #df = df[df['score'] >= threshold]
-    
-    results = df.apply(lambda row: get_true_matches(row), axis=1)
-    
-    place_ids = [result[0] for result in results]
-    google_names = [result[1] for result in results]
-    score = [result[2] for result in results]
-    confidence = [result[3] for result in results]
-    ig_mentions = [result[4] for result in results]
-    
-    df['place_id'] = place_ids
-    df['google_name'] = google_names
-    df['score'] = score
-    df['confidence'] = confidence
-    df['ig_mentions'] = ig_mentions
-    
 
-    return df
+    return apply_true_matches(df)
 
 
 def main(username, number_posts):
 
+    # Imported here since instagrapi is slow to import, and only this standalone flow uses it
+    from src.services.insta_scraper_irakli import InstaScraper
+
     instascraper = InstaScraper()
 
     # Gloabl Variables
@@ -480,7 +501,7 @@ def main(username, number_posts):
     medias = instascraper.get_media(username, number_posts)
 
     # Create the user's post DataFrame
-    df = create_dataframe(medias)
+    df = create_dataframe([InstagramPost.from_media(media) for media in medias])
 
     df_yes = df[df.easy_map == 'Yes'].copy()
     df_maybe = df[df.easy_map == 'Maybe'].copy()
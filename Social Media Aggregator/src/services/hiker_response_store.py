@@ -0,0 +1,122 @@
+# Dependencies
+# Local persistence
+from src.services.local_storage import local_storage_path, connect_local_database
+
+# Types
+from enum import Enum
+from typing import Optional
+
+# Utils
+import gzip
+import json
+import time
+import hashlib
+import threading
+
+# Environment Variables
+import os
+
+# Constants
+HIKER_RESPONSES_FILE_NAME = str(os.getenv('HIKER_RESPONSES_FILE_NAME', 'hiker_responses.db'))
+HIKER_RESPONSE_BLOBS_DIRECTORY_NAME = str(os.getenv('HIKER_RESPONSE_BLOBS_DIRECTORY_NAME', 'hiker_responses'))
+
+class HikerResponseCacheModes(Enum):
+    # Every request goes to HikerAPI, nothing is stored
+    off = "off"
+    # Every request goes to HikerAPI and its raw response is stored
+    record = "record"
+    # Requests are served from the stored responses, a request that was never recorded fails instead of hitting HikerAPI
+    replay = "replay"
+
+def parse_hiker_response_cache_mode(raw_cache_mode: str) -> HikerResponseCacheModes:
+    """The cache mode with the given name, unrecognized names turn the cache off instead of failing on import."""
+    try:
+        return HikerResponseCacheModes(raw_cache_mode.strip().lower())
+    except ValueError:
+        print(f"[Warning][parse_hiker_response_cache_mode] Unrecognized HikerAPI response cache mode '{raw_cache_mode}', expected one of {[mode.value for mode in HikerResponseCacheModes]}, the cache is turned off")
+        return HikerResponseCacheModes.off
+
+HIKER_RESPONSE_CACHE_MODE = parse_hiker_response_cache_mode(str(os.getenv('HIKER_RESPONSE_CACHE_MODE', HikerResponseCacheModes.off.value)))
+
+"""
+Local, content addressed store of raw HikerAPI responses. Each response is gzipped and written once under its
+SHA-256 digest, identical responses (ex. re-recorded pages that didn't change) share the same blob, and an index
+maps each request (endpoint + key, ex. user pk and page cursor) to the digest of its latest response. Recording
+an account's pages once lets classifier and pipeline changes be iterated on and benchmarked at local disk speed,
+with the exact same input on every run.
+"""
+class HikerResponseStore:
+    # Properties
+    shared_instance = None
+    shared_instance_lock = threading.Lock()
+
+    def __init__(self, database_path: str | None = None, blobs_directory: str | None = None):
+        self.database_path = database_path if database_path else local_storage_path(HIKER_RESPONSES_FILE_NAME)
+        self.blobs_directory = blobs_directory if blobs_directory else local_storage_path(HIKER_RESPONSE_BLOBS_DIRECTORY_NAME)
+        self.lock = threading.Lock()
+        self.connection = connect_local_database(self.database_path)
+        self.create_tables()
+
+    @classmethod
+    def shared(cls):
+        """Lazily created response store shared across scrapers within the same process."""
+        with cls.shared_instance_lock:
+            if cls.shared_instance is None:
+                cls.shared_instance = cls()
+
+        return cls.shared_instance
+
+    def create_tables(self):
+        with self.lock, self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    endpoint TEXT NOT NULL,
+                    request_key TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    recorded_at INTEGER NOT NULL,
+                    PRIMARY KEY (endpoint, request_key)
+                ) WITHOUT ROWID
+            """)
+
+    def get_response(self, endpoint: str, request_key: str) -> Optional[any]:
+        """The latest response recorded for the given request, None if it was never recorded."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT digest FROM responses WHERE endpoint = ? AND request_key = ?",
+                (endpoint, request_key)
+                ).fetchone()
+
+        if row is None:
+            return None
+
+        with gzip.open(self.__blob_path(row[0]), 'rt', encoding='utf-8') as blob:
+            return json.load(blob)
+
+    def save_response(self, endpoint: str, request_key: str, response: any) -> str:
+        """Stores the given JSON serializable response as the latest one for the given request, returns its digest."""
+        serialized_response = json.dumps(response, sort_keys=True, default=str).encode('utf-8')
+        digest = hashlib.sha256(serialized_response).hexdigest()
+        blob_path = self.__blob_path(digest)
+
+        # Content addressed, an existing blob already holds these exact bytes
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            temporary_blob_path = f"{blob_path}.{threading.get_ident()}.tmp"
+
+            # mtime=0 keeps the compressed bytes deterministic too
+            with open(temporary_blob_path, 'wb') as blob:
+                blob.write(gzip.compress(serialized_response, mtime=0))
+
+            os.replace(temporary_blob_path, blob_path)
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (endpoint, request_key, digest, recorded_at) VALUES (?, ?, ?, ?)",
+                (endpoint, request_key, digest, int(time.time() * 1000))
+                )
+
+        return digest
+
+    def __blob_path(self, digest: str) -> str:
+        # Fanned out by the digest's prefix to keep directories small
+        return os.path.join(self.blobs_directory, digest[:2], f"{digest}.json.gz")
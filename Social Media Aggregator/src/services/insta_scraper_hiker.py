@@ -2,19 +2,31 @@
 # Instagram scraper
 from hikerapi import Client
 
-# Utils
-import time
+# Services
+from src.services.rate_limiter import RateLimiter, Upstreams
+from src.services.ttl_cache import TTLCache
+from src.services.pipeline_metrics import trace_span, increment_counter
+from src.services.hiker_response_store import HikerResponseStore, HikerResponseCacheModes, HIKER_RESPONSE_CACHE_MODE
 
 # Environment Variables
 import os
 HIKER_API_KEY = str(os.getenv('HIKER_API_KEY'))
 
+# Profile cache bounds, profiles are reused across pipeline stages and requests until they expire
+PROFILE_CACHE_TTL_SECONDS = float(os.getenv('PROFILE_CACHE_TTL_SECONDS', 60 * 60))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv('PROFILE_CACHE_MAX_ENTRIES', 1024))
+
 class InstaScraper:
     # Properties
     client = None
 
-    def __init__(self):
+    # Shared by every scraper instance in this process, keyed by the lowercased username
+    profile_cache = TTLCache(max_entries=PROFILE_CACHE_MAX_ENTRIES, ttl_seconds=PROFILE_CACHE_TTL_SECONDS, name='profiles')
+
+    def __init__(self, response_cache_mode: HikerResponseCacheModes = HIKER_RESPONSE_CACHE_MODE):
         self.client = self.create_client()
+        # Record / replay raw responses to and from local disk, see [HikerResponseStore]
+        self.response_cache_mode = response_cache_mode
 
     # Instagram Session / Settings 
     def create_client(self):
@@ -22,12 +34,24 @@ class InstaScraper:
         return client
 
     def get_user_id(self, username: str):
-        user_id = self.client.user_by_username_v1(username)['pk']
+        user_id = self.get_user_info(username)['pk']
         return user_id
     
     def get_user_info(self, username: str):
-        user_info = self.client.user_by_username_v1(username)
+        user_info = self.profile_cache.get_or_load(username.lower(), lambda: self.__fetch_user_info(username))
+
+        # Don't hold on to error responses ex.) unknown users
+        if 'pk' not in user_info:
+            self.profile_cache.invalidate(username.lower())
+
         return user_info
+
+    def __fetch_user_info(self, username: str):
+        return self.__perform_request(
+            endpoint='user_by_username_v1',
+            request_key=username.lower(),
+            request=lambda: self.client.user_by_username_v1(username)
+            )
     
     """
     Paginates through user media asynchronously by a specified amount
@@ -36,12 +60,34 @@ class InstaScraper:
     Note: end_cursor Is the media to start paginating from
     """
     def get_paginated_posts(self, user_id: str, end_cursor: str | None):
-        start_time = time.time()  
-        posts = self.client.user_medias_chunk_v1(user_id=user_id, end_cursor=end_cursor)
-        
-        # Performance Metrics Logging
-        end_time = time.time() 
-        elapsed_time = end_time - start_time
-        print(f"[get_paginated_posts] Finished in {elapsed_time} seconds.")
-
-        return posts
\ No newline at end of file
+        # Performance Metrics
+        with trace_span('fetch_page'):
+            posts = self.__perform_request(
+                endpoint='user_medias_chunk_v1',
+                request_key=f"{user_id}:{end_cursor or ''}",
+                request=lambda: self.client.user_medias_chunk_v1(user_id=user_id, end_cursor=end_cursor)
+                )
+
+        return posts
+
+    """
+    Performs the given HikerAPI request, or serves its recorded response when replaying.
+    The request key identifies the request within its endpoint ex.) user pk + page cursor
+    """
+    def __perform_request(self, endpoint: str, request_key: str, request):
+        if self.response_cache_mode == HikerResponseCacheModes.replay:
+            response = HikerResponseStore.shared().get_response(endpoint, request_key)
+
+            if response is None:
+                raise LookupError(f"[InstaScraper][perform_request] No recorded {endpoint} response for {request_key}")
+
+            increment_counter('cache_hits.hiker_responses')
+            return response
+
+        RateLimiter.shared(Upstreams.hikerapi).acquire()
+        response = request()
+
+        if self.response_cache_mode == HikerResponseCacheModes.record:
+            HikerResponseStore.shared().save_response(endpoint, request_key, response)
+
+        return response
@@ -1,49 +1,217 @@
 # Dependencies
 # Instagram scraper
 from instagrapi import Client
+from instagrapi.exceptions import LoginRequired, ChallengeRequired, FeedbackRequired, PleaseWaitFewMinutes, ClientThrottledError, RateLimitError
+
+# Services
+from src.services.local_storage import local_storage_path
+
+# Types
+from typing import Callable
+
+# Utils
+import time
+import random
+import threading
 
 import os
 
-def get_user_id(cl, user):
-    user_id = cl.user_id_from_username(user)
-    return user_id
+# Constants
+# Scraping account used when no accounts are configured, its session is still read from the legacy session file
+LEGACY_USERNAME = str(os.getenv('INSTAGRAPI_LEGACY_USERNAME', ''))
+LEGACY_PASSWORD = str(os.getenv('INSTAGRAPI_LEGACY_PASSWORD', ''))
+LEGACY_SESSION_PATH = "session_irakli.json"
 
-def get_posts(cl, user_id, n_posts):
-    medias = cl.user_medias_v1(user_id, n_posts)
-    return medias
+# Accounts the session pool scrapes with ex.) "username1:password1,username2:password2"
+INSTAGRAPI_ACCOUNTS = str(os.getenv('INSTAGRAPI_ACCOUNTS', ''))
 
-class InstaScraper():
+# Random delay between two requests sent through the same session in seconds, other sessions can be used meanwhile
+INSTAGRAPI_SESSION_DELAY_RANGE = (1, 3)
+
+# How long a session is benched for after Instagram challenges or throttles it
+INSTAGRAPI_SESSION_COOLDOWN_SECONDS = float(os.getenv('INSTAGRAPI_SESSION_COOLDOWN_SECONDS', 15 * 60))
+
+# Max amount of posts fetched per request
+MEDIA_PAGE_SIZE = 33
+
+# Errors raised when Instagram wants a session to slow down or verify itself
+SESSION_CHALLENGE_ERRORS = (ChallengeRequired, FeedbackRequired, PleaseWaitFewMinutes, ClientThrottledError, RateLimitError)
+
+def parse_accounts(raw_accounts: str) -> list[tuple[str, str]]:
+    """
+    Parse the configured "username:password" pairs, falls back to the legacy account when none are configured.
+    Raises a ValueError when neither is configured.
+    """
+    accounts = []
+
+    for raw_account in raw_accounts.split(','):
+        username, _, password = raw_account.strip().partition(':')
+
+        if username and password:
+            accounts.append((username, password))
+
+    if not accounts and LEGACY_USERNAME and LEGACY_PASSWORD:
+        accounts.append((LEGACY_USERNAME, LEGACY_PASSWORD))
+
+    if not accounts:
+        raise ValueError("No Instagram scraping accounts configured, set INSTAGRAPI_ACCOUNTS (or INSTAGRAPI_LEGACY_USERNAME and INSTAGRAPI_LEGACY_PASSWORD)")
+
+    return accounts
+
+"""
+A logged in Instagram account. Its session is persisted to disk once logged in and restored from there
+afterwards instead of logging in again, it's only refreshed when Instagram rejects it.
+"""
+class InstagrapiSession:
+    def __init__(self, username: str, password: str, session_path: str, create_client: Callable[[], Client] = Client):
+        self.username = username
+        self.password = password
+        self.session_path = session_path
+        self.create_client = create_client
+        self.client = None
+
+        # Pacing, managed by the pool
+        self.in_use = False
+        self.available_at = 0.0
+
+        # Metrics
+        self.request_count = 0
+
+    def get_client(self) -> Client:
+        if self.client is None:
+            client = self.create_client()
+
+            if os.path.exists(self.session_path):
+                client.load_settings(self.session_path)
+                # Kept for refreshing the session if it's expired
+                client.username, client.password = self.username, self.password
+            else:
+                client.login(self.username, self.password)
+                client.dump_settings(self.session_path)
+
+            self.client = client
+
+        return self.client
+
+    def refresh(self):
+        self.get_client().login(self.username, self.password, relogin=True)
+        self.client.dump_settings(self.session_path)
+
+"""
+Spreads instagrapi requests across the sessions of several accounts. Each session waits a random delay between
+its own requests and is benched for a while when it's challenged or throttled, the requests go to whichever
+session is ready next so throughput grows with the amount of accounts.
+"""
+class InstagrapiSessionPool:
     # Properties
-    client = None
+    shared_instance = None
+    shared_instance_lock = threading.Lock()
+
+    def __init__(
+            self,
+            accounts: list[tuple[str, str]],
+            delay_range: tuple[float, float] = INSTAGRAPI_SESSION_DELAY_RANGE,
+            cooldown_seconds: float = INSTAGRAPI_SESSION_COOLDOWN_SECONDS,
+            sessions_directory: str | None = None,
+            create_client: Callable[[], Client] = Client
+            ):
+        self.delay_range = delay_range
+        self.cooldown_seconds = cooldown_seconds
+        self.condition = threading.Condition()
+        self.sessions = [
+            InstagrapiSession(username, password, self.__session_path(username, sessions_directory), create_client)
+            for username, password in accounts
+        ]
+
+    @classmethod
+    def shared(cls):
+        """Lazily created pool of the configured accounts shared across every scraper within the same process."""
+        with cls.shared_instance_lock:
+            if cls.shared_instance is None:
+                cls.shared_instance = cls(accounts=parse_accounts(INSTAGRAPI_ACCOUNTS))
+
+        return cls.shared_instance
+
+    @staticmethod
+    def __session_path(username: str, sessions_directory: str | None) -> str:
+        if sessions_directory:
+            return os.path.join(sessions_directory, f"instagrapi_session_{username}.json")
+
+        if LEGACY_USERNAME and username == LEGACY_USERNAME and os.path.exists(LEGACY_SESSION_PATH):
+            return LEGACY_SESSION_PATH
+
+        return local_storage_path(f"instagrapi_session_{username}.json")
+
+    def perform(self, request: Callable[[Client], any]):
+        """
+        Sends the request through the next ready session. Requests that get a session challenged are retried
+        on the other sessions, the last challenge is raised if every session gets challenged.
+        """
+        challenge = None
+
+        for _ in range(len(self.sessions)):
+            session = self.__acquire()
+            challenged = False
 
-    # Constants
-    USERNAME, PASSWORD = 'epicga_', 'epicgames26'
+            try:
+                try:
+                    return request(session.get_client())
+                except LoginRequired:
+                    session.refresh()
+                    return request(session.client)
+            except SESSION_CHALLENGE_ERRORS as e:
+                print(f"[InstagrapiSessionPool][perform] Session {session.username} challenged, cooling down: {e}")
+                challenged = True
+                challenge = e
+            finally:
+                self.__release(session, challenged)
 
-    def __init__(self):
-        # Create a new session.json file if it doesn't exist. Otherwise, load the existing session.json file.
-        if not os.path.exists("session_irakli.json"):
-            self.client = self.create_session(self.USERNAME, self.PASSWORD)
-        else: 
-            self.client = self.load_session(self.USERNAME, self.PASSWORD)
+        raise challenge
 
-    # Instagram Session / Settings 
-    def create_session(self, username, password):
-            client = Client()
-            client.delay_range = [1, 3]
-            client.login(username, password)
-            client.dump_settings("session_irakli.json")
+    def __acquire(self) -> InstagrapiSession:
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                ready_sessions = [session for session in self.sessions if not session.in_use and session.available_at <= now]
 
-            return client
+                if ready_sessions:
+                    # Least recently used first
+                    session = min(ready_sessions, key=lambda session: session.available_at)
+                    session.in_use = True
+                    session.request_count += 1
 
-    def load_session(self, username, password):
-            client = Client()
-            client.load_settings("session_irakli.json")
-            client.login(username, password)
+                    return session
 
-            return client
+                idle_sessions = [session for session in self.sessions if not session.in_use]
+                wait_time = min(session.available_at for session in idle_sessions) - now if idle_sessions else None
+
+                self.condition.wait(wait_time)
+
+    def __release(self, session: InstagrapiSession, challenged: bool):
+        with self.condition:
+            session.in_use = False
+            session.available_at = time.monotonic() + (self.cooldown_seconds if challenged else random.uniform(*self.delay_range))
+
+            self.condition.notify_all()
+
+class InstaScraper():
+    def __init__(self, session_pool: InstagrapiSessionPool | None = None):
+        # Sessions are logged in (or restored) on first use, not when the scraper is created
+        self.session_pool = session_pool if session_pool else InstagrapiSessionPool.shared()
 
     def get_media(self, username: str, number_posts: int):
-        user_id = get_user_id(self.client, username)
-        media = get_posts(self.client, user_id, number_posts)
-    
-        return media
+        user_id = self.session_pool.perform(lambda client: client.user_id_from_username(username))
+
+        # Each page can be fetched by a different session
+        media = []
+        end_cursor = ""
+
+        while len(media) < number_posts:
+            page_size = min(MEDIA_PAGE_SIZE, number_posts - len(media))
+            page, end_cursor = self.session_pool.perform(lambda client: client.user_medias_paginated_v1(user_id, page_size, end_cursor))
+            media.extend(page)
+
+            if len(page) == 0 or not end_cursor:
+                break
+
+        return media[:number_posts]
@@ -0,0 +1,78 @@
+# Dependencies
+# Types
+from typing import Dict
+from dataclasses import dataclass
+
+# Utils
+from dateutil import parser
+
+"""
+A single piece of media (image or video) attached to an Instagram post
+"""
+@dataclass(slots=True, frozen=True)
+class InstagramPostMedia:
+    media_url: str | None
+    video_thumbnail_url: str | None
+    # IMAGE, VIDEO or CAROUSEL_ALBUM
+    media_type: str
+
+    @classmethod
+    def from_resource(cls, resource: Dict[str, any], is_carousel: bool = False) -> 'InstagramPostMedia':
+        """Parses the media held by a raw post or one of its carousel resources."""
+        video_url = str(resource['video_url']) if (resource['video_url'] != None) else None
+        image_url = str(resource['thumbnail_url']) if (resource['thumbnail_url'] != None) else None
+
+        # Image and video media parsing
+        media_type = 'VIDEO' if (video_url != None) else 'IMAGE'
+
+        return cls(
+            media_url=video_url if (video_url != None) else image_url,
+            video_thumbnail_url=image_url if (video_url != None) else None,
+            media_type='CAROUSEL_ALBUM' if is_carousel else media_type
+        )
+
+"""
+Compact, immutable representation of an Instagram post holding only the fields the pipelines use. Raw media
+returned by the scrapers carry dozens of nested fields (user profiles, image candidates, music info etc.), they're
+converted once as soon as a page is fetched and dropped, every later stage (filtering, parsing, classification,
+cursors and uploads) works off of these instead.
+"""
+@dataclass(slots=True, frozen=True)
+class InstagramPost:
+    # Permalink code, the post's live source UID
+    code: str
+    # ISO 8601 creation date as returned by Instagram, and the same date in milliseconds
+    taken_at: str
+    creation_date_ms: int
+    caption: str | None
+    is_video: bool
+    # For carousels the main media is the first resource, and the secondary media are the others (if any)
+    media: InstagramPostMedia
+    secondary_media: tuple[InstagramPostMedia, ...] | None
+    # Usernames of the accounts tagged in the post
+    usertags: tuple[str, ...]
+    # Geotag, empty strings when the post isn't geotagged
+    location_name: str
+    location_address: str
+    location_city: str
+
+    @classmethod
+    def from_media(cls, media: Dict[str, any]) -> 'InstagramPost':
+        resources = media['resources']
+        is_carousel = len(resources) != 0
+        location = media.get('location')
+
+        return cls(
+            code=media['code'],
+            taken_at=media['taken_at'],
+            creation_date_ms=int(parser.parse(media['taken_at']).timestamp() * 1000),
+            caption=media['caption_text'],
+            is_video=bool(media['video_url']),
+            # Note: For carousels the main media is the first element in the resources array, and for singular posts it's in the post object itself
+            media=InstagramPostMedia.from_resource(resources[0] if is_carousel else media, is_carousel),
+            secondary_media=tuple(InstagramPostMedia.from_resource(resource) for resource in resources[1:]) if len(resources) > 1 else None,
+            usertags=tuple(dict.fromkeys(usertag['user']['username'] for usertag in (media.get('usertags') or []))),
+            location_name=(location['name'] or '') if location else '',
+            location_address=(location['address'] or '') if location else '',
+            location_city=(location['city'] or '') if location else ''
+        )
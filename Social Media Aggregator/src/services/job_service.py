@@ -0,0 +1,343 @@
+# Dependencies
+# Local persistence
+from src.services.local_storage import local_storage_path, connect_local_database
+
+# Services
+import src.services.pipeline_driver as pipeline_driver
+from src.services.bulk_ingestion import bulk_ingestion_pipeline
+from src.services.pipeline_progress import report_pipeline_stages_to
+from src.services.pipeline_metrics import MetricsRecorder, record_pipeline_metrics_to
+
+# Types
+from enum import Enum
+from typing import Optional, Dict, Callable
+
+# Utils
+import json
+import time
+import uuid
+import hashlib
+import threading
+import traceback
+
+# Environment Variables
+import os
+
+# Constants
+JOBS_FILE_NAME = str(os.getenv('JOBS_FILE_NAME', 'ingestion_jobs.db'))
+
+# Max amount of pipelines executed concurrently by this process
+JOB_WORKER_COUNT = int(os.getenv('JOB_WORKER_COUNT', 2))
+
+# How often idle workers check the queue for jobs submitted by other processes
+JOB_POLL_INTERVAL_SECONDS = 5
+
+# Successful jobs are reused for identical resubmissions within this window, after it a new job is created
+JOB_RESUBMISSION_WINDOW_MS = int(os.getenv('JOB_RESUBMISSION_WINDOW_MS', 60 * 60 * 1000))
+
+# Running jobs that haven't progressed or sent a heartbeat in this long are considered orphaned by a crashed process and are requeued
+JOB_STALE_AFTER_MS = int(os.getenv('JOB_STALE_AFTER_MS', 5 * 60 * 1000))
+
+# How often running jobs mark themselves as alive, well within the stale threshold so long stages aren't mistaken for orphans
+JOB_HEARTBEAT_INTERVAL_MS = int(os.getenv('JOB_HEARTBEAT_INTERVAL_MS', 60 * 1000))
+
+class JobStatus(Enum):
+    queued = "QUEUED"
+    running = "RUNNING"
+    succeeded = "SUCCEEDED"
+    failed = "FAILED"
+
+# The pipelines that can be run as jobs, keyed by the name of the synchronous endpoint they back
+SUPPORTED_PIPELINES: Dict[str, Callable[..., any]] = {
+    'classify_and_ingest_posts_ig': pipeline_driver.user_post_ingest_classify_pipeline,
+    'ingest_posts_ig': pipeline_driver.user_post_ingestion_pipeline,
+    'ingest_new_user_classify_ingest_posts_ig': pipeline_driver.auto_gen_novel_user_classification_pipeline,
+    'ingest_new_user_ingest_posts_ig': pipeline_driver.auto_gen_novel_user_pipeline,
+    'ingest_new_user_ig': pipeline_driver.ingest_user,
+    'bulk_ingest_posts_ig': bulk_ingestion_pipeline
+}
+
+def current_time_ms() -> int:
+    return int(time.time() * 1000)
+
+"""
+Runs long running ingestion pipelines in the background on a bounded pool of worker threads. Jobs are queued
+in a local SQLite database so queued and finished jobs survive restarts, and identical submissions are
+deduplicated into the same job while it's queued, running or recently succeeded.
+"""
+class JobService:
+    def __init__(
+            self,
+            database_path: str | None = None,
+            worker_count: int = JOB_WORKER_COUNT,
+            pipelines: Dict[str, Callable[..., any]] = SUPPORTED_PIPELINES
+            ):
+        self.database_path = database_path if database_path else local_storage_path(JOBS_FILE_NAME)
+        self.worker_count = worker_count
+        self.pipelines = pipelines
+
+        self.lock = threading.Lock()
+        self.connection = connect_local_database(self.database_path)
+        self.jobs_available = threading.Event()
+        self.stopped = threading.Event()
+        self.workers: list[threading.Thread] = []
+
+        self.create_tables()
+
+    def create_tables(self):
+        with self.lock, self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    idempotency_key TEXT NOT NULL,
+                    pipeline TEXT NOT NULL,
+                    parameters TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    stages TEXT NOT NULL DEFAULT '[]',
+                    result TEXT,
+                    metrics TEXT,
+                    error TEXT,
+                    created_at INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_by_idempotency_key ON jobs (idempotency_key, created_at);
+                CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+            """)
+
+            # Databases created before jobs recorded their metrics
+            columns = [column[1] for column in self.connection.execute("PRAGMA table_info(jobs)")]
+
+            if 'metrics' not in columns:
+                self.connection.execute("ALTER TABLE jobs ADD COLUMN metrics TEXT")
+
+    # Worker Pool
+    def start(self):
+        """Starts the worker pool (if not already started) and requeues any jobs orphaned by a previous process."""
+        with self.lock:
+            if self.workers:
+                return
+
+            with self.connection:
+                self.__requeue_stale_jobs()
+
+            self.stopped.clear()
+            self.workers = [
+                threading.Thread(target=self.__run_worker, name=f"job-worker-{i}", daemon=True)
+                for i in range(self.worker_count)
+            ]
+
+        for worker in self.workers:
+            worker.start()
+
+        self.jobs_available.set()
+
+    def stop(self, timeout: float | None = None):
+        """Stops the workers once their current jobs are done, queued jobs stay queued."""
+        self.stopped.set()
+        self.jobs_available.set()
+
+        for worker in self.workers:
+            worker.join(timeout)
+
+        with self.lock:
+            self.workers = []
+
+    def __run_worker(self):
+        while not self.stopped.is_set():
+            # Cleared before claiming so a submission made while claiming still wakes this worker up
+            self.jobs_available.clear()
+            job = self.__claim_next_job()
+
+            if job is None:
+                self.jobs_available.wait(JOB_POLL_INTERVAL_SECONDS)
+                continue
+
+            self.__execute(*job)
+
+    def __requeue_stale_jobs(self):
+        # Callers hold the lock and the connection's transaction
+        self.connection.execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+            (JobStatus.queued.value, current_time_ms(), JobStatus.running.value, current_time_ms() - JOB_STALE_AFTER_MS)
+            )
+
+    def __claim_next_job(self) -> Optional[tuple[str, str, Dict[str, any]]]:
+        # The claim is a single atomic statement, so workers in other processes sharing the database never claim the same job
+        with self.lock, self.connection:
+            # Jobs orphaned by a process that crashed while this one was running are picked back up too
+            self.__requeue_stale_jobs()
+
+            row = self.connection.execute(
+                """
+                UPDATE jobs SET status = ?, updated_at = ?
+                WHERE job_id = (SELECT job_id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1)
+                RETURNING job_id, pipeline, parameters
+                """,
+                (JobStatus.running.value, current_time_ms(), JobStatus.queued.value)
+                ).fetchone()
+
+        if row is None:
+            return None
+
+        job_id, pipeline, parameters = row
+
+        return job_id, pipeline, json.loads(parameters)
+
+    def __execute(self, job_id: str, pipeline: str, parameters: Dict[str, any]):
+        # Spans and counters recorded by this job's pipeline, snapshotted into the job at each stage and once it's done
+        metrics = MetricsRecorder()
+
+        # Keeps the job from being considered orphaned while a single stage runs longer than the stale threshold
+        heartbeat_stopped = threading.Event()
+        heartbeat = threading.Thread(target=self.__send_heartbeats, args=(job_id, heartbeat_stopped), name=f"job-heartbeat-{job_id}", daemon=True)
+        heartbeat.start()
+
+        try:
+            with report_pipeline_stages_to(lambda stage: self.__record_stage(job_id, stage, metrics)), record_pipeline_metrics_to(metrics):
+                result = self.pipelines[pipeline](**parameters)
+
+            # Pipelines signal failures by returning None or False
+            failed = result is None or result is False
+            status = JobStatus.failed if failed else JobStatus.succeeded
+            self.__finish(job_id, status, result=result, metrics=metrics, error="Pipeline failed" if failed else None)
+        except Exception as e:
+            print(f"[JobService][execute] Job {job_id} failed: {e}")
+            traceback.print_exc()
+
+            self.__finish(job_id, JobStatus.failed, result=None, metrics=metrics, error=str(e))
+        finally:
+            heartbeat_stopped.set()
+            heartbeat.join()
+
+    def __send_heartbeats(self, job_id: str, heartbeat_stopped: threading.Event):
+        while not heartbeat_stopped.wait(JOB_HEARTBEAT_INTERVAL_MS / 1000):
+            with self.lock, self.connection:
+                self.connection.execute(
+                    "UPDATE jobs SET updated_at = ? WHERE job_id = ? AND status = ?",
+                    (current_time_ms(), job_id, JobStatus.running.value)
+                    )
+
+    def __record_stage(self, job_id: str, stage: str, metrics: MetricsRecorder):
+        now = current_time_ms()
+
+        with self.lock, self.connection:
+            (stages,) = self.connection.execute("SELECT stages FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            stages = self.__close_last_stage(json.loads(stages), now)
+            stages.append({'stage': stage, 'startedAt': now, 'finishedAt': None})
+
+            self.connection.execute(
+                "UPDATE jobs SET stage = ?, stages = ?, metrics = ?, updated_at = ? WHERE job_id = ?",
+                (stage, json.dumps(stages), json.dumps(metrics.snapshot()), now, job_id)
+                )
+
+    def __finish(self, job_id: str, status: JobStatus, result: any, metrics: MetricsRecorder, error: str | None):
+        now = current_time_ms()
+
+        with self.lock, self.connection:
+            (stages,) = self.connection.execute("SELECT stages FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            stages = self.__close_last_stage(json.loads(stages), now)
+
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, stages = ?, result = ?, metrics = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status.value, json.dumps(stages), json.dumps(result), json.dumps(metrics.snapshot()), error, now, job_id)
+                )
+
+    @staticmethod
+    def __close_last_stage(stages: list[Dict[str, any]], finished_at: int) -> list[Dict[str, any]]:
+        if stages and stages[-1]['finishedAt'] is None:
+            stages[-1]['finishedAt'] = finished_at
+
+        return stages
+
+    # Submission
+    @staticmethod
+    def idempotency_key(pipeline: str, parameters: Dict[str, any]) -> str:
+        """Deterministic key for a pipeline and its parameters, identical submissions share the same key."""
+        serialized_submission = json.dumps({'pipeline': pipeline, 'parameters': parameters}, sort_keys=True)
+
+        return hashlib.sha256(serialized_submission.encode('utf-8')).hexdigest()
+
+    def submit(self, pipeline: str, parameters: Dict[str, any]) -> Dict[str, any]:
+        """
+        Queues the given pipeline to run with the given keyword parameters and returns its job. Resubmitting
+        an identical job that's still queued, running or that recently succeeded returns the existing job instead,
+        running jobs that stopped sending heartbeats (orphaned by a crashed process) aren't reused.
+        """
+        if pipeline not in self.pipelines:
+            raise ValueError(f"Unsupported pipeline: {pipeline}")
+
+        idempotency_key = self.idempotency_key(pipeline, parameters)
+        now = current_time_ms()
+
+        with self.lock, self.connection:
+            # Orphaned runs of this job are requeued and reused below instead of running alongside a new copy
+            self.__requeue_stale_jobs()
+
+            existing_job = self.connection.execute(
+                """
+                SELECT job_id FROM jobs
+                WHERE idempotency_key = ? AND (status = ? OR (status = ? AND updated_at >= ?) OR (status = ? AND updated_at >= ?))
+                ORDER BY created_at DESC LIMIT 1
+                """,
+                (
+                    idempotency_key,
+                    JobStatus.queued.value,
+                    JobStatus.running.value,
+                    now - JOB_STALE_AFTER_MS,
+                    JobStatus.succeeded.value,
+                    now - JOB_RESUBMISSION_WINDOW_MS
+                )
+                ).fetchone()
+
+            if existing_job:
+                job_id = existing_job[0]
+            else:
+                job_id = str(uuid.uuid4())
+
+                self.connection.execute(
+                    """
+                    INSERT INTO jobs (job_id, idempotency_key, pipeline, parameters, status, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (job_id, idempotency_key, pipeline, json.dumps(parameters), JobStatus.queued.value, now, now)
+                    )
+
+        self.jobs_available.set()
+
+        return self.get_job(job_id)
+
+    # Status
+    def get_job(self, job_id: str) -> Optional[Dict[str, any]]:
+        """Status and per stage progress of the given job, None if no such job exists."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT job_id, pipeline, parameters, status, stage, stages, metrics, error, created_at, updated_at FROM jobs WHERE job_id = ?",
+                (job_id,)
+                ).fetchone()
+
+        if row is None:
+            return None
+
+        job_id, pipeline, parameters, status, stage, stages, metrics, error, created_at, updated_at = row
+
+        return {
+            'jobID': job_id,
+            'pipeline': pipeline,
+            'parameters': json.loads(parameters),
+            'status': status,
+            'stage': stage,
+            'stages': json.loads(stages),
+            # Spans and counters recorded by the job's pipeline as of its latest stage, None until it starts
+            'metrics': json.loads(metrics) if metrics else None,
+            'error': error,
+            'creationDate': created_at,
+            'lastUpdated': updated_at
+        }
+
+    def get_job_result(self, job_id: str) -> any:
+        """Deserialized output of the given job's pipeline, None if the job hasn't succeeded (yet)."""
+        with self.lock:
+            row = self.connection.execute("SELECT result FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+        return json.loads(row[0]) if row and row[0] is not None else None
@@ -0,0 +1,36 @@
+# Dependencies
+# Types
+from typing import Callable
+
+# Utils
+import threading
+
+"""
+Stand-in for a service object that's only built the first time it's used, so importing the module that holds it
+doesn't pay for constructing its clients. Once built the same instance is reused, and attributes are read from
+and written to it transparently ex.) `api_service.ingest_instagram_post_batch(...)`
+"""
+class LazyService:
+    def __init__(self, build_service: Callable[[], any]):
+        # Set through object.__setattr__ since every other attribute write is forwarded to the service
+        object.__setattr__(self, 'build_service', build_service)
+        object.__setattr__(self, 'service', None)
+        object.__setattr__(self, 'lock', threading.Lock())
+
+    def get(self):
+        """The service, built on the first call."""
+        if self.service is None:
+            with self.lock:
+                if self.service is None:
+                    object.__setattr__(self, 'service', self.build_service())
+
+        return self.service
+
+    def is_built(self) -> bool:
+        return self.service is not None
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name: str, value: any):
+        setattr(self.get(), name, value)
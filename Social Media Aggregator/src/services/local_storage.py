@@ -0,0 +1,27 @@
+# Dependencies
+# File system
+import os
+
+# Local persistence
+import sqlite3
+
+# Environment Variables
+# Directory where local databases and caches are persisted between requests served by the same container
+LOCAL_STORAGE_DIRECTORY = str(os.getenv('LOCAL_STORAGE_DIRECTORY', 'local_storage'))
+
+def local_storage_path(file_name: str) -> str:
+    """Returns the path of the given file inside of the local storage directory, creating the directory if needed."""
+    os.makedirs(LOCAL_STORAGE_DIRECTORY, exist_ok=True)
+
+    return os.path.join(LOCAL_STORAGE_DIRECTORY, file_name)
+
+def connect_local_database(database_path: str) -> sqlite3.Connection:
+    """
+    Opens a SQLite connection that can be shared between threads, callers are responsible for serializing
+    access to it. WAL journaling lets readers proceed while a write is in progress.
+    """
+    connection = sqlite3.connect(database_path, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+
+    return connection
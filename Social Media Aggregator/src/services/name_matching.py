@@ -0,0 +1,149 @@
+# Dependencies
+# Fuzzy String Matching
+from rapidfuzz import fuzz, process
+
+# Utils
+import re
+import unicodedata
+from functools import lru_cache
+
+# Constants
+# Generic tokens that carry no identifying information about a place, these are dropped from names
+# before comparing them so 'Balthazar Restaurant' and 'Balthazar' are treated as the same place
+GENERIC_NAME_TOKENS = frozenset(['the', 'restaurant', 'restaurants', 'nyc', 'ny', 'newyork'])
+
+# Generic suffixes commonly appended to Instagram handles ex.) @lartusi_nyc, @carbonenewyork
+# Note: 'ny' is deliberately left out as it's too common of an ending ex.) @johnny
+GENERIC_HANDLE_SUFFIXES = ('newyork', 'restaurant', 'official', 'nyc')
+
+# Handles and names shorter than this aren't stripped any further to avoid over-normalizing them into noise
+MIN_STRIPPED_LENGTH = 3
+
+# easy_map classifications whose names are Instagram handles instead of location names
+HANDLE_EASY_MAP_CLASSIFICATIONS = ['No', 'Maybe', 'Unlikely']
+
+# Cache bounds for the normalized forms of names seen during a run
+NORMALIZATION_CACHE_SIZE = 16384
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def strip_accents(text: str) -> str:
+    """Decompose accented characters and drop their combining marks ex.) 'Café' -> 'Cafe'."""
+    decomposed_text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed_text if not unicodedata.combining(char))
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def tokenize_name(name: str) -> tuple[str, ...]:
+    """
+    Normalize a place name into its identifying tokens (case, accents, punctuation, whitespace and generic tokens).
+    Letters and digits of any script are kept so non-Latin names ex.) 'すし匠' don't normalize into nothing.
+    """
+    normalized_name = strip_accents(name).lower().replace('&', ' and ')
+
+    # Apostrophes are joined into the word they belong to ex.) "Katz's" -> 'katzs', all other punctuation splits words
+    normalized_name = re.sub(r"['’`]", '', normalized_name)
+    normalized_name = re.sub(r'new\s+york', 'newyork', normalized_name)
+    tokens = tuple(re.findall(r'[^\W_]+', normalized_name))
+
+    # Drop generic tokens, unless the name consists solely of them
+    identifying_tokens = tuple(token for token in tokens if token not in GENERIC_NAME_TOKENS)
+
+    return identifying_tokens if identifying_tokens else tokens
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_name(name: str) -> str:
+    """Space separated form of a place name's identifying tokens."""
+    return ' '.join(tokenize_name(name))
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def compact_handle(handle: str) -> str:
+    """Normalize an Instagram handle by dropping separators, accents and case ex.) 'Lartusi_NYC' -> 'lartusinyc'."""
+    return re.sub(r'[\W_]', '', strip_accents(handle).lower())
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def strip_handle_suffix(handle: str) -> str | None:
+    """Compact handle without its generic suffix ex.) 'lartusi_nyc' -> 'lartusi', None if the handle has no generic suffix."""
+    compacted_handle = compact_handle(handle)
+
+    for suffix in GENERIC_HANDLE_SUFFIXES:
+        if compacted_handle.endswith(suffix) and len(compacted_handle) - len(suffix) >= MIN_STRIPPED_LENGTH:
+            return compacted_handle[:-len(suffix)]
+
+    return None
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def compact_name(name: str) -> str:
+    """Place name's identifying tokens joined without spaces to compare against handles ex.) "L'Artusi NYC" -> 'lartusi'."""
+    return normalize_name(name).replace(' ', '')
+
+def name_similarity(name: str, google_name: str) -> float:
+    """
+    Similarity [0, 1] between two place names. The names are tokenized once and compared with
+    the order-insensitive token sort ratio, falling back to the plain ratio when it's higher.
+    Names without any identifying characters never match, as two empty strings are otherwise identical.
+    """
+    normalized_name, normalized_google_name = normalize_name(name), normalize_name(google_name)
+
+    if not normalized_name or not normalized_google_name:
+        return 0.0
+
+    return max(
+        fuzz.ratio(normalized_name, normalized_google_name),
+        fuzz.token_sort_ratio(normalized_name, normalized_google_name)
+        ) / 100
+
+def handle_similarity(handle: str, google_name: str) -> float:
+    """
+    Similarity [0, 1] between an Instagram handle and a place name. Handles have no word boundaries, so
+    the handle is compared against the prefix of the place name's compacted form with the same length. Handles
+    with a generic suffix are also compared in full against the compacted place name without that suffix.
+    Handles or names without any identifying characters ex.) '._' never match.
+    """
+    compacted_handle = compact_handle(handle)
+    compacted_google_name = compact_name(google_name)
+
+    if not compacted_handle or not compacted_google_name:
+        return 0.0
+    similarity = fuzz.ratio(compacted_handle, compacted_google_name[:len(compacted_handle)])
+
+    stripped_handle = strip_handle_suffix(handle)
+
+    if stripped_handle:
+        similarity = max(similarity, fuzz.ratio(stripped_handle, compacted_google_name))
+
+    return similarity / 100
+
+def match_score(name: str, google_name: str, is_easy_map: str) -> float:
+    """Calculate the similarity between some Instagram name or handle and a Google place name."""
+    if is_easy_map in HANDLE_EASY_MAP_CLASSIFICATIONS:
+        return handle_similarity(name, google_name)
+    else:
+        return name_similarity(name, google_name)
+
+def match_scores(name: str, google_names: list[str], is_easy_map: str) -> list[float]:
+    """Batched form of `match_score`, the name is normalized once and scored against every candidate in a single pass."""
+    if is_easy_map in HANDLE_EASY_MAP_CLASSIFICATIONS:
+        compacted_handle = compact_handle(name)
+        compacted_google_names = [compact_name(google_name) for google_name in google_names]
+        prefixes = [compacted_google_name[:len(compacted_handle)] for compacted_google_name in compacted_google_names]
+        scores = process.cdist([compacted_handle], prefixes, scorer=fuzz.ratio)[0]
+
+        stripped_handle = strip_handle_suffix(name)
+
+        if stripped_handle:
+            stripped_scores = process.cdist([stripped_handle], compacted_google_names, scorer=fuzz.ratio)[0]
+            scores = [max(score, stripped_score) for score, stripped_score in zip(scores, stripped_scores)]
+
+        return [
+            float(score) / 100 if compacted_handle and compacted_google_name else 0.0
+            for score, compacted_google_name in zip(scores, compacted_google_names)
+            ]
+    else:
+        normalized_name = normalize_name(name)
+        choices = [normalize_name(google_name) for google_name in google_names]
+        ratio_scores = process.cdist([normalized_name], choices, scorer=fuzz.ratio)[0]
+        token_sort_scores = process.cdist([normalized_name], choices, scorer=fuzz.token_sort_ratio)[0]
+
+        return [
+            float(max(ratio_score, token_sort_score)) / 100 if normalized_name and choice else 0.0
+            for ratio_score, token_sort_score, choice in zip(ratio_scores, token_sort_scores, choices)
+            ]
@@ -0,0 +1,114 @@
+# Dependencies
+# Types
+from typing import Callable, Iterator, Optional
+
+# Utils
+import queue
+import threading
+import contextvars
+
+# Constants
+# How long blocked producers / consumers wait before re-checking whether the prefetcher was cancelled
+CANCELLATION_CHECK_INTERVAL_SECONDS = 0.1
+
+# Marks the end of the page stream
+END_OF_PAGES = object()
+
+"""
+Paginates through some cursor based source on a background thread, fetching the next page while
+the consumer is still processing the current one. At most `prefetch_depth` pages are held ahead
+of the consumer, which bounds how many (billed) requests are wasted when the consumer stops early.
+
+Usage:
+    with PagePrefetcher(fetch_page) as pages:
+        for items, next_cursor in pages:
+            ...
+            if done: break  # Cancels any outstanding prefetches
+"""
+class PagePrefetcher:
+    def __init__(
+            self,
+            fetch_page: Callable[[Optional[str]], tuple[list, Optional[str]]],
+            start_cursor: Optional[str] = None,
+            prefetch_depth: int = 1
+            ):
+        self.fetch_page = fetch_page
+        self.start_cursor = start_cursor
+        self.pages = queue.Queue()
+        # Each fetched page takes a slot, the consumer frees one up each time it moves on to the next page
+        self.fetch_slots = threading.Semaphore(prefetch_depth + 1)
+        self.cancelled = threading.Event()
+        # Pages are fetched in a copy of the consumer's context so requests are still attributed to the same pipeline
+        self.fetcher = threading.Thread(target=contextvars.copy_context().run, args=(self.__fetch_pages,), name="page-prefetcher", daemon=True)
+
+    def __enter__(self):
+        self.fetcher.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cancel()
+
+    def __iter__(self) -> Iterator[tuple[list, Optional[str]]]:
+        is_first_page = True
+
+        while True:
+            # Moving on from the previous page allows one more page to be prefetched
+            if not is_first_page:
+                self.fetch_slots.release()
+
+            is_first_page = False
+            page = self.__take()
+
+            if page is END_OF_PAGES:
+                return
+            if isinstance(page, Exception):
+                raise page
+
+            yield page
+
+    def cancel(self):
+        """Stops fetching, any request already in flight completes but its page is discarded."""
+        self.cancelled.set()
+
+    # Producer
+    def __fetch_pages(self):
+        cursor = self.start_cursor
+
+        try:
+            while self.__acquire_fetch_slot():
+                items, cursor = self.fetch_page(cursor)
+
+                if not self.__put((items, cursor)):
+                    return
+
+                # Nothing left to paginate
+                if len(items) == 0 or cursor == None:
+                    break
+        except Exception as e:
+            self.__put(e)
+            return
+
+        self.__put(END_OF_PAGES)
+
+    def __acquire_fetch_slot(self) -> bool:
+        while not self.cancelled.is_set():
+            if self.fetch_slots.acquire(timeout=CANCELLATION_CHECK_INTERVAL_SECONDS):
+                return True
+
+        return False
+
+    def __put(self, page) -> bool:
+        if self.cancelled.is_set():
+            return False
+
+        self.pages.put(page)
+        return True
+
+    # Consumer
+    def __take(self):
+        while True:
+            try:
+                return self.pages.get(timeout=CANCELLATION_CHECK_INTERVAL_SECONDS)
+            except queue.Empty:
+                if self.cancelled.is_set():
+                    return END_OF_PAGES
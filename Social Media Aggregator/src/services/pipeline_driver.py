@@ -3,18 +3,15 @@
 import os
 
 # Utils
+import time
 import datetime
-from dateutil import parser
-
-# Data Processing
-import pandas as pd
+import importlib
+import contextvars
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 
 # Types
 from typing import Dict
-from instagrapi.types import Media
-
-# Progress Bar
-from tqdm import tqdm
 
 # Environment Variables
 import os
@@ -26,15 +23,55 @@ is_debug = str(os.getenv('DEBUG')) == 'True'
 # Services
 from src.services.insta_scraper_hiker import InstaScraper
 from src.services.foncii_api_service import FonciiAPIServiceAdapter
-from src.services.get_place_id import create_dataframe, find_restaurant_for_yes, find_restaurant_for_maybe, find_restaurant_for_no, create_dict_from_lists
+from src.services.pipeline_progress import report_pipeline_stage
+from src.services.pipeline_metrics import trace_span, increment_counter
+from src.services.post_cursor_store import PostCursorStore, CursorPipelines
+from src.services.page_prefetcher import PagePrefetcher
+from src.services.stream_buffering import buffered, batched
+from src.services.instagram_post import InstagramPost, InstagramPostMedia
+from src.services.lazy_service import LazyService
 
 # Add the parent directory of the current directory to the Python path
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 os.environ["PYTHONPATH"] = parent_dir + ":" + os.environ.get("PYTHONPATH", "")
 
-# Service defs
-api_service = FonciiAPIServiceAdapter()
-instascraper = InstaScraper()
+# Constants
+# Max amount of parsed post batches buffered ahead of the uploads by the streaming ingestion pipeline
+PARSED_POST_BATCH_BUFFER_SIZE = 2
+
+# Runs the Yes / Maybe / No classification branches in parallel, set to False to run them one after another
+CLASSIFY_BRANCHES_CONCURRENTLY = str(os.getenv('CLASSIFY_BRANCHES_CONCURRENTLY', 'True')) == 'True'
+
+# Modules only needed to classify posts (pandas, Google Maps and GCS clients), imported on first use since they
+# make up most of this service's import time
+CLASSIFICATION_MODULES = ['pandas', 'src.services.get_place_id']
+
+# Service defs | Built on first use so importing this module (ex. on a cold start) stays cheap
+api_service = LazyService(FonciiAPIServiceAdapter)
+instascraper = LazyService(InstaScraper)
+
+"""
+Builds the services and imports the modules used by the pipelines ahead of the first request, returns how
+long each one took in milliseconds. Anything already built or imported is reused.
+"""
+def warm_up(include_classification: bool = True) -> Dict[str, float]:
+    elapsed_time_ms = {}
+
+    def timed(name: str, warm_up_component):
+        start_time = time.perf_counter()
+        warm_up_component()
+        elapsed_time_ms[name] = (time.perf_counter() - start_time) * 1000
+
+    for name, service in [('api_service', api_service), ('instascraper', instascraper)]:
+        # Services swapped out for stand-ins (ex. in tests) don't need to be built
+        if isinstance(service, LazyService):
+            timed(name, service.get)
+
+    if include_classification:
+        for module_name in CLASSIFICATION_MODULES:
+            timed(module_name, lambda: importlib.import_module(module_name))
+
+    return elapsed_time_ms
 
 """
 Creates a new user based on the Instagram account given (if a user under the same username doesn't already exist)
@@ -77,122 +114,268 @@ def auto_gen_novel_user_pipeline(instagram_username: str, post_amount: int):
 """
 Fetches, parses and assigns GPIDs to posts that have been classified with google places. After processing 
 the posts, they're then uploaded to Foncii. This is basically for populating a user's entire map without them
-touching it.
+touching it. Posts are only parsed into their upload format one batch at a time, right before each batch is uploaded.
+
+Pass True for sync_mode to only fetch, classify and upload the posts published since this pipeline last ingested the
+user's posts into the given Foncii user. Returns True once every post is uploaded, including when there's nothing new.
 """
-def user_post_ingest_classify_pipeline(instagram_username: str, foncii_username: str, post_amount: int):
+def user_post_ingest_classify_pipeline(instagram_username: str, foncii_username: str, post_amount: int, sync_mode: bool = False) -> bool:
     # Precondition check, return early if post amount is not a positive non-zero number
     if (post_amount <= 0):
         return []
     
     # Fetch posts
-    posts = __aggregate_user_posts(instagram_username=instagram_username, post_amount=post_amount)
-    parsed_posts = __parse_user_posts(posts=posts, instagram_username=instagram_username)
+    report_pipeline_stage('aggregating_posts')
+    posts = __aggregate_posts_since_cursor(
+        pipeline=CursorPipelines.classification,
+        foncii_username=foncii_username,
+        instagram_username=instagram_username,
+        post_amount=post_amount,
+        sync_mode=sync_mode
+        )
+
+    # Nothing new to ingest since the last sync, every post is already uploaded just like after a full run
+    if (len(posts) == 0 and sync_mode):
+        return __finish_post_ingestion(
+            pipeline=CursorPipelines.classification,
+            foncii_username=foncii_username,
+            instagram_username=instagram_username,
+            posts=posts
+            )
 
     # Classify posts with google place IDs
+    report_pipeline_stage('classifying_posts')
     classified_posts_df, post_id_to_ig_mentions_mapping = __classify_posts_with_gpids_and_ig_mentions(posts)
 
-    # Mapping post IDs to GPIDs
-    mapped_post_ids_to_place_ids = {}
-    mapped_post_ids_to_place_id_ig_mention_mappings = {}
-
-    for k in range(len(classified_posts_df)):
-        # Properties
-        post_id = classified_posts_df.iloc[k]['postID']
-        place_ids = classified_posts_df.iloc[k]['place_id']
-        
-        # Mapping
-        mapped_post_ids_to_place_ids[post_id] = place_ids
-        mapped_post_ids_to_place_id_ig_mention_mappings[post_id] = post_id_to_ig_mentions_mapping[post_id]
-
-    # Updating parsed posts with their associated GPIDs
-    for l in range(len(parsed_posts)):
-        # Parsing
-        post_id = parsed_posts[l]['dataSource']['liveSourceUID']
+    # Mapping post IDs to GPIDs | Single columnar pass over the classified posts instead of per-row indexing
+    mapped_post_ids_to_place_ids = dict(zip(classified_posts_df['postID'], classified_posts_df['place_id']))
+    del classified_posts_df
 
-        # Find associated place ids (if any). Note each post can be associated with multiple 
-        # places so the place_ids field is an array of potential matches. If no matches then the 
-        # array is blank.
-        place_ids = mapped_post_ids_to_place_ids.get(post_id)
-        place_id_ig_mention_mappings = mapped_post_ids_to_place_id_ig_mention_mappings.get(post_id)
+    report_pipeline_stage('uploading_posts')
 
-        # Updating parsed post object
-        if (place_ids):
-            parsed_posts[l]['googlePlaceIDs'] = place_ids
-        else:
-            parsed_posts[l]['googlePlaceIDs'] = []
+    for batch_index, post_batch in enumerate(batched(posts, FonciiAPIServiceAdapter.POST_BATCH_SIZE)):
+        parsed_post_batch = __parse_user_posts(posts=post_batch, instagram_username=instagram_username)
+
+        # Updating parsed posts with their associated GPIDs
+        __apply_post_classifications(
+            parsed_posts=parsed_post_batch,
+            post_id_to_place_ids=mapped_post_ids_to_place_ids,
+            post_id_to_ig_mentions_mapping=post_id_to_ig_mentions_mapping
+            )
+
+        with trace_span('upload_posts'):
+            uploaded_batch = api_service.ingest_classified_instagram_post_batch(foncii_username, parsed_post_batch)
 
-        if (place_id_ig_mention_mappings):
-            parsed_posts[l]['gpidToInstagramHandleMappings'] = place_id_ig_mention_mappings
-        else:
-            parsed_posts[l]['gpidToInstagramHandleMappings'] = []
+        # The cursor isn't moved when any batch fails, so the next sync retries these posts
+        if not uploaded_batch:
+            print(f"[Error][user_post_ingest_classify_pipeline] Batch {batch_index + 1} failed to upload, pipeline stopped")
+            return False
 
-    return api_service.ingest_classified_instagram_posts(foncii_username, parsed_posts)
+        increment_counter('posts_uploaded', len(parsed_post_batch))
+
+    return __finish_post_ingestion(
+        pipeline=CursorPipelines.classification,
+        foncii_username=foncii_username,
+        instagram_username=instagram_username,
+        posts=posts
+        )
 
 """
-Maps the raw Instagram media to GPIDs (Google Place IDs) based on
+Maps the Instagram posts to GPIDs (Google Place IDs) based on
 the text content associated with them.
 """
-def __classify_posts_with_gpids_and_ig_mentions(posts: list[Media]):
+def __classify_posts_with_gpids_and_ig_mentions(posts: list[InstagramPost]):
+    # Imported on first use, see [CLASSIFICATION_MODULES]
+    import pandas as pd
+    import src.services.get_place_id as get_place_id
+
     # Remote file system properties
     bucket_name = str(os.getenv('GC_BUCKET_NAME'))
     file_path = str(os.getenv('GC_FILE_PATH'))
 
     # Create post dataframe
-    df = create_dataframe(posts)
-    df_yes = df[df.easy_map == 'Yes'].copy()
-    df_maybe = df[df.easy_map == 'Maybe'].copy()
-    df_no = df[df.easy_map == 'No'].copy()
+    with trace_span('build_dataframe'):
+        df = get_place_id.create_dataframe(posts)
+        df_yes = df[df.easy_map == 'Yes'].copy()
+        df_maybe = df[df.easy_map == 'Maybe'].copy()
+        df_no = df[df.easy_map == 'No'].copy()
     
-    if not df_yes.empty:
-        df_yes = find_restaurant_for_yes(df_yes)
-    if not df_maybe.empty:
-        df_maybe = find_restaurant_for_maybe(df_maybe, bucket_name, file_path)
-    if not df_no.empty:
-        df_no = find_restaurant_for_no(df_no, bucket_name, file_path)
+    run_branches = __run_concurrently if CLASSIFY_BRANCHES_CONCURRENTLY else __run_sequentially
 
-    df = pd.concat([df_yes, df_maybe, df_no])
+    def classify_branch(span_name: str, find_restaurant, df, *args, **kwargs):
+        if df.empty:
+            return df
+
+        with trace_span(span_name):
+            return find_restaurant(df, *args, **kwargs)
+
+    def classify_tagged_posts():
+        # Every unique tag of the 'Maybe' and 'No' posts is resolved once and shared by both branches,
+        # the resolutions are only read by the branches so they're safe to share between threads
+        resolved_usertags = None
+
+        if not df_maybe.empty or not df_no.empty:
+            with trace_span('resolve_usertags'):
+                resolved_usertags = get_place_id.resolve_usertags_for_posts(df_maybe, df_no, bucket_name, file_path)
+
+        return run_branches(
+            lambda: classify_branch('find_restaurant_for_maybe', get_place_id.find_restaurant_for_maybe, df_maybe, bucket_name, file_path, resolved_usertags=resolved_usertags),
+            lambda: classify_branch('find_restaurant_for_no', get_place_id.find_restaurant_for_no, df_no, bucket_name, file_path, resolved_usertags=resolved_usertags)
+        )
+
+    # The 'Yes' branch doesn't depend on any tags so it runs alongside the tag resolution
+    classified_df_yes, (classified_df_maybe, classified_df_no) = run_branches(
+        lambda: classify_branch('find_restaurant_for_yes', get_place_id.find_restaurant_for_yes, df_yes),
+        classify_tagged_posts
+    )
+
+    # Always concatenated in the same order regardless of which branch finished first
+    df = pd.concat([classified_df_yes, classified_df_maybe, classified_df_no])
 
     # Only select the rows with a place_id
     df = df[df['place_id'].apply(lambda x: len(x) > 0)]
 
     # Mapping post IDs to ig mention + GPID mapping array
-    post_id_to_ig_mentions_mapping = {}
-    for k in range(len(df)):
-        post_id = df.iloc[k]['postID']
-        ig_mentions = df.iloc[k]['ig_mentions']
-        gpids = df.iloc[k]['place_id']
-        gpids_to_ig_mentions_mapping = create_dict_from_lists(gpids, ig_mentions)
-
-        post_id_to_ig_mentions_mapping[post_id] = []
-        for key, value in gpids_to_ig_mentions_mapping.items():
-            # Parsing
-            gpid = key
-            ig_mention = value
-
-            # Only append the mapping if the ig_mention is valid aka not None
-            if (ig_mention):
-                post_id_to_ig_mentions_mapping[post_id].append({
-                    'googlePlaceID': gpid,
-                    'instagramHandle': ig_mention
-                })
+    post_id_to_ig_mentions_mapping = __map_post_ids_to_ig_mentions(
+        post_ids=df['postID'], 
+        place_ids=df['place_id'], 
+        ig_mentions=df['ig_mentions']
+        )
 
     return df, post_id_to_ig_mentions_mapping
 
+"""
+Runs the given tasks on their own threads (each in a copy of the current context so their metrics are still
+recorded to the calling pipeline), and returns their results in the order the tasks were given.
+"""
+def __run_concurrently(*tasks):
+    task_contexts = [contextvars.copy_context() for _ in tasks]
+
+    with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="classification") as executor:
+        futures = [executor.submit(task_context.run, task) for task_context, task in zip(task_contexts, tasks)]
+
+        return tuple(future.result() for future in futures)
+
+def __run_sequentially(*tasks):
+    return tuple(task() for task in tasks)
+
+"""
+Maps each classified post ID to its GPID + Instagram handle mapping array. The columns are
+walked together in a single pass, which avoids the heavy per-row cost of positional DataFrame indexing.
+"""
+def __map_post_ids_to_ig_mentions(post_ids, place_ids, ig_mentions) -> Dict[str, list[Dict[str, str]]]:
+    post_id_to_ig_mentions_mapping = {}
+
+    for post_id, gpids, post_ig_mentions in zip(post_ids, place_ids, ig_mentions):
+        gpids_to_ig_mentions_mapping = dict(zip(gpids, post_ig_mentions))
+
+        # Only append the mapping if the ig_mention is valid aka not None
+        post_id_to_ig_mentions_mapping[post_id] = [
+            {
+                'googlePlaceID': gpid,
+                'instagramHandle': ig_mention
+            }
+            for gpid, ig_mention in gpids_to_ig_mentions_mapping.items() if ig_mention
+        ]
+
+    return post_id_to_ig_mentions_mapping
+
+"""
+Enriches the parsed posts in place with their associated GPIDs and GPID to Instagram handle mappings.
+Each post is resolved through a dict lookup keyed on its live source UID (the post's permalink code).
+"""
+def __apply_post_classifications(
+        parsed_posts: list[Dict[str, any]], 
+        post_id_to_place_ids: Dict[str, list[str]], 
+        post_id_to_ig_mentions_mapping: Dict[str, list[Dict[str, str]]]
+        ) -> list[Dict[str, any]]:
+    for parsed_post in parsed_posts:
+        # Parsing
+        post_id = parsed_post['dataSource']['liveSourceUID']
+
+        # Find associated place ids (if any). Note each post can be associated with multiple 
+        # places so the place_ids field is an array of potential matches. If no matches then the 
+        # array is blank.
+        place_ids = post_id_to_place_ids.get(post_id)
+        place_id_ig_mention_mappings = post_id_to_ig_mentions_mapping.get(post_id)
+
+        # Updating parsed post object
+        parsed_post['googlePlaceIDs'] = place_ids if place_ids else []
+        parsed_post['gpidToInstagramHandleMappings'] = place_id_ig_mention_mappings if place_id_ig_mention_mappings else []
+
+    return parsed_posts
+
 """
 Fetches and ingests Instagram user posts / media into the Foncii ecosystem. This pipeline is
 used to populate an existing Foncii user's account with posts, but it doesn't classify them with
 restaurants, that's done by [user_post_ingest_classify_pipeline]
+
+The posts are streamed through a fetch -> parse -> batch -> upload stage chain, so each batch is uploaded
+as soon as it's parsed while the following pages are still being scraped. Only a few pages and batches
+are ever buffered between the stages, so memory use doesn't grow with the post amount.
+
+Pass True for sync_mode to only fetch and upload the posts published since this pipeline last ingested the
+user's posts into the given Foncii user. Returns True once every post is uploaded, including when there's nothing new.
 """
-def user_post_ingestion_pipeline(instagram_username: str, foncii_username: str, post_amount: int):
+def user_post_ingestion_pipeline(instagram_username: str, foncii_username: str, post_amount: int, sync_mode: bool = False) -> bool:
     # Precondition check, return early if post amount is not a positive non-zero number
     if (post_amount <= 0):
         return []
     
-    posts = __aggregate_user_posts(instagram_username=instagram_username, post_amount=post_amount)
-    parsed_posts = __parse_user_posts(posts=posts, instagram_username=instagram_username)
-    ingested_posts = __ingest_parsed_user_posts(foncii_username=foncii_username, parsed_posts=parsed_posts)
+    report_pipeline_stage('aggregating_posts')
 
-    return ingested_posts
+    # Newest post streamed so far, becomes the user's cursor once every batch is uploaded
+    newest_post = None
+
+    # Fetch + parse stages
+    def stream_parsed_posts():
+        nonlocal newest_post
+
+        for posts in __stream_posts_since_cursor(
+            pipeline=CursorPipelines.ingestion,
+            foncii_username=foncii_username,
+            instagram_username=instagram_username,
+            post_amount=post_amount,
+            sync_mode=sync_mode
+            ):
+            if (len(posts) == 0):
+                continue
+
+            newest_page_post = max(posts, key=lambda post: post.creation_date_ms)
+
+            if (newest_post == None or newest_page_post.creation_date_ms > newest_post.creation_date_ms):
+                newest_post = newest_page_post
+
+            yield from __parse_user_posts(posts=posts, instagram_username=instagram_username)
+
+    # Batch stage, runs ahead of the uploads on a background thread
+    parsed_post_batches = buffered(
+        batched(stream_parsed_posts(), FonciiAPIServiceAdapter.POST_BATCH_SIZE), 
+        buffer_size=PARSED_POST_BATCH_BUFFER_SIZE
+        )
+
+    # Upload stage
+    with closing(parsed_post_batches):
+        for batch_index, parsed_post_batch in enumerate(parsed_post_batches):
+            if (batch_index == 0):
+                report_pipeline_stage('uploading_posts')
+
+            with trace_span('upload_posts'):
+                uploaded_batch = api_service.ingest_instagram_post_batch(foncii_username, parsed_post_batch)
+
+            # Stop scraping on the first failed upload, the cursor isn't moved so the next sync retries these posts
+            if not uploaded_batch:
+                print(f"[Error][user_post_ingestion_pipeline] Batch {batch_index + 1} failed to upload, pipeline stopped")
+                return False
+
+            increment_counter('posts_uploaded', len(parsed_post_batch))
+
+    return __finish_post_ingestion(
+        pipeline=CursorPipelines.ingestion,
+        foncii_username=foncii_username,
+        instagram_username=instagram_username,
+        posts=[newest_post] if newest_post != None else []
+        )
 
 """
 Pulls the user's Instagram account info and ingests it into the Foncii ecosystem to
@@ -200,6 +383,7 @@ create a new user under their alias if one doesn't already exist.
 """
 def ingest_user(instagram_username: str) -> bool:
     # Scrape public user account info
+    report_pipeline_stage('ingesting_user')
     user_info = instascraper.get_user_info(instagram_username)
     parsed_user_info = {
         'username': user_info['username'],
@@ -213,13 +397,82 @@ def ingest_user(instagram_username: str) -> bool:
     return api_service.ingest_instagram_user(parsed_user_info)
 
 """
-Fetch and accumulate user posts into a single array to pipe into other pipelines 
-and applicable methods
+Fetches the user's posts for a pipeline run. In sync mode pagination stops at the newest post ingested by
+a previous run, and posts that aren't newer than it (ex. old pinned posts at the top of the gallery) are dropped.
+"""
+def __aggregate_posts_since_cursor(
+        pipeline: CursorPipelines,
+        foncii_username: str,
+        instagram_username: str,
+        post_amount: int,
+        sync_mode: bool
+        ) -> list[InstagramPost]:
+    # Accumulator
+    aggregated_posts = []
+
+    for posts in __stream_posts_since_cursor(
+        pipeline=pipeline,
+        foncii_username=foncii_username,
+        instagram_username=instagram_username,
+        post_amount=post_amount,
+        sync_mode=sync_mode
+        ):
+        aggregated_posts.extend(posts)
+
+    return aggregated_posts
+
+"""
+Streaming counterpart of [__aggregate_posts_since_cursor], yields the user's posts page by page
+"""
+def __stream_posts_since_cursor(
+        pipeline: CursorPipelines,
+        foncii_username: str,
+        instagram_username: str,
+        post_amount: int,
+        sync_mode: bool
+        ):
+    post_cursor = PostCursorStore.shared().get_cursor(pipeline, foncii_username, instagram_username) if sync_mode else None
+
+    if (post_cursor == None):
+        yield from __stream_user_post_pages(instagram_username=instagram_username, post_amount=post_amount)
+        return
+
+    for posts in __stream_user_post_pages(
+        instagram_username=instagram_username, 
+        post_amount=post_amount, 
+        stop_at_post_with_live_source_uid=post_cursor['liveSourceUID']
+        ):
+        yield [post for post in posts if post.creation_date_ms > post_cursor['creationDate']]
+
+"""
+Ends a successful ingestion run, the newest of the given ingested posts becomes the pipeline's cursor for the
+users' future delta syncs. Returns the pipeline's result.
 """
-def __aggregate_user_posts(instagram_username: str, post_amount: int, stop_at_post_with_live_source_uid: str | None = None):
+def __finish_post_ingestion(pipeline: CursorPipelines, foncii_username: str, instagram_username: str, posts: list[InstagramPost]) -> bool:
+    if (len(posts) == 0):
+        return True
+    
+    newest_post = max(posts, key=lambda post: post.creation_date_ms)
+
+    PostCursorStore.shared().save_cursor(
+        pipeline=pipeline,
+        foncii_username=foncii_username,
+        instagram_username=instagram_username, 
+        live_source_uid=newest_post.code, 
+        post_creation_date=newest_post.creation_date_ms
+        )
+
+    return True
+
+"""
+Streams the user's posts page by page, filtered by the aggregation limiters. The next page is prefetched
+in the background while the current page is being filtered and consumed, and once any limiter is reached
+outstanding prefetches are cancelled. The raw media of each page are converted to [InstagramPost]s and dropped.
+"""
+def __stream_user_post_pages(instagram_username: str, post_amount: int, stop_at_post_with_live_source_uid: str | None = None):
     # Precondition check, return early if post amount is not a positive non-zero number
     if (post_amount <= 0):
-        return []
+        return
     
     # Limits
     # The max post creation date / age should be less than or equal to 2 years
@@ -239,154 +492,121 @@ def __aggregate_user_posts(instagram_username: str, post_amount: int, stop_at_po
     # when an old post is detected
     MIN_POST_AMOUNT = 30
 
-    # Accumulator
-    aggregated_posts = []
-
-    # Pagination control
-    # pk / uid of the post to stop at
-    post_cursor = None
-
     # Obtain user's id if the username belongs to a valid user
     instagram_user_id = instascraper.get_user_id(instagram_username)
 
-    # Aggregate up to desired amount of posts or until the maximum post creation date is reached
-    while (len(aggregated_posts) < post_amount):
-        posts, post_cursor = instascraper.get_paginated_posts(
-            user_id=instagram_user_id, 
-            end_cursor=post_cursor
-            )
-        
-        # Accumulator
-        postsToAccumulate = []
-
-        # Post aggregation limiters
-        # Post max age limiter
-        # Rejects posts that are older than two years and breaks out of the loop early
-        post_is_too_old = False
-
-        # Cursor stop flag flow control
-        # Stop paginating if the permalink code of the post to stop at appears in the results.
-        end_cursor_found = False
-
-        # Minimum post amount limiter for edge cases
-        min_post_amount_reached = False
-
-        for post in posts:
-            # Parsing
-            post_creation_date = post['taken_at']
-            live_source_uid = post['code']
-
-            # Transforming
-            parsed_post_creation_date = parser.parse(post_creation_date)
-            # Convert from seconds to ms
-            post_creation_date_ms = int(parsed_post_creation_date.timestamp() * 1000)
+    # Fetches the page following the given cursor
+    def fetch_page(end_cursor: str | None):
+        return instascraper.get_paginated_posts(user_id=instagram_user_id, end_cursor=end_cursor)
 
-            # Determine if the minimum post amount was reached (1 full request)
-            min_post_amount_reached = len(aggregated_posts) >= MIN_POST_AMOUNT
+    # Amount of posts streamed so far
+    aggregated_post_count = 0
 
-             # Check to see if the stop_at_post_id is in the results (if required)
-            if (stop_at_post_with_live_source_uid != None):
-                end_cursor_found = live_source_uid == stop_at_post_with_live_source_uid
+    # Aggregate up to desired amount of posts or until the maximum post creation date is reached
+    with PagePrefetcher(fetch_page) as pages:
+        for medias, post_cursor in pages:
+            # Accumulator
+            postsToAccumulate = []
 
+            # Post aggregation limiters
             # Post max age limiter
-            post_is_too_old = post_creation_date_ms < MAX_POST_AGE
-
-            # Only break out if an old post is found after the min post amount is reached
-            # This captures edge cases where a user may have a super old post pinned at 
-            # the top of their gallery that might cause the scraper to return early due to a false positive.
-            should_break_out_from_old_post = (post_is_too_old == True and min_post_amount_reached == True)
-
-            # Accumulate valid posts, and break out early if a post violates any of the two limiters
-            if (should_break_out_from_old_post == False  and end_cursor_found == False):
-                postsToAccumulate.append(post)
-            else:
-                break
-
-        aggregated_posts.extend(postsToAccumulate)
-        
-        # Break out of the pagination loop early if there's nothing left to paginate or if 
-        # the end cursor stop flag is triggered and or if the oldest possible post was reached
-        if (
-            len(posts) == 0 
-            or post_cursor == None 
-            or end_cursor_found == True 
-            or post_is_too_old == True
-            ):
-            # Debug logging
-            print('Ending pagination early', 
-                  'post_is_too_old: ', post_is_too_old, 
-                  'end_cursor_found: ', end_cursor_found,
-                  'Remaining post count: ', abs(len(aggregated_posts) - len(posts)))
+            # Rejects posts that are older than two years and breaks out of the loop early
+            post_is_too_old = False
+
+            # Cursor stop flag flow control
+            # Stop paginating if the permalink code of the post to stop at appears in the results.
+            end_cursor_found = False
+
+            # Minimum post amount limiter for edge cases
+            min_post_amount_reached = False
+
+            for media in medias:
+                # Parsing
+                post = InstagramPost.from_media(media)
+                live_source_uid = post.code
+                post_creation_date_ms = post.creation_date_ms
+
+                # Determine if the minimum post amount was reached (1 full request)
+                min_post_amount_reached = aggregated_post_count >= MIN_POST_AMOUNT
+
+                # Check to see if the stop_at_post_id is in the results (if required)
+                if (stop_at_post_with_live_source_uid != None):
+                    end_cursor_found = live_source_uid == stop_at_post_with_live_source_uid
+
+                # Post max age limiter
+                post_is_too_old = post_creation_date_ms < MAX_POST_AGE
+
+                # Only break out if an old post is found after the min post amount is reached
+                # This captures edge cases where a user may have a super old post pinned at 
+                # the top of their gallery that might cause the scraper to return early due to a false positive.
+                should_break_out_from_old_post = (post_is_too_old == True and min_post_amount_reached == True)
+
+                # Accumulate valid posts, and break out early if a post violates any of the two limiters
+                if (should_break_out_from_old_post == False  and end_cursor_found == False):
+                    postsToAccumulate.append(post)
+                else:
+                    break
+
+            aggregated_post_count += len(postsToAccumulate)
+            increment_counter('posts_fetched', len(postsToAccumulate))
+            yield postsToAccumulate
             
-            break
-    
-    return aggregated_posts
+            # Break out of the pagination loop early if there's nothing left to paginate or if 
+            # the end cursor stop flag is triggered and or if the oldest possible post was reached
+            if (
+                len(medias) == 0 
+                or post_cursor == None 
+                or end_cursor_found == True 
+                or post_is_too_old == True
+                ):
+                # Debug logging
+                if is_debug:
+                    print('Ending pagination early', 
+                        'post_is_too_old: ', post_is_too_old, 
+                        'end_cursor_found: ', end_cursor_found,
+                        'Remaining post count: ', abs(aggregated_post_count - len(medias)))
+                
+                break
 
-"""
-Ingests parsed Instagram posts / media into the Foncii ecosystem by
-piping them into the Foncii API to be resolved by the api
-"""
-def __ingest_parsed_user_posts(foncii_username: str, parsed_posts: list[Dict[str, any]]):
-    return api_service.ingest_instagram_posts(foncii_username, parsed_posts)
+            # Desired amount of posts reached
+            if (aggregated_post_count >= post_amount):
+                break
 
 """
-Parses Instagram posts / media into an expected format suitable
+Parses Instagram posts into an expected format suitable
 for ingestion into the Foncii ecosystem via the API
 """
-def __parse_user_posts(posts: list[Media], instagram_username: str):
+def __parse_user_posts(posts: list[InstagramPost], instagram_username: str):
+    with trace_span('parse_posts'):
+        return __parse_posts(posts=posts, instagram_username=instagram_username)
+
+def __parse_posts(posts: list[InstagramPost], instagram_username: str):
     # Accumulator
     parsed_posts = []
 
-    for post in tqdm(posts):
-    # Parsing
-        post_media = post['resources']
-
-        def parse_post_media(post_media, is_carousel: bool = False) -> Dict[str, any] :
-            video_url = str(post_media['video_url']) if (post_media['video_url'] != None) else None
-            image_url = str(post_media['thumbnail_url'])  if (post_media['thumbnail_url'] != None) else None
-
-            # Image and video media parsing
-            video_thumbnail_url = image_url if (video_url != None) else None
-            parsed_media_url = video_url if (video_url != None) else image_url
-            media_type = 'VIDEO' if (video_url != None) else 'IMAGE'
-
-            if (is_carousel):
-                media_type = 'CAROUSEL_ALBUM'
-
-            parsed_media = {
-                'mediaURL' : parsed_media_url,
-                'videoMediaThumbnailURL' : video_thumbnail_url,
-                'mediaType' : media_type
-            }
-
-            return parsed_media
-
-        # Media
-        # Parse main media directly from the post
-        # Note: For carousels the main media is the first element in the resources array, and for singular posts it's in the post object itself
-        found_main_post_media = post_media[0] if len(post_media) != 0 else post
-        is_carousel = len(post_media) != 0
-
-        main_media = parse_post_media(found_main_post_media, is_carousel),
-        # Parse secondary media from resources field, skip the first resource as this is already provided by the post for main media
-        secondary_media = [(parse_post_media(media)) for media in post_media[1:]] if len(post_media) > 1 else None
+    def parse_post_media(post_media: InstagramPostMedia) -> Dict[str, any]:
+        return {
+            'mediaURL' : post_media.media_url,
+            'videoMediaThumbnailURL' : post_media.video_thumbnail_url,
+            'mediaType' : post_media.media_type
+        }
 
+    for post in posts:
         # Permalink Generation
-        post_permalink_code = post['code']
         # Instagram stub + username + og post ID is the permanent location of the post itself
-        permalink = f"https://www.instagram.com/{instagram_username}/p/{post_permalink_code}/"
+        permalink = f"https://www.instagram.com/{instagram_username}/p/{post.code}/"
 
         data_source = {
-            'liveSourceUID': post_permalink_code,
-            'sourceUID': post_permalink_code,
-            'caption': post['caption_text'],
+            'liveSourceUID': post.code,
+            'sourceUID': post.code,
+            'caption': post.caption,
             'permalink': permalink,
-            'creationDate': post['taken_at'],
-            'media': main_media[0],
-            'secondaryMedia': secondary_media
+            'creationDate': post.taken_at,
+            'media': parse_post_media(post.media),
+            'secondaryMedia': [parse_post_media(media) for media in post.secondary_media] if post.secondary_media else None
         }
 
         # Append parsed posts to accumulator
         parsed_posts.append({ 'dataSource': data_source })
 
-    return parsed_posts
\ No newline at end of file
+    return parsed_posts
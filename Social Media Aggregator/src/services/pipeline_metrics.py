@@ -0,0 +1,88 @@
+# Dependencies
+# Types
+from typing import Dict
+
+# Utils
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+"""
+Thread safe accumulator of counters (ex. upstream requests, cache hits, bytes sent) and span timings
+(ex. time spent fetching pages or classifying posts), keyed by name.
+"""
+class MetricsRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[str, int] = {}
+        # Span name -> [count, total seconds, max seconds]
+        self.spans: Dict[str, list] = {}
+
+    def increment(self, name: str, amount: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_span(self, name: str, seconds: float):
+        with self.lock:
+            span = self.spans.setdefault(name, [0, 0.0, 0.0])
+            span[0] += 1
+            span[1] += seconds
+            span[2] = max(span[2], seconds)
+
+    def snapshot(self) -> Dict[str, any]:
+        """JSON serializable copy of everything recorded so far."""
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'spans': {
+                    name: {'count': count, 'totalSeconds': total_seconds, 'maxSeconds': max_seconds}
+                    for name, (count, total_seconds, max_seconds) in self.spans.items()
+                }
+            }
+
+# Everything recorded by this process since it started
+process_metrics = MetricsRecorder()
+
+# Recorder for the pipeline currently running in this context (thread), None when nothing is listening
+current_metrics_recorder: ContextVar[MetricsRecorder | None] = ContextVar('current_metrics_recorder', default=None)
+
+"""
+Adds the given amount to the named counter, both process wide and for the pipeline running in the current context
+"""
+def increment_counter(name: str, amount: int = 1):
+    process_metrics.increment(name, amount)
+    recorder = current_metrics_recorder.get()
+
+    if recorder:
+        recorder.increment(name, amount)
+
+"""
+Times the enclosed block as the named span, both process wide and for the pipeline running in the current context.
+Spans are recorded even when the block raises.
+"""
+@contextmanager
+def trace_span(name: str):
+    start_time = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        elapsed_time = time.perf_counter() - start_time
+        process_metrics.record_span(name, elapsed_time)
+        recorder = current_metrics_recorder.get()
+
+        if recorder:
+            recorder.record_span(name, elapsed_time)
+
+"""
+Routes the metrics of any pipeline run inside of this block to the given recorder as well ex.) per job metrics
+"""
+@contextmanager
+def record_pipeline_metrics_to(recorder: MetricsRecorder | None):
+    token = current_metrics_recorder.set(recorder)
+
+    try:
+        yield
+    finally:
+        current_metrics_recorder.reset(token)
@@ -0,0 +1,32 @@
+# Dependencies
+# Types
+from typing import Callable
+
+# Utils
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Reporter for the pipeline currently running in this context (thread), None when nothing is listening
+current_stage_reporter: ContextVar[Callable[[str], None] | None] = ContextVar('current_stage_reporter', default=None)
+
+"""
+Reports that the pipeline running in the current context has entered the given stage. This is a no-op
+unless the pipeline is running inside of a `report_pipeline_stages_to` block ex.) when it's executed as a job.
+"""
+def report_pipeline_stage(stage: str):
+    reporter = current_stage_reporter.get()
+
+    if reporter:
+        reporter(stage)
+
+"""
+Routes the stage reports of any pipeline run inside of this block to the given reporter
+"""
+@contextmanager
+def report_pipeline_stages_to(reporter: Callable[[str], None]):
+    token = current_stage_reporter.set(reporter)
+
+    try:
+        yield
+    finally:
+        current_stage_reporter.reset(token)
@@ -0,0 +1,112 @@
+# Dependencies
+# Local persistence
+from src.services.local_storage import local_storage_path, connect_local_database
+
+# Types
+from enum import Enum
+from typing import Optional, Dict
+
+# Utils
+import time
+import threading
+
+# Environment Variables
+import os
+
+# Constants
+POST_CURSORS_FILE_NAME = str(os.getenv('POST_CURSORS_FILE_NAME', 'post_cursors.db'))
+
+# The pipelines that keep their own cursors, a post uploaded by one pipeline still has to be ingested by the other
+class CursorPipelines(Enum):
+    ingestion = "ingest_posts"
+    classification = "classify_and_ingest_posts"
+
+"""
+Local store of the newest post ingested by each pipeline for each Instagram user and the Foncii user their posts are
+ingested into. Delta syncs page through a user's posts only until they reach this cursor, so posts that were already
+ingested aren't fetched, classified or uploaded again.
+"""
+class PostCursorStore:
+    # Properties
+    shared_instance = None
+    shared_instance_lock = threading.Lock()
+
+    def __init__(self, database_path: str | None = None):
+        self.database_path = database_path if database_path else local_storage_path(POST_CURSORS_FILE_NAME)
+        self.lock = threading.Lock()
+        self.connection = connect_local_database(self.database_path)
+        self.create_tables()
+
+    @classmethod
+    def shared(cls):
+        """Lazily created cursor store shared across pipeline runs within the same process."""
+        with cls.shared_instance_lock:
+            if cls.shared_instance is None:
+                cls.shared_instance = cls()
+
+        return cls.shared_instance
+
+    def create_tables(self):
+        with self.lock, self.connection:
+            # Databases created before cursors were kept per pipeline, their cursors can't be attributed to either
+            # pipeline so they're dropped and the next sync of each pipeline is a full one
+            columns = [column[1] for column in self.connection.execute("PRAGMA table_info(post_cursors)")]
+
+            if columns and 'pipeline' not in columns:
+                self.connection.execute("DROP TABLE post_cursors")
+
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS post_cursors (
+                    pipeline TEXT NOT NULL,
+                    foncii_username TEXT NOT NULL,
+                    instagram_username TEXT NOT NULL,
+                    live_source_uid TEXT NOT NULL,
+                    post_creation_date INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL,
+                    PRIMARY KEY (pipeline, foncii_username, instagram_username)
+                )
+            """)
+
+    def get_cursor(self, pipeline: CursorPipelines, foncii_username: str, instagram_username: str) -> Optional[Dict[str, any]]:
+        """The newest post the given pipeline ingested for the given users, None if it never ingested their posts."""
+        with self.lock:
+            row = self.connection.execute(
+                """
+                SELECT live_source_uid, post_creation_date FROM post_cursors
+                WHERE pipeline = ? AND foncii_username = ? AND instagram_username = ?
+                """,
+                (pipeline.value, foncii_username, instagram_username)
+                ).fetchone()
+
+        if row is None:
+            return None
+
+        live_source_uid, post_creation_date = row
+
+        return {
+            'liveSourceUID': live_source_uid,
+            'creationDate': post_creation_date
+        }
+
+    def save_cursor(
+            self,
+            pipeline: CursorPipelines,
+            foncii_username: str,
+            instagram_username: str,
+            live_source_uid: str,
+            post_creation_date: int
+            ):
+        """Moves the given pipeline's cursor for the given users forward to the given post, older posts never move the cursor back."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO post_cursors (pipeline, foncii_username, instagram_username, live_source_uid, post_creation_date, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (pipeline, foncii_username, instagram_username) DO UPDATE SET
+                    live_source_uid = excluded.live_source_uid,
+                    post_creation_date = excluded.post_creation_date,
+                    updated_at = excluded.updated_at
+                WHERE excluded.post_creation_date >= post_cursors.post_creation_date
+                """,
+                (pipeline.value, foncii_username, instagram_username, live_source_uid, post_creation_date, int(time.time() * 1000))
+                )
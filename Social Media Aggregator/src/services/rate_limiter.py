@@ -0,0 +1,137 @@
+# Dependencies
+# Types
+from enum import Enum
+from typing import Dict
+from collections import deque
+
+# Services
+from src.services.pipeline_metrics import increment_counter
+
+# Utils
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Environment Variables
+import os
+
+# Upstream services shared by every pipeline running in this process
+class Upstreams(Enum):
+    hikerapi = "hikerapi"
+    google = "google"
+    foncii = "foncii"
+
+# Max sustained requests per second sent to each upstream by this process, 0 or less disables the limit
+UPSTREAM_REQUESTS_PER_SECOND = {
+    Upstreams.hikerapi: float(os.getenv('HIKERAPI_REQUESTS_PER_SECOND', 10)),
+    Upstreams.google: float(os.getenv('GOOGLE_MAPS_REQUESTS_PER_SECOND', 50)),
+    Upstreams.foncii: float(os.getenv('FONCII_API_REQUESTS_PER_SECOND', 20))
+}
+
+# Upper bound on how long a waiter sleeps before re-checking its turn
+MAX_WAIT_INTERVAL_SECONDS = 0.1
+
+# The account (or any other unit of work) that requests made in the current context are made on behalf of
+current_rate_limit_tenant: ContextVar[str | None] = ContextVar('current_rate_limit_tenant', default=None)
+
+"""
+Attributes the requests made by anything run inside of this block (including its prefetch and streaming threads)
+to the given tenant, so the shared rate limiters can take turns between tenants.
+"""
+@contextmanager
+def rate_limit_tenant(tenant: str):
+    token = current_rate_limit_tenant.set(tenant)
+
+    try:
+        yield
+    finally:
+        current_rate_limit_tenant.reset(token)
+
+"""
+Token bucket rate limiter shared by every thread calling some upstream. When several tenants are waiting
+for a token the tokens are handed out round-robin between them, so a tenant with many requests in flight
+(ex. one huge account) can't starve the others, it only ever gets its fair share of the upstream's rate.
+"""
+class RateLimiter:
+    # Properties
+    shared_instances: Dict[Upstreams, 'RateLimiter'] = {}
+    shared_instances_lock = threading.Lock()
+
+    def __init__(self, requests_per_second: float, burst: int = 1, upstream: Upstreams | None = None):
+        self.requests_per_second = requests_per_second
+        self.upstream = upstream
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+
+        self.condition = threading.Condition()
+        # Tenants with waiting requests in the order they're served, and how many requests each one has waiting
+        self.turn_order: deque = deque()
+        self.waiting_requests: Dict[str | None, int] = {}
+
+        # Metrics
+        self.request_count = 0
+
+    @classmethod
+    def shared(cls, upstream: Upstreams):
+        """Lazily created limiter shared across every pipeline run within the same process that calls the given upstream."""
+        with cls.shared_instances_lock:
+            if upstream not in cls.shared_instances:
+                cls.shared_instances[upstream] = cls(requests_per_second=UPSTREAM_REQUESTS_PER_SECOND[upstream], upstream=upstream)
+
+        return cls.shared_instances[upstream]
+
+    @classmethod
+    def request_counts(cls) -> Dict[str, int]:
+        """Amount of requests made to each upstream through the shared limiters so far."""
+        with cls.shared_instances_lock:
+            return {upstream.value: limiter.request_count for upstream, limiter in cls.shared_instances.items()}
+
+    def acquire(self):
+        """Blocks until the current tenant's turn comes up and a token is available."""
+        tenant = current_rate_limit_tenant.get()
+
+        if self.upstream:
+            increment_counter(f"upstream_requests.{self.upstream.value}")
+
+        with self.condition:
+            if self.requests_per_second <= 0:
+                self.request_count += 1
+                return
+
+            self.waiting_requests[tenant] = self.waiting_requests.get(tenant, 0) + 1
+
+            if tenant not in self.turn_order:
+                self.turn_order.append(tenant)
+
+            while True:
+                self.__refill()
+
+                if self.turn_order[0] == tenant and self.tokens >= 1:
+                    self.__grant(tenant)
+                    return
+
+                # Wait for the next token or for another tenant's turn to end
+                wait_time = (1 - self.tokens) / self.requests_per_second if self.tokens < 1 else MAX_WAIT_INTERVAL_SECONDS
+                self.condition.wait(min(wait_time, MAX_WAIT_INTERVAL_SECONDS))
+
+    def __refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.requests_per_second)
+        self.last_refill = now
+
+    def __grant(self, tenant: str | None):
+        self.tokens -= 1
+        self.request_count += 1
+        self.waiting_requests[tenant] -= 1
+
+        # Move the tenant to the back of the line, or out of it if it has nothing else waiting
+        self.turn_order.popleft()
+
+        if self.waiting_requests[tenant] > 0:
+            self.turn_order.append(tenant)
+        else:
+            del self.waiting_requests[tenant]
+
+        self.condition.notify_all()
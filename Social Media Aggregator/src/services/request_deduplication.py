@@ -0,0 +1,72 @@
+# Dependencies
+# Types
+from typing import Callable, Dict, Hashable
+from concurrent.futures import Future
+
+# Services
+from src.services.ttl_cache import TTLCache
+from src.services.pipeline_metrics import increment_counter
+
+# Utils
+import threading
+
+# Environment Variables
+import os
+
+# Constants
+# How long the result of a successful request is served to identical requests, and how many results are kept
+DEDUPLICATED_RESULT_TTL_SECONDS = float(os.getenv('DEDUPLICATED_RESULT_TTL_SECONDS', 5 * 60))
+DEDUPLICATED_RESULT_MAX_ENTRIES = int(os.getenv('DEDUPLICATED_RESULT_MAX_ENTRIES', 1024))
+
+"""
+Collapses identical requests (ex. retries of the same ingestion sent by the main API) into a single run.
+Duplicates that arrive while the first request is still running wait for it and share its outcome, and
+duplicates that arrive shortly after it succeeded are answered with its result without running anything.
+Failed requests aren't remembered, so retrying one after it finished runs it again.
+"""
+class RequestDeduplicator:
+    def __init__(
+            self,
+            result_ttl_seconds: float = DEDUPLICATED_RESULT_TTL_SECONDS,
+            max_entries: int = DEDUPLICATED_RESULT_MAX_ENTRIES
+            ):
+        self.lock = threading.Lock()
+        # Request key -> future resolved with the outcome of the request currently running under that key
+        self.in_flight_requests: Dict[Hashable, Future] = {}
+        self.completed_results = TTLCache(max_entries=max_entries, ttl_seconds=result_ttl_seconds)
+
+    def run(self, key: Hashable, perform_request: Callable[[], any]):
+        """The outcome of the request with the given key, only performed if no identical request is running or recently succeeded."""
+        with self.lock:
+            completed_result = self.completed_results.get(key)
+
+            if completed_result is not None:
+                increment_counter('deduplicated_requests.completed')
+                return completed_result
+
+            in_flight_request = self.in_flight_requests.get(key)
+            is_duplicate = in_flight_request is not None
+
+            if not is_duplicate:
+                in_flight_request = self.in_flight_requests[key] = Future()
+
+        # Attach to the running request, its errors are re-raised here as well
+        if is_duplicate:
+            increment_counter('deduplicated_requests.in_flight')
+            return in_flight_request.result()
+
+        try:
+            result = perform_request()
+        except BaseException as e:
+            in_flight_request.set_exception(e)
+            raise
+        else:
+            # Pipelines signal failures by returning None or False
+            if result is not None and result is not False:
+                self.completed_results.set(key, result)
+
+            in_flight_request.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.in_flight_requests[key]
@@ -0,0 +1,251 @@
+# Dependencies
+# Local persistence
+from src.services.local_storage import local_storage_path, connect_local_database
+
+# Matching
+from src.services.name_matching import compact_name, compact_handle, strip_handle_suffix, match_scores, name_similarity, normalize_name, tokenize_name
+
+# Types
+from typing import Optional, Dict
+
+# Utils
+import re
+import json
+import threading
+
+# Environment Variables
+import os
+
+# Constants
+GAZETTEER_FILE_NAME = str(os.getenv('GAZETTEER_FILE_NAME', 'restaurant_gazetteer.db'))
+
+# Offline matches skip the upstream services entirely, so they're only trusted at a 'High' confidence level
+OFFLINE_MATCH_SCORE_THRESHOLD = 0.75
+
+# Places scoring within this margin of the best match are just as likely, ex.) the locations of a chain sharing a name
+AMBIGUOUS_MATCH_SCORE_MARGIN = 0.05
+
+# Maximum amount of trigram candidates to score for a single lookup
+MAX_CANDIDATES = 25
+
+# Names are padded before being split into trigrams so short names still produce candidates
+TRIGRAM_PADDING = '  '
+
+def trigrams(text: str) -> set[str]:
+    """Splits a compacted name or handle into its padded character trigrams ex.) 'lilia' -> {'  l', ' li', 'lil', ...}."""
+    padded_text = f"{TRIGRAM_PADDING}{text}{TRIGRAM_PADDING}"
+
+    return set(padded_text[i:i + 3] for i in range(len(padded_text) - 2))
+
+def street_number(address: str) -> str | None:
+    """Leading house number of an address ex.) '691 8th Ave New York' -> '691', None if the address doesn't start with one."""
+    tokens = tokenize_name(address)
+
+    return tokens[0] if tokens and re.fullmatch(r'\d+[a-z]?', tokens[0]) else None
+
+def addresses_match(address: str, indexed_address: str) -> bool:
+    """
+    Whether two addresses point to the same location. Fuzzy matching alone accepts neighbouring locations on
+    the same street ex.) '1453 Broadway' vs '1435 Broadway', so the house numbers have to be identical first.
+    """
+    if normalize_name(address) == normalize_name(indexed_address):
+        return True
+
+    if street_number(address) != street_number(indexed_address):
+        return False
+
+    return name_similarity(address, indexed_address) >= OFFLINE_MATCH_SCORE_THRESHOLD
+
+"""
+Local on-disk index of restaurants that the pipeline has already resolved through the Foncii API, Google Places
+and the usertag dictionary. Lookups are served from a trigram candidate index over the places' compacted names,
+so previously seen restaurants can be resolved without a network request.
+"""
+class RestaurantGazetteer:
+    # Properties
+    shared_instance = None
+    shared_instance_lock = threading.Lock()
+
+    def __init__(self, database_path: str | None = None):
+        self.database_path = database_path if database_path else local_storage_path(GAZETTEER_FILE_NAME)
+        self.lock = threading.Lock()
+        self.connection = connect_local_database(self.database_path)
+        self.create_tables()
+
+    @classmethod
+    def shared(cls):
+        """Lazily created gazetteer shared across pipeline runs within the same process."""
+        with cls.shared_instance_lock:
+            if cls.shared_instance is None:
+                cls.shared_instance = cls()
+
+        return cls.shared_instance
+
+    def create_tables(self):
+        with self.lock, self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS places (
+                    place_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    address TEXT NOT NULL DEFAULT '',
+                    types TEXT NOT NULL DEFAULT '[]'
+                );
+                CREATE TABLE IF NOT EXISTS handles (
+                    handle TEXT PRIMARY KEY,
+                    place_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    types TEXT NOT NULL DEFAULT '[]'
+                );
+                CREATE TABLE IF NOT EXISTS trigrams (
+                    trigram TEXT NOT NULL,
+                    place_id TEXT NOT NULL,
+                    PRIMARY KEY (trigram, place_id)
+                ) WITHOUT ROWID;
+            """)
+
+    # Indexing
+    def record_place(self, place_id: str, name: str, address: str = '', types: list[str] | None = None):
+        """Indexes a resolved place under its compacted name's trigrams."""
+        if not place_id or not name:
+            return
+
+        with self.lock, self.connection:
+            self.__insert_place(place_id, name, address, types)
+
+    def record_handle(self, handle: str, place_id: str, name: str, score: float, types: list[str] | None = None):
+        """
+        Records the place an Instagram handle resolved to. Handles that didn't resolve to a food related
+        place are recorded too, with a blank place ID, so they're never resolved again.
+        """
+        with self.lock, self.connection:
+            self.__insert_handle(handle, place_id, name, score, types)
+
+            if score >= OFFLINE_MATCH_SCORE_THRESHOLD:
+                self.__insert_place(place_id, name, '', types)
+
+    def import_usertag_dictionary(self, dic_usertags: Dict[str, Dict[str, any]]):
+        """Bulk loads the shared usertag dictionary, existing entries are kept as they are."""
+        with self.lock, self.connection:
+            for usertag, usertag_info in dic_usertags.items():
+                place_id = usertag_info.get('place_id', '')
+                name = usertag_info.get('name', '')
+                score = usertag_info.get('score', 0)
+                types = usertag_info.get('type', [])
+
+                self.__insert_handle(usertag, place_id, name, score, types, replace=False)
+
+                if place_id and score >= OFFLINE_MATCH_SCORE_THRESHOLD:
+                    self.__insert_place(place_id, name, '', types)
+
+    def __insert_place(self, place_id: str, name: str, address: str, types: list[str] | None):
+        if not place_id or not name:
+            return
+
+        # Places are indexed under the first name they're seen with, later sightings can only fill in a missing address
+        self.connection.execute(
+            """
+            INSERT INTO places (place_id, name, address, types) VALUES (?, ?, ?, ?)
+            ON CONFLICT (place_id) DO UPDATE SET address = excluded.address
+            WHERE places.address = '' AND excluded.address != ''
+            """,
+            (place_id, name, address, json.dumps(types if types else []))
+            )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO trigrams (trigram, place_id) VALUES (?, ?)",
+            [(trigram, place_id) for trigram in trigrams(compact_name(name))]
+            )
+
+    def __insert_handle(self, handle: str, place_id: str, name: str, score: float, types: list[str] | None, replace: bool = True):
+        conflict_resolution = 'REPLACE' if replace else 'IGNORE'
+        self.connection.execute(
+            f"INSERT OR {conflict_resolution} INTO handles (handle, place_id, name, score, types) VALUES (?, ?, ?, ?, ?)",
+            (handle, place_id if place_id else '', name if name else '', score, json.dumps(types if types else []))
+            )
+
+    # Lookups
+    def find_handle(self, handle: str) -> Optional[Dict[str, any]]:
+        """Exact lookup of a previously resolved handle in the usertag dictionary format, None if the handle was never seen."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT place_id, name, score, types FROM handles WHERE handle = ?", (handle,)
+                ).fetchone()
+
+        if row is None:
+            return None
+
+        place_id, name, score, types = row
+
+        return {
+            'place_id': place_id,
+            'name': name,
+            'score': score,
+            'type': json.loads(types)
+        }
+
+    def find_place_for_name(self, name: str, address: str = '') -> Optional[Dict[str, any]]:
+        """
+        Best indexed place for a location name, None if no place matches with a high enough confidence.
+        When an address is given the place's indexed address must match it too, which keeps chains with
+        multiple locations under the same name from being resolved to the wrong location.
+        """
+        return self.__find_best_candidate(name, compact_name(name), is_easy_map='Yes', address=address)
+
+    def find_place_for_handle(self, handle: str) -> Optional[Dict[str, any]]:
+        """
+        Best indexed place for an Instagram handle, None if no place matches with a high enough confidence. Handles
+        carry no location, so a handle matching several places equally well (ex.) a chain's locations) isn't resolved.
+        """
+        compacted_handle = strip_handle_suffix(handle) or compact_handle(handle)
+
+        return self.__find_best_candidate(handle, compacted_handle, is_easy_map='Maybe')
+
+    def __find_best_candidate(self, name: str, compacted_name: str, is_easy_map: str, address: str = '') -> Optional[Dict[str, any]]:
+        if not compacted_name:
+            return None
+
+        name_trigrams = list(trigrams(compacted_name))
+        placeholders = ','.join('?' * len(name_trigrams))
+
+        with self.lock:
+            candidates = self.connection.execute(
+                f"""
+                SELECT places.place_id, places.name, places.address FROM places
+                JOIN (
+                    SELECT place_id, COUNT(*) AS shared_trigrams FROM trigrams
+                    WHERE trigram IN ({placeholders})
+                    GROUP BY place_id
+                    ORDER BY shared_trigrams DESC
+                    LIMIT ?
+                ) AS candidates ON candidates.place_id = places.place_id
+                """,
+                (*name_trigrams, MAX_CANDIDATES)
+                ).fetchall()
+
+        # Candidates whose indexed address disagrees with the given address are different locations
+        if address:
+            candidates = [
+                candidate for candidate in candidates 
+                if candidate[2] and addresses_match(address, candidate[2])
+            ]
+
+        if not candidates:
+            return None
+
+        scores = match_scores(name, [candidate_name for _, candidate_name, _ in candidates], is_easy_map)
+        best_index = max(range(len(scores)), key=lambda i: scores[i])
+
+        if scores[best_index] < OFFLINE_MATCH_SCORE_THRESHOLD:
+            return None
+
+        # Several places match about as well, picking one would be a guess that ends up saved as the handle's place
+        if sum(1 for score in scores if scores[best_index] - score <= AMBIGUOUS_MATCH_SCORE_MARGIN) > 1:
+            return None
+
+        place_id, candidate_name, _ = candidates[best_index]
+
+        return {
+            'place_id': place_id,
+            'name': candidate_name,
+            'score': scores[best_index]
+        }
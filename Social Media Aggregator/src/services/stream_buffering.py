@@ -0,0 +1,93 @@
+# Dependencies
+# Types
+from typing import Iterable, Iterator, TypeVar
+
+# Utils
+import queue
+import threading
+import contextvars
+from itertools import islice
+
+T = TypeVar('T')
+
+# Constants
+# How long a blocked producer waits before re-checking whether its consumer went away
+CANCELLATION_CHECK_INTERVAL_SECONDS = 0.1
+
+# Marks the end of a buffered stream
+END_OF_STREAM = object()
+
+"""
+Wraps an exception raised by a buffered stage so it can be re-raised on the consumer's side
+"""
+class StreamFailure:
+    def __init__(self, error: Exception):
+        self.error = error
+
+"""
+Runs the given lazy stage (ex. a generator) on a background thread, holding at most `buffer_size` of its items
+ahead of the consumer. Adjacent stages of a generator chain run concurrently this way, while the bounded buffer
+keeps memory constant no matter how many items flow through the chain. Closing the returned generator stops the stage.
+
+Usage:
+    with closing(buffered(parse(fetch()), buffer_size=2)) as parsed_items:
+        for item in parsed_items:
+            ...
+"""
+def buffered(items: Iterable[T], buffer_size: int) -> Iterator[T]:
+    buffer = queue.Queue(maxsize=buffer_size)
+    cancelled = threading.Event()
+
+    def put(item) -> bool:
+        while not cancelled.is_set():
+            try:
+                buffer.put(item, timeout=CANCELLATION_CHECK_INTERVAL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce():
+        iterator = iter(items)
+
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+
+            put(END_OF_STREAM)
+        except Exception as e:
+            put(StreamFailure(e))
+        finally:
+            # Propagates early stops upstream ex.) cancels outstanding page prefetches
+            close = getattr(iterator, 'close', None)
+
+            if close:
+                close()
+
+    # The stage runs in a copy of the consumer's context so it still reports to the same pipeline
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(produce,), name="stream-buffer", daemon=True).start()
+
+    try:
+        while True:
+            item = buffer.get()
+
+            if item is END_OF_STREAM:
+                return
+            if isinstance(item, StreamFailure):
+                raise item.error
+
+            yield item
+    finally:
+        cancelled.set()
+
+"""
+Groups the given stream into lists of `batch_size` items, the last batch holds whatever remains
+"""
+def batched(items: Iterable[T], batch_size: int) -> Iterator[list[T]]:
+    iterator = iter(items)
+
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
@@ -0,0 +1,106 @@
+# Dependencies
+# Types
+from typing import Callable, Dict, Hashable
+from collections import OrderedDict
+
+# Services
+from src.services.pipeline_metrics import increment_counter
+
+# Utils
+import time
+import threading
+
+"""
+Thread safe in-memory cache whose entries expire `ttl_seconds` after being stored. At most `max_entries`
+are kept, the least recently used entry is evicted first. Concurrent loads of the same missing key are
+collapsed into a single call of the loader, the other callers wait for its result.
+"""
+class TTLCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, name: str | None = None):
+        # Reported as the cache_hits.<name> and cache_misses.<name> metrics when given
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self.lock = threading.Lock()
+        # Key -> (value, expiration time), ordered from least to most recently used
+        self.entries: OrderedDict = OrderedDict()
+        # Keys currently being loaded -> lock held by the loading caller
+        self.loading_keys: Dict[Hashable, threading.Lock] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable):
+        """The unexpired value stored under the given key, None if there's none."""
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return None
+
+            value, expiration_time = entry
+
+            if expiration_time <= time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: any):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, load: Callable[[], any]):
+        """
+        The cached value for the given key, loaded and stored on a miss. Errors raised by the loader
+        aren't cached, they propagate to the loading caller and the next caller retries the load.
+        """
+        while True:
+            value = self.get(key)
+
+            if value is not None:
+                with self.lock:
+                    self.hits += 1
+
+                if self.name:
+                    increment_counter(f"cache_hits.{self.name}")
+
+                return value
+
+            with self.lock:
+                loading_lock = self.loading_keys.get(key)
+
+                if loading_lock is None:
+                    loading_lock = self.loading_keys[key] = threading.Lock()
+                    loading_lock.acquire()
+                    self.misses += 1
+                    break
+
+            # Another caller is loading this key, wait for it to finish then check the cache again
+            with loading_lock:
+                pass
+
+        if self.name:
+            increment_counter(f"cache_misses.{self.name}")
+
+        try:
+            value = load()
+            self.set(key, value)
+
+            return value
+        finally:
+            with self.lock:
+                del self.loading_keys[key]
+
+            loading_lock.release()
+
+    def invalidate(self, key: Hashable):
+        with self.lock:
+            self.entries.pop(key, None)
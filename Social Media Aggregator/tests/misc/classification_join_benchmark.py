@@ -0,0 +1,112 @@
+# Dependencies
+import sys
+import os
+import time
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/misc/classification_join_benchmark.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the project root to the Python path so the services can be resolved
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+# Data Processing
+import pandas as pd
+
+# Services
+import src.services.pipeline_driver as pipeline_driver
+from src.services.get_place_id import create_dict_from_lists
+
+# To run this benchmark, use this terminal command: python tests/misc/classification_join_benchmark.py
+# Compares the legacy iloc-in-loop join against the columnar pass + keyed lookup used by the classification pipeline
+POST_AMOUNT = 5000
+
+def generate_classified_posts(post_amount: int):
+    rows = []
+    parsed_posts = []
+
+    for k in range(post_amount):
+        post_id = f"C{k:010d}"
+        place_ids = [f"gpid_{k}_a", f"gpid_{k}_b"] if k % 3 else [f"gpid_{k}_a"]
+        ig_mentions = [f"handle_{k}", ""] if k % 3 else [f"handle_{k}"]
+
+        rows.append((post_id, place_ids, ig_mentions))
+        parsed_posts.append({'dataSource': {'liveSourceUID': post_id}})
+
+    classified_posts_df = pd.DataFrame(rows, columns=['postID', 'place_id', 'ig_mentions'])
+
+    return classified_posts_df, parsed_posts
+
+# Baseline implementation, kept verbatim for comparison purposes
+def legacy_join(df, parsed_posts):
+    post_id_to_ig_mentions_mapping = {}
+    for k in range(len(df)):
+        post_id = df.iloc[k]['postID']
+        ig_mentions = df.iloc[k]['ig_mentions']
+        gpids = df.iloc[k]['place_id']
+        gpids_to_ig_mentions_mapping = create_dict_from_lists(gpids, ig_mentions)
+
+        post_id_to_ig_mentions_mapping[post_id] = []
+        for key, value in gpids_to_ig_mentions_mapping.items():
+            if (value):
+                post_id_to_ig_mentions_mapping[post_id].append({
+                    'googlePlaceID': key,
+                    'instagramHandle': value
+                })
+
+    mapped_post_ids_to_place_ids = {}
+    mapped_post_ids_to_place_id_ig_mention_mappings = {}
+
+    for k in range(len(df)):
+        post_id = df.iloc[k]['postID']
+        place_ids = df.iloc[k]['place_id']
+        mapped_post_ids_to_place_ids[post_id] = place_ids
+        mapped_post_ids_to_place_id_ig_mention_mappings[post_id] = post_id_to_ig_mentions_mapping[post_id]
+
+    for l in range(len(parsed_posts)):
+        post_id = parsed_posts[l]['dataSource']['liveSourceUID']
+        place_ids = mapped_post_ids_to_place_ids.get(post_id)
+        place_id_ig_mention_mappings = mapped_post_ids_to_place_id_ig_mention_mappings.get(post_id)
+
+        parsed_posts[l]['googlePlaceIDs'] = place_ids if place_ids else []
+        parsed_posts[l]['gpidToInstagramHandleMappings'] = place_id_ig_mention_mappings if place_id_ig_mention_mappings else []
+
+    return parsed_posts
+
+def columnar_join(df, parsed_posts):
+    map_post_ids_to_ig_mentions = getattr(pipeline_driver, '__map_post_ids_to_ig_mentions')
+    apply_post_classifications = getattr(pipeline_driver, '__apply_post_classifications')
+
+    post_id_to_ig_mentions_mapping = map_post_ids_to_ig_mentions(
+        post_ids=df['postID'], 
+        place_ids=df['place_id'], 
+        ig_mentions=df['ig_mentions']
+        )
+    post_id_to_place_ids = dict(zip(df['postID'], df['place_id']))
+
+    return apply_post_classifications(
+        parsed_posts=parsed_posts,
+        post_id_to_place_ids=post_id_to_place_ids,
+        post_id_to_ig_mentions_mapping=post_id_to_ig_mentions_mapping
+        )
+
+def benchmark(join, label: str):
+    classified_posts_df, parsed_posts = generate_classified_posts(POST_AMOUNT)
+
+    start_time = time.perf_counter()
+    enriched_posts = join(classified_posts_df, parsed_posts)
+    elapsed_time = time.perf_counter() - start_time
+
+    print(f"[{label}] {POST_AMOUNT} posts joined in {elapsed_time:.4f} seconds.")
+
+    return enriched_posts, elapsed_time
+
+if __name__ == "__main__":
+    legacy_posts, legacy_time = benchmark(legacy_join, "legacy_join")
+    columnar_posts, columnar_time = benchmark(columnar_join, "columnar_join")
+
+    # Both joins must produce identical enrichments
+    assert(legacy_posts == columnar_posts)
+
+    print(f"Speedup: {legacy_time / columnar_time:.1f}x")
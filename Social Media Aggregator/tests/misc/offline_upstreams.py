@@ -0,0 +1,288 @@
+# Dependencies
+# Types
+from typing import Dict
+
+# Utils
+import os
+import json
+import time
+import random
+import datetime
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Local stand-ins for every upstream the Social Media Aggregator depends on (HikerAPI, Google Maps, GCS and the
+# Foncii GraphQL API). Each one can be slowed down and made to fail at random via [UpstreamFaults], and all of
+# them serve the same synthetic restaurant directory so the classification pipeline finds realistic matches.
+
+# Synthetic data
+RESTAURANT_COUNT = 250
+NEIGHBORHOODS = ["Williamsburg", "Astoria", "Soho", "Harlem", "Flushing", "Bushwick", "Chelsea", "Tribeca"]
+CUISINES = ["Pizza", "Ramen", "Tacos", "Dumplings", "Bagels", "Sushi", "Bistro", "Trattoria", "Deli", "Bakery"]
+
+class SimulatedUpstreamError(Exception):
+    pass
+
+"""
+Latency and error injection shared by the stand-ins, latency is in seconds and the error rate is the
+probability (0 to 1) of any single request failing.
+"""
+class UpstreamFaults:
+    def __init__(self, latency_seconds: float = 0, error_rate: float = 0, seed: int = 0):
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+        # Metrics
+        self.request_count = 0
+        self.error_count = 0
+
+    def inject(self, upstream: str):
+        with self.lock:
+            self.request_count += 1
+            should_fail = self.random.random() < self.error_rate
+
+            if should_fail:
+                self.error_count += 1
+
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+        if should_fail:
+            raise SimulatedUpstreamError(f"[{upstream}] Simulated upstream failure")
+
+def synthetic_restaurants(restaurant_count: int = RESTAURANT_COUNT) -> list[Dict[str, str]]:
+    restaurants = []
+
+    for k in range(restaurant_count):
+        cuisine = CUISINES[k % len(CUISINES)]
+        neighborhood = NEIGHBORHOODS[(k // len(CUISINES)) % len(NEIGHBORHOODS)]
+        name = f"{neighborhood} {cuisine} {k}"
+
+        restaurants.append({
+            'place_id': f"ChIJ_synthetic_{k:05d}",
+            'name': name,
+            'handle': name.lower().replace(' ', '') + "nyc",
+            'address': f"{100 + k} {neighborhood} Ave",
+            'city': "New York"
+        })
+
+    return restaurants
+
+"""
+Stand-in for the HikerAPI client, serves synthetic accounts of the given sizes. A third of the posts are
+geotagged with the restaurant's address ('Yes' posts), a third only tag the restaurant's handle ('Maybe' posts)
+and the rest have neither ('No' posts).
+"""
+class FakeHikerClient:
+    def __init__(self, account_post_counts: Dict[str, int], faults: UpstreamFaults | None = None, page_size: int = 30):
+        self.account_post_counts = account_post_counts
+        self.faults = faults if faults else UpstreamFaults()
+        self.page_size = page_size
+        self.restaurants = synthetic_restaurants()
+        self.now = datetime.datetime.now(datetime.timezone.utc)
+
+    def user_by_username_v1(self, username: str):
+        self.faults.inject("hikerapi")
+
+        if username not in self.account_post_counts:
+            return {'detail': "Target user not found"}
+
+        return {
+            'pk': username,
+            'username': username,
+            'full_name': username.title(),
+            'contact_phone_number': "",
+            'public_email': f"{username}@foncii.com",
+            'profile_pic_url_hd': f"https://cdn.foncii.com/{username}.jpg"
+        }
+
+    def user_medias_chunk_v1(self, user_id: str, end_cursor: str | None):
+        self.faults.inject("hikerapi")
+
+        post_count = self.account_post_counts[user_id]
+        start = int(end_cursor or 0)
+        end = min(start + self.page_size, post_count)
+        next_cursor = str(end) if end < post_count else None
+
+        return [[self.__make_post(user_id, k, post_count) for k in range(start, end)], next_cursor]
+
+    def __make_post(self, user_id: str, k: int, post_count: int) -> Dict[str, any]:
+        restaurant = self.restaurants[(k * 7) % len(self.restaurants)]
+        # Newest first, spread over the last ~20 months so the post age limiter never kicks in
+        taken_at = self.now - datetime.timedelta(minutes=k * 600 * 1000 // max(post_count, 1) + 1)
+        is_video = k % 5 == 0
+
+        post = {
+            'code': f"{user_id}_{k:06d}",
+            'taken_at': taken_at.isoformat(),
+            'caption_text': f"Dinner at {restaurant['name']} 🍕🍜 #foodie",
+            'resources': [],
+            'video_url': f"https://cdn.foncii.com/{user_id}/{k}.mp4" if is_video else None,
+            'thumbnail_url': f"https://cdn.foncii.com/{user_id}/{k}.jpg",
+            'usertags': [],
+            'location': None
+        }
+
+        if k % 3 == 0:
+            post['location'] = {'name': restaurant['name'], 'address': restaurant['address'], 'city': restaurant['city']}
+        elif k % 3 == 1:
+            post['usertags'] = [{'user': {'username': restaurant['handle']}}]
+            post['caption_text'] += f" @{restaurant['handle']}"
+
+        return post
+
+"""
+Stand-in for the `googlemaps` client, finds the synthetic restaurant whose name or handle appears in the query
+"""
+class FakeGoogleMapsClient:
+    def __init__(self, faults: UpstreamFaults | None = None):
+        self.faults = faults if faults else UpstreamFaults()
+        self.restaurants = synthetic_restaurants()
+
+    def find_place(self, query: str, input_type: str, fields: list[str]):
+        self.faults.inject("google")
+        normalized_query = query.lower()
+
+        for restaurant in self.restaurants:
+            if restaurant['name'].lower() in normalized_query or restaurant['handle'] in normalized_query:
+                return {
+                    'candidates': [{
+                        'place_id': restaurant['place_id'],
+                        'name': restaurant['name'],
+                        'types': ['restaurant', 'food', 'point_of_interest', 'establishment']
+                    }],
+                    'status': "OK"
+                }
+
+        return {'candidates': [], 'status': "ZERO_RESULTS"}
+
+"""
+Stand-in for `google.cloud.storage.Client`, buckets are directories under the given root
+"""
+class LocalStorageClient:
+    def __init__(self, root_directory: str, faults: UpstreamFaults | None = None):
+        self.root_directory = root_directory
+        self.faults = faults if faults else UpstreamFaults()
+
+    def bucket(self, bucket_name: str):
+        return LocalBucket(self, bucket_name)
+
+class LocalBucket:
+    def __init__(self, client: LocalStorageClient, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+
+    def blob(self, file_path: str):
+        return LocalBlob(self, file_path)
+
+class LocalBlob:
+    def __init__(self, bucket: LocalBucket, file_path: str):
+        self.bucket = bucket
+        self.path = f"{bucket.client.root_directory}/{bucket.bucket_name}/{file_path}"
+
+    def download_as_string(self) -> bytes:
+        self.bucket.client.faults.inject("gcs")
+
+        with open(self.path, 'rb') as blob:
+            return blob.read()
+
+    def upload_from_string(self, data: str, content_type: str | None = None):
+        self.bucket.client.faults.inject("gcs")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with open(self.path, 'w', encoding='utf-8') as blob:
+            blob.write(data)
+
+"""
+Stand-in for the Foncii GraphQL API, served over HTTP on localhost so requests go through the real
+networking stack. Injected errors are returned as 500s just like the real endpoint's failures.
+"""
+class LocalFonciiGraphQLServer:
+    def __init__(self, faults: UpstreamFaults | None = None):
+        self.faults = faults if faults else UpstreamFaults()
+        self.restaurants = synthetic_restaurants()
+        self.lock = threading.Lock()
+
+        # Metrics
+        self.ingested_post_count = 0
+        self.received_bytes = 0
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.__make_request_handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="local-foncii-api", daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/graphql"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def resolve(self, operation: Dict[str, any]) -> Dict[str, any]:
+        query = operation['query']
+        variables = operation['variables']
+
+        if 'ingestClassifiedDiscoveredInstagramPosts(' in query or 'ingestDiscoveredInstagramPosts(' in query:
+            posts = variables['input']['posts']
+
+            with self.lock:
+                self.ingested_post_count += len(posts)
+
+            field = 'ingestClassifiedDiscoveredInstagramPosts' if 'Classified' in query else 'ingestDiscoveredInstagramPosts'
+            return {'data': {field: [{'id': post['dataSource']['liveSourceUID']} for post in posts]}}
+
+        if 'ingestDiscoveredInstagramUser(' in query:
+            return {'data': {'ingestDiscoveredInstagramUser': {'username': variables['input']['username']}}}
+
+        if 'findGooglePlaceIDForPlaceSearchQuery(' in query:
+            # Foncii only knows every other restaurant, the rest fall back to Google
+            search_query = variables['searchQuery'].lower()
+
+            for k, restaurant in enumerate(self.restaurants):
+                if k % 2 == 0 and restaurant['name'].lower() in search_query:
+                    return {'data': {'findGooglePlaceIDForPlaceSearchQuery': {
+                        'googlePlaceID': restaurant['place_id'],
+                        'similarityScore': 1,
+                        'description': restaurant['name']
+                    }}}
+
+            return {'data': {'findGooglePlaceIDForPlaceSearchQuery': None}}
+
+        return {'data': None}
+
+    def __make_request_handler(self):
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+                with server.lock:
+                    server.received_bytes += len(body)
+
+                try:
+                    server.faults.inject("foncii")
+                    status_code, response = 200, server.resolve(json.loads(body))
+                except SimulatedUpstreamError as e:
+                    status_code, response = 500, {'errors': [{'message': str(e)}]}
+
+                encoded_response = json.dumps(response).encode('utf-8')
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(encoded_response)))
+                self.end_headers()
+                self.wfile.write(encoded_response)
+
+            # Silence the per request access logs
+            def log_message(self, format, *args):
+                pass
+
+        return RequestHandler
@@ -0,0 +1,186 @@
+# Dependencies
+import sys
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+from contextlib import redirect_stdout
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/misc/pipeline_benchmark.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the project root to the Python path so the services can be resolved
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+# Offline configuration, set before the services read their environment
+os.environ['GC_BUCKET_NAME'] = 'benchmark-bucket'
+os.environ['GC_FILE_PATH'] = 'usertags/dic_usertags.json'
+os.environ['HIKER_RESPONSE_CACHE_MODE'] = 'off'
+
+# Services
+import src.services.local_storage as local_storage
+import src.services.pipeline_driver as pipeline_driver
+import src.services.get_place_id as get_place_id
+import src.services.foncii_api_service as foncii_api_service
+from src.services.pipeline_progress import report_pipeline_stages_to
+from src.services.pipeline_metrics import MetricsRecorder, record_pipeline_metrics_to
+from src.services.rate_limiter import RateLimiter, Upstreams
+from src.services.insta_scraper_hiker import InstaScraper
+from src.services.restaurant_gazetteer import RestaurantGazetteer
+from src.services.post_cursor_store import PostCursorStore
+from tests.misc.offline_upstreams import FakeHikerClient, FakeGoogleMapsClient, LocalStorageClient, LocalFonciiGraphQLServer, UpstreamFaults
+
+# To run this benchmark, use this terminal command: python tests/misc/pipeline_benchmark.py
+# Drives the ingestion pipelines end to end against local stand-ins for every upstream, see tests/misc/offline_upstreams.py
+# ex.) python tests/misc/pipeline_benchmark.py --pipeline classify --post-counts 100 1000 --latency-ms 50 --error-rate 0.01
+DEFAULT_POST_COUNTS = [100, 1000, 10000]
+
+PIPELINES = {
+    'ingest': pipeline_driver.user_post_ingestion_pipeline,
+    'classify': pipeline_driver.user_post_ingest_classify_pipeline
+}
+
+"""
+Runs the given pipeline once over a fresh synthetic account of the given size, with fresh local storage
+(gazetteer, post cursors) so runs don't warm each other up. Returns the run's throughput, per stage time,
+peak memory (traced Python allocations) and upstream traffic.
+"""
+def run_benchmark(
+        post_count: int,
+        pipeline: str = 'ingest',
+        latency_seconds: float = 0,
+        error_rate: float = 0,
+        rate_limited: bool = False,
+        verbose: bool = False
+        ):
+    username = f"synthetic_{pipeline}_{post_count}_{time.time_ns()}"
+    faults = {upstream: UpstreamFaults(latency_seconds, error_rate, seed=k) for k, upstream in enumerate(['hikerapi', 'google', 'gcs', 'foncii'])}
+
+    # Everything swapped out below is restored once the run is over
+    previous_upstreams = (
+        pipeline_driver.instascraper.client,
+        pipeline_driver.api_service.api_service.api_endpoint,
+        foncii_api_service.prod_api_endpoint,
+        foncii_api_service.dev_api_endpoint,
+        get_place_id.googlemaps,
+        get_place_id.storage
+    )
+    previous_local_storage_directory = local_storage.LOCAL_STORAGE_DIRECTORY
+    previous_shared_instances = (RestaurantGazetteer.shared_instance, PostCursorStore.shared_instance, dict(RateLimiter.shared_instances))
+
+    with tempfile.TemporaryDirectory() as storage_directory, LocalFonciiGraphQLServer(faults['foncii']) as foncii_server:
+        # Upstreams
+        hiker_client = FakeHikerClient({username: post_count}, faults['hikerapi'])
+        google_client = FakeGoogleMapsClient(faults['google'])
+        storage_client = LocalStorageClient(os.path.join(storage_directory, 'gcs'))
+        # Empty usertag dictionary, seeded before faults are injected
+        storage_client.bucket(os.environ['GC_BUCKET_NAME']).blob(os.environ['GC_FILE_PATH']).upload_from_string("{}")
+        storage_client.faults = faults['gcs']
+
+        pipeline_driver.instascraper.client = hiker_client
+        pipeline_driver.api_service.api_service.api_endpoint = foncii_server.endpoint
+        foncii_api_service.prod_api_endpoint = foncii_api_service.dev_api_endpoint = foncii_server.endpoint
+        get_place_id.googlemaps = SimpleNamespace(Client=lambda key: google_client)
+        get_place_id.storage = SimpleNamespace(Client=lambda: storage_client)
+
+        # Local storage
+        local_storage.LOCAL_STORAGE_DIRECTORY = os.path.join(storage_directory, 'local_storage')
+        RestaurantGazetteer.shared_instance = None
+        PostCursorStore.shared_instance = None
+
+        if not rate_limited:
+            RateLimiter.shared_instances.update({upstream: RateLimiter(requests_per_second=0, upstream=upstream) for upstream in Upstreams})
+
+        # Stage timing + the pipeline's own spans and counters
+        stage_starts = []
+        record_stage = lambda stage: stage_starts.append((stage, time.perf_counter()))
+        metrics = MetricsRecorder()
+
+        succeeded = False
+        error = None
+        tracemalloc.start()
+        start_time = time.perf_counter()
+
+        try:
+            with open(os.devnull, 'w') as devnull, redirect_stdout(sys.stdout if verbose else devnull), report_pipeline_stages_to(record_stage), record_pipeline_metrics_to(metrics):
+                result = PIPELINES[pipeline](instagram_username=username, foncii_username=username, post_amount=post_count)
+                succeeded = result is not None and result is not False
+        except Exception as e:
+            error = str(e)
+        finally:
+            elapsed_time = time.perf_counter() - start_time
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            (
+                pipeline_driver.instascraper.client,
+                pipeline_driver.api_service.api_service.api_endpoint,
+                foncii_api_service.prod_api_endpoint,
+                foncii_api_service.dev_api_endpoint,
+                get_place_id.googlemaps,
+                get_place_id.storage
+            ) = previous_upstreams
+            local_storage.LOCAL_STORAGE_DIRECTORY = previous_local_storage_directory
+            RestaurantGazetteer.shared_instance, PostCursorStore.shared_instance, RateLimiter.shared_instances = previous_shared_instances
+            InstaScraper.profile_cache.invalidate(username.lower())
+
+        stage_seconds = {}
+        stage_ends = [start for _, start in stage_starts[1:]] + [start_time + elapsed_time]
+
+        for (stage, stage_start), stage_end in zip(stage_starts, stage_ends):
+            stage_seconds[stage] = stage_seconds.get(stage, 0) + stage_end - stage_start
+
+        return {
+            'pipeline': pipeline,
+            'postCount': post_count,
+            'succeeded': succeeded,
+            'error': error,
+            'elapsedSeconds': elapsed_time,
+            'postsPerSecond': post_count / elapsed_time if elapsed_time > 0 else 0,
+            'stageSeconds': stage_seconds,
+            'metrics': metrics.snapshot(),
+            'peakMemoryMB': peak_memory / (1024 * 1024),
+            'ingestedPostCount': foncii_server.ingested_post_count,
+            'fonciiBytesReceived': foncii_server.received_bytes,
+            'upstreamRequests': {upstream: upstream_faults.request_count for upstream, upstream_faults in faults.items()},
+            'upstreamErrors': {upstream: upstream_faults.error_count for upstream, upstream_faults in faults.items()}
+        }
+
+def print_report(report):
+    status = "ok" if report['succeeded'] else f"FAILED ({report['error'] or 'pipeline returned a failure'})"
+    stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in report['stageSeconds'].items())
+    requests = ", ".join(f"{upstream} {count}" for upstream, count in report['upstreamRequests'].items())
+    spans = ", ".join(
+        f"{name} {span['totalSeconds']:.2f}s/{span['count']}" 
+        for name, span in sorted(report['metrics']['spans'].items(), key=lambda item: -item[1]['totalSeconds'])
+        )
+
+    print(f"[{report['pipeline']}] {report['postCount']} posts | {status}")
+    print(f"    {report['elapsedSeconds']:.2f}s | {report['postsPerSecond']:.1f} posts/sec | peak memory {report['peakMemoryMB']:.1f} MB")
+    print(f"    stages: {stages}")
+    print(f"    spans (total/count): {spans}")
+    print(f"    upstream requests: {requests} | posts ingested: {report['ingestedPostCount']}")
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Offline throughput benchmark for the ingestion pipelines")
+    argument_parser.add_argument('--pipeline', choices=PIPELINES.keys(), default='ingest')
+    argument_parser.add_argument('--post-counts', type=int, nargs='+', default=DEFAULT_POST_COUNTS)
+    argument_parser.add_argument('--latency-ms', type=float, default=0, help="Latency added to every upstream request")
+    argument_parser.add_argument('--error-rate', type=float, default=0, help="Probability of any upstream request failing")
+    argument_parser.add_argument('--rate-limited', action='store_true', help="Keep the shared upstream rate limiters enabled")
+    argument_parser.add_argument('--verbose', action='store_true', help="Show the pipelines' own logging")
+    arguments = argument_parser.parse_args()
+
+    for post_count in arguments.post_counts:
+        print_report(run_benchmark(
+            post_count=post_count,
+            pipeline=arguments.pipeline,
+            latency_seconds=arguments.latency_ms / 1000,
+            error_rate=arguments.error_rate,
+            rate_limited=arguments.rate_limited,
+            verbose=arguments.verbose
+            ))
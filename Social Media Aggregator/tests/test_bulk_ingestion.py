@@ -0,0 +1,80 @@
+# Dependencies
+import sys
+import os
+import threading
+import time
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_bulk_ingestion.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.rate_limiter import RateLimiter, rate_limit_tenant
+from src.services.bulk_ingestion import BulkIngestionScheduler
+
+def test_rate_limiter_enforces_the_rate():
+    limiter = RateLimiter(requests_per_second=50)
+    start_time = time.monotonic()
+
+    for _ in range(11):
+        limiter.acquire()
+
+    # The first token is available immediately, the other 10 take 1/50th of a second each
+    assert time.monotonic() - start_time >= 0.18
+    assert limiter.request_count == 11
+
+def test_rate_limiter_takes_turns_between_tenants():
+    limiter = RateLimiter(requests_per_second=20)
+    grants = []
+    grants_lock = threading.Lock()
+
+    def make_requests(tenant: str, request_count: int):
+        with rate_limit_tenant(tenant):
+            for _ in range(request_count):
+                limiter.acquire()
+
+                with grants_lock:
+                    grants.append(tenant)
+
+    # A huge account floods the limiter from several threads before a small account shows up
+    huge_account_threads = [threading.Thread(target=make_requests, args=("huge", 10)) for _ in range(4)]
+
+    for thread in huge_account_threads:
+        thread.start()
+
+    time.sleep(0.1)
+    small_account_thread = threading.Thread(target=make_requests, args=("small", 3))
+    small_account_thread.start()
+
+    for thread in [*huge_account_threads, small_account_thread]:
+        thread.join()
+
+    # Without turns the small account would wait for the huge account's ~40 queued requests
+    assert len(grants) == 43
+    assert grants.index("small") < 10
+    last_small_grant = len(grants) - 1 - grants[::-1].index("small")
+    assert last_small_grant < 16
+
+def test_scheduler_reports_each_account_and_aggregate_throughput():
+    def fake_pipeline(instagram_username: str, foncii_username: str, post_amount: int):
+        if instagram_username == "broken":
+            raise RuntimeError("Upstream failure")
+
+        return instagram_username != "rejected"
+
+    scheduler = BulkIngestionScheduler(worker_count=3, ingestion_pipeline=fake_pipeline)
+    accounts = [
+        {'instagram_username': username, 'foncii_username': username, 'post_amount': 10}
+        for username in ["foncii", "broken", "rejected", "nyc_eats"]
+    ]
+
+    report = scheduler.run(accounts)
+
+    assert [result['instagramUsername'] for result in report['accounts']] == ["foncii", "broken", "rejected", "nyc_eats"]
+    assert [result['succeeded'] for result in report['accounts']] == [True, False, False, True]
+    assert report['throughput']['accountCount'] == 4
+    assert report['throughput']['succeededAccountCount'] == 2
+    assert report['throughput']['accountsPerMinute'] > 0
@@ -0,0 +1,72 @@
+# Dependencies
+import sys
+import os
+import json
+import subprocess
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_cold_start.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.pipeline_driver as pipeline_driver
+from src.services.lazy_service import LazyService
+
+# Max time importing the app may take on a cold start, generous enough to absorb slow CI machines
+IMPORT_TIME_BUDGET_SECONDS = 1.0
+
+# Modules that are slow to import and only needed once posts are classified (or by the standalone scraper)
+DEFERRED_MODULES = ['pandas', 'instagrapi', 'googlemaps', 'google.cloud.storage']
+
+# Imports the app in a fresh interpreter, like a new container would, and reports what it cost
+COLD_START_SCRIPT = f"""
+import sys, json, time
+start_time = time.perf_counter()
+import src.services.app_service
+import src.services.pipeline_driver as pipeline_driver
+print(json.dumps({{
+    'importSeconds': time.perf_counter() - start_time,
+    'loadedDeferredModules': [module for module in {DEFERRED_MODULES} if module in sys.modules],
+    'builtServices': [name for name in ['api_service', 'instascraper'] if getattr(pipeline_driver, name).is_built()]
+}}))
+"""
+
+def test_app_imports_within_budget_without_building_services():
+    output = subprocess.run([sys.executable, "-c", COLD_START_SCRIPT], cwd=parent_dir, capture_output=True, text=True, check=True)
+    cold_start = json.loads(output.stdout.strip().splitlines()[-1])
+
+    assert cold_start['loadedDeferredModules'] == []
+    assert cold_start['builtServices'] == []
+    assert cold_start['importSeconds'] < IMPORT_TIME_BUDGET_SECONDS
+
+def test_lazy_services_are_built_once_and_forward_attributes():
+    build_count = 0
+
+    class Service:
+        endpoint = "prod"
+
+    def build_service():
+        nonlocal build_count
+        build_count += 1
+        return Service()
+
+    service = LazyService(build_service)
+    assert not service.is_built()
+
+    service.endpoint = "local"
+
+    assert service.endpoint == "local"
+    assert service.get().endpoint == "local"
+    assert build_count == 1
+
+def test_warm_up_reports_each_component(monkeypatch):
+    monkeypatch.setattr(pipeline_driver, 'api_service', LazyService(object))
+    monkeypatch.setattr(pipeline_driver, 'instascraper', LazyService(object))
+
+    warm_up_times = pipeline_driver.warm_up()
+
+    assert set(warm_up_times) == {'api_service', 'instascraper', *pipeline_driver.CLASSIFICATION_MODULES}
+    assert pipeline_driver.api_service.is_built() and pipeline_driver.instascraper.is_built()
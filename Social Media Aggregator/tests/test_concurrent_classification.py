@@ -0,0 +1,48 @@
+# Dependencies
+import sys
+import os
+import threading
+import pandas as pd
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_concurrent_classification.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.pipeline_driver as pipeline_driver
+import src.services.get_place_id as get_place_id
+
+classify_posts = getattr(pipeline_driver, '__classify_posts_with_gpids_and_ig_mentions')
+
+# Stand-ins for the classification branches, each one only returns once all three are running at the same time
+def make_branch(barrier: threading.Barrier, wait_order: list):
+    def find_restaurant(df, *args, resolved_usertags = None):
+        barrier.wait(timeout=2)
+        wait_order.append(df['easy_map'].iloc[0])
+        df['place_id'] = [[f"gpid_{post_id}"] for post_id in df['postID']]
+        df['ig_mentions'] = [[""] for _ in df['postID']]
+
+        return df
+
+    return find_restaurant
+
+def test_branches_run_concurrently_and_concatenate_deterministically(monkeypatch):
+    barrier = threading.Barrier(3)
+    wait_order = []
+    find_restaurant = make_branch(barrier, wait_order)
+
+    df = pd.DataFrame({'postID': ["no", "yes", "maybe"], 'easy_map': ['No', 'Yes', 'Maybe']})
+    monkeypatch.setattr(pipeline_driver, 'CLASSIFY_BRANCHES_CONCURRENTLY', True)
+    monkeypatch.setattr(get_place_id, 'create_dataframe', lambda posts: df)
+    monkeypatch.setattr(get_place_id, 'resolve_usertags_for_posts', lambda df_maybe, df_no, bucket_name, file_path: {})
+
+    for branch in ['find_restaurant_for_yes', 'find_restaurant_for_maybe', 'find_restaurant_for_no']:
+        monkeypatch.setattr(get_place_id, branch, find_restaurant)
+
+    classified_posts_df, _ = classify_posts([])
+
+    assert len(wait_order) == 3
+    assert list(classified_posts_df['postID']) == ["yes", "maybe", "no"]
@@ -0,0 +1,133 @@
+# Dependencies
+import sys
+import os
+import datetime
+import sqlite3
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_delta_sync.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.pipeline_driver as pipeline_driver
+from src.services.post_cursor_store import PostCursorStore, CursorPipelines
+
+# Stand-ins for the upstream services
+def make_post(code: str, days_ago: int):
+    taken_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days_ago)
+
+    return {
+        'code': code,
+        'taken_at': taken_at.isoformat(),
+        'caption_text': f"Post {code}",
+        'resources': [],
+        'video_url': None,
+        'thumbnail_url': f"https://cdn.foncii.com/{code}.jpg",
+    }
+
+class FakeInstaScraper:
+    def __init__(self, posts, page_size = 2):
+        self.posts = posts
+        self.page_size = page_size
+        self.pages_fetched = 0
+
+    def get_user_id(self, username: str):
+        return "1"
+
+    def get_paginated_posts(self, user_id: str, end_cursor: str | None):
+        self.pages_fetched += 1
+        start = int(end_cursor or 0)
+        end = start + self.page_size
+        next_cursor = str(end) if end < len(self.posts) else None
+
+        return self.posts[start:end], next_cursor
+
+class FakeFonciiAPIService:
+    def __init__(self):
+        # Live source UIDs of the posts uploaded by each pipeline run
+        self.uploaded_posts = []
+
+    def start_run(self):
+        self.uploaded_posts.append([])
+
+    def ingest_instagram_post_batch(self, username, posts):
+        self.uploaded_posts[-1].extend(post['dataSource']['liveSourceUID'] for post in posts)
+        return True
+
+def run_ingestion_pipeline(api_service, **kwargs):
+    api_service.start_run()
+
+    return pipeline_driver.user_post_ingestion_pipeline("foncii", "foncii", post_amount=50, **kwargs)
+
+@pytest.fixture()
+def api_service(monkeypatch, tmp_path):
+    api_service = FakeFonciiAPIService()
+    monkeypatch.setattr(pipeline_driver, 'api_service', api_service)
+    monkeypatch.setattr(PostCursorStore, 'shared_instance', PostCursorStore(database_path=str(tmp_path / "cursors.db")))
+
+    yield api_service
+
+def test_sync_mode_only_ingests_new_posts(monkeypatch, api_service):
+    existing_posts = [make_post(f"old{i}", days_ago=10 + i) for i in range(6)]
+    monkeypatch.setattr(pipeline_driver, 'instascraper', FakeInstaScraper(existing_posts))
+
+    assert run_ingestion_pipeline(api_service)
+    assert api_service.uploaded_posts[-1] == [post['code'] for post in existing_posts]
+    assert PostCursorStore.shared().get_cursor(CursorPipelines.ingestion, "foncii", "foncii")['liveSourceUID'] == "old0"
+
+    # Two new posts published, with an old post pinned at the top of the gallery
+    pinned_post = make_post("pinned", days_ago=300)
+    new_posts = [make_post("new1", days_ago=1), make_post("new0", days_ago=2)]
+    instascraper = FakeInstaScraper([pinned_post, *new_posts, *existing_posts])
+    monkeypatch.setattr(pipeline_driver, 'instascraper', instascraper)
+
+    assert run_ingestion_pipeline(api_service, sync_mode=True)
+    assert api_service.uploaded_posts[-1] == ["new1", "new0"]
+    # Pagination stops at the cursor, give or take the page being prefetched
+    assert instascraper.pages_fetched <= 3
+    assert PostCursorStore.shared().get_cursor(CursorPipelines.ingestion, "foncii", "foncii")['liveSourceUID'] == "new1"
+
+def test_sync_mode_without_new_posts_uploads_nothing(monkeypatch, api_service):
+    posts = [make_post(f"old{i}", days_ago=10 + i) for i in range(3)]
+    monkeypatch.setattr(pipeline_driver, 'instascraper', FakeInstaScraper(posts))
+
+    run_ingestion_pipeline(api_service)
+
+    assert run_ingestion_pipeline(api_service, sync_mode=True)
+    assert api_service.uploaded_posts[-1] == []
+
+def test_cursors_are_kept_per_pipeline_and_foncii_user(monkeypatch, api_service):
+    posts = [make_post(f"old{i}", days_ago=10 + i) for i in range(3)]
+    monkeypatch.setattr(pipeline_driver, 'instascraper', FakeInstaScraper(posts))
+
+    run_ingestion_pipeline(api_service)
+
+    # The classification pipeline hasn't ingested these posts yet
+    assert PostCursorStore.shared().get_cursor(CursorPipelines.classification, "foncii", "foncii") == None
+
+    # Neither has any other Foncii user the account's posts are ingested into
+    api_service.start_run()
+    assert pipeline_driver.user_post_ingestion_pipeline("foncii", "foncii_test", post_amount=50, sync_mode=True)
+    assert api_service.uploaded_posts[-1] == [post['code'] for post in posts]
+
+def test_cursors_shared_across_pipelines_are_dropped(tmp_path):
+    database_path = str(tmp_path / "cursors.db")
+    legacy_connection = sqlite3.connect(database_path)
+
+    with legacy_connection:
+        legacy_connection.execute(
+            "CREATE TABLE post_cursors (instagram_username TEXT PRIMARY KEY, live_source_uid TEXT NOT NULL, post_creation_date INTEGER NOT NULL, updated_at INTEGER NOT NULL)"
+            )
+        legacy_connection.execute("INSERT INTO post_cursors VALUES ('foncii', 'old0', 0, 0)")
+
+    legacy_connection.close()
+
+    cursor_store = PostCursorStore(database_path=database_path)
+    assert cursor_store.get_cursor(CursorPipelines.ingestion, "foncii", "foncii") == None
+
+    cursor_store.save_cursor(CursorPipelines.ingestion, "foncii", "foncii", live_source_uid="new0", post_creation_date=1)
+    assert cursor_store.get_cursor(CursorPipelines.ingestion, "foncii", "foncii")['liveSourceUID'] == "new0"
@@ -0,0 +1,84 @@
+# Dependencies
+import sys
+import os
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_hiker_response_store.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.ttl_cache import TTLCache
+from src.services.insta_scraper_hiker import InstaScraper
+from src.services.hiker_response_store import HikerResponseStore, HikerResponseCacheModes, parse_hiker_response_cache_mode
+
+# Stand-ins for the upstream services
+class FakeHikerClient:
+    def __init__(self):
+        self.requests = 0
+
+    def user_by_username_v1(self, username: str):
+        self.requests += 1
+        return {'pk': "42", 'username': username}
+
+    def user_medias_chunk_v1(self, user_id: str, end_cursor: str | None):
+        self.requests += 1
+        page = int(end_cursor or 0)
+
+        return [[{'code': f"post{page}", 'caption_text': "Joe's Pizza 🍕"}], str(page + 1) if page < 2 else None]
+
+@pytest.fixture()
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(HikerResponseStore, 'shared_instance', HikerResponseStore(
+        database_path=str(tmp_path / "responses.db"),
+        blobs_directory=str(tmp_path / "blobs")
+        ))
+    monkeypatch.setattr(InstaScraper, 'profile_cache', TTLCache(max_entries=10, ttl_seconds=60))
+    client = FakeHikerClient()
+    monkeypatch.setattr(InstaScraper, 'create_client', lambda self: client)
+
+    yield client
+
+def paginate(scraper: InstaScraper):
+    user_id = scraper.get_user_id("foncii")
+    pages, cursor = [], None
+
+    while True:
+        posts, cursor = scraper.get_paginated_posts(user_id=user_id, end_cursor=cursor)
+        pages.append(posts)
+
+        if cursor is None:
+            return pages
+
+def test_recorded_pages_replay_without_hitting_hikerapi(monkeypatch, client):
+    recorded_pages = paginate(InstaScraper(response_cache_mode=HikerResponseCacheModes.record))
+    requests = client.requests
+
+    # Replays start from a cold profile cache, like a fresh process would
+    monkeypatch.setattr(InstaScraper, 'profile_cache', TTLCache(max_entries=10, ttl_seconds=60))
+
+    assert paginate(InstaScraper(response_cache_mode=HikerResponseCacheModes.replay)) == recorded_pages
+    assert client.requests == requests
+
+def test_identical_responses_share_a_blob(tmp_path):
+    store = HikerResponseStore(database_path=str(tmp_path / "responses.db"), blobs_directory=str(tmp_path / "blobs"))
+    page = [[{'code': "post0"}], None]
+
+    assert store.save_response('user_medias_chunk_v1', "1:", page) == store.save_response('user_medias_chunk_v1', "2:", page)
+    assert store.get_response('user_medias_chunk_v1', "2:") == page
+    assert sum(len(files) for _, _, files in os.walk(tmp_path / "blobs")) == 1
+
+def test_replaying_an_unrecorded_request_fails(client):
+    with pytest.raises(LookupError):
+        InstaScraper(response_cache_mode=HikerResponseCacheModes.replay).get_user_id("foncii")
+
+    assert client.requests == 0
+
+def test_unrecognized_cache_modes_turn_the_cache_off():
+    assert parse_hiker_response_cache_mode("record") == HikerResponseCacheModes.record
+    assert parse_hiker_response_cache_mode(" Replay ") == HikerResponseCacheModes.replay
+    assert parse_hiker_response_cache_mode("recording") == HikerResponseCacheModes.off
+    assert parse_hiker_response_cache_mode("") == HikerResponseCacheModes.off
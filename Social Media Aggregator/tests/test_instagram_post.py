@@ -0,0 +1,40 @@
+# Dependencies
+import sys
+import os
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_instagram_post.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.instagram_post import InstagramPost, InstagramPostMedia
+from tests.test_delta_sync import make_post
+
+def test_carousel_main_media_is_the_first_resource():
+    media = make_post("carousel", days_ago=1)
+    media['resources'] = [
+        {'video_url': "https://cdn.foncii.com/1.mp4", 'thumbnail_url': "https://cdn.foncii.com/1.jpg"},
+        {'video_url': None, 'thumbnail_url': "https://cdn.foncii.com/2.jpg"}
+    ]
+    media['usertags'] = [{'user': {'username': "joespizza"}}, {'user': {'username': "joespizza"}}]
+    media['location'] = {'name': "Joe's Pizza", 'address': "7 Carmine St", 'city': None}
+
+    post = InstagramPost.from_media(media)
+
+    assert post.media == InstagramPostMedia("https://cdn.foncii.com/1.mp4", "https://cdn.foncii.com/1.jpg", 'CAROUSEL_ALBUM')
+    assert post.secondary_media == (InstagramPostMedia("https://cdn.foncii.com/2.jpg", None, 'IMAGE'),)
+    assert post.usertags == ("joespizza",)
+    assert (post.location_name, post.location_address, post.location_city) == ("Joe's Pizza", "7 Carmine St", '')
+
+def test_single_media_post_without_tags_or_location():
+    post = InstagramPost.from_media(make_post("single", days_ago=1))
+
+    assert post.media == InstagramPostMedia("https://cdn.foncii.com/single.jpg", None, 'IMAGE')
+    assert post.secondary_media == None
+    assert post.usertags == ()
+    assert post.location_name == ''
+    # Only the used fields are kept, no per instance dict
+    assert not hasattr(post, '__dict__')
@@ -0,0 +1,114 @@
+# Dependencies
+import sys
+import os
+import time
+import pytest
+from instagrapi.exceptions import ChallengeRequired
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_instagrapi_session_pool.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.insta_scraper_irakli as insta_scraper_irakli
+from src.services.insta_scraper_irakli import InstaScraper, InstagrapiSessionPool, parse_accounts
+
+# Stand-in for the instagrapi client, serves 100 posts and can be made to challenge every request
+class FakeClient:
+    login_count = 0
+    challenged_usernames = set()
+
+    def __init__(self):
+        self.username = None
+        self.password = None
+
+    def login(self, username, password, relogin = False):
+        FakeClient.login_count += 1
+        self.username, self.password = username, password
+
+    def dump_settings(self, path):
+        with open(path, 'w') as session_file:
+            session_file.write("{}")
+
+    def load_settings(self, path):
+        pass
+
+    def user_id_from_username(self, username):
+        return self.__check_challenge() or "1"
+
+    def user_medias_paginated_v1(self, user_id, amount, end_cursor):
+        self.__check_challenge()
+        start = int(end_cursor or 0)
+        end = min(start + amount, 100)
+
+        return [f"{self.username}:{k}" for k in range(start, end)], str(end) if end < 100 else ""
+
+    def __check_challenge(self):
+        if self.username in FakeClient.challenged_usernames:
+            raise ChallengeRequired()
+
+@pytest.fixture(autouse=True)
+def fake_client():
+    FakeClient.login_count = 0
+    FakeClient.challenged_usernames = set()
+
+    yield FakeClient
+
+def make_pool(tmp_path, account_count: int, delay_range = (0.1, 0.1)):
+    accounts = [(f"scraper{k}", "password") for k in range(account_count)]
+
+    return InstagrapiSessionPool(accounts, delay_range=delay_range, cooldown_seconds=60, sessions_directory=str(tmp_path), create_client=FakeClient)
+
+def test_accounts_fall_back_to_the_legacy_account(monkeypatch):
+    monkeypatch.setattr(insta_scraper_irakli, 'LEGACY_USERNAME', "legacy")
+    monkeypatch.setattr(insta_scraper_irakli, 'LEGACY_PASSWORD', "legacy-password")
+
+    assert parse_accounts("scraper0:password0, scraper1:password1") == [("scraper0", "password0"), ("scraper1", "password1")]
+    assert parse_accounts("") == [("legacy", "legacy-password")]
+
+def test_missing_accounts_fail_clearly(monkeypatch):
+    monkeypatch.setattr(insta_scraper_irakli, 'LEGACY_USERNAME', "")
+    monkeypatch.setattr(insta_scraper_irakli, 'LEGACY_PASSWORD', "")
+
+    with pytest.raises(ValueError, match="INSTAGRAPI_ACCOUNTS"):
+        parse_accounts("")
+
+    # Accounts missing their password aren't usable either
+    with pytest.raises(ValueError):
+        parse_accounts("scraper0")
+
+def test_persisted_sessions_are_reused_without_logging_in(tmp_path):
+    make_pool(tmp_path, 2).perform(lambda client: client.user_id_from_username("foncii"))
+    assert FakeClient.login_count == 1
+
+    # A new process restores the session from disk
+    pool = make_pool(tmp_path, 2)
+
+    for _ in range(2):
+        pool.perform(lambda client: client.user_id_from_username("foncii"))
+
+    # Only the session that was never used before logs in
+    assert FakeClient.login_count == 2
+
+def test_requests_are_spread_across_paced_sessions(tmp_path):
+    pool = make_pool(tmp_path, 4, delay_range=(0.2, 0.2))
+    start_time = time.monotonic()
+
+    media = InstaScraper(session_pool=pool).get_media("foncii", 100)
+
+    # 5 requests (profile + 4 pages) one session at a time would take at least 0.8s of pacing
+    assert time.monotonic() - start_time < 0.6
+    assert len(media) == 100
+    assert sorted(session.request_count for session in pool.sessions) == [1, 1, 1, 2]
+
+def test_challenged_sessions_cool_down_and_requests_move_on(tmp_path):
+    FakeClient.challenged_usernames = {"scraper0"}
+    pool = make_pool(tmp_path, 2, delay_range=(0, 0))
+
+    assert pool.perform(lambda client: client.user_id_from_username("foncii")) == "1"
+    assert pool.perform(lambda client: client.user_id_from_username("foncii")) == "1"
+    # Only tried once, it's benched afterwards
+    assert [session.request_count for session in pool.sessions] == [1, 2]
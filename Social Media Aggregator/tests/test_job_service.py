@@ -0,0 +1,190 @@
+# Dependencies
+import sys
+import os
+import json
+import time
+import threading
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_job_service.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.app_service as app_service
+import src.services.job_service as job_service_module
+from src.services.job_service import JobService, JobStatus, JOB_STALE_AFTER_MS, current_time_ms
+from src.services.pipeline_progress import report_pipeline_stage
+
+# Stand-in pipelines
+release_pipeline = threading.Event()
+
+def staged_pipeline(instagram_username: str, post_amount: int):
+    report_pipeline_stage('aggregating_posts')
+    release_pipeline.wait(5)
+    report_pipeline_stage('uploading_posts')
+
+    return {'username': instagram_username, 'posts': post_amount}
+
+def rejected_upload_pipeline(instagram_username: str):
+    # A batch upload failed
+    return False
+
+def failing_pipeline(instagram_username: str):
+    raise RuntimeError("Upstream unavailable")
+
+@pytest.fixture()
+def job_service(tmp_path):
+    release_pipeline.clear()
+    job_service = JobService(
+        database_path=str(tmp_path / "jobs.db"),
+        worker_count=2,
+        pipelines={'staged': staged_pipeline, 'failing': failing_pipeline, 'rejected_upload': rejected_upload_pipeline}
+        )
+    job_service.start()
+
+    yield job_service
+
+    release_pipeline.set()
+    job_service.stop(timeout=5)
+
+def wait_for_status(job_service, job_id, statuses, stage=None, timeout=5):
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+        job = job_service.get_job(job_id)
+
+        if job['status'] in statuses and (stage is None or job['stage'] == stage):
+            return job
+
+        time.sleep(0.05)
+
+    raise TimeoutError(job_service.get_job(job_id))
+
+def test_jobs_report_stage_progress_and_results(job_service):
+    job = job_service.submit('staged', {'instagram_username': 'foncii', 'post_amount': 10})
+    # Jobs are marked as running when claimed, just before their pipeline reports its first stage
+    running_job = wait_for_status(job_service, job['jobID'], [JobStatus.running.value], stage='aggregating_posts')
+
+    assert job['status'] in [JobStatus.queued.value, JobStatus.running.value]
+    assert job_service.get_job_result(job['jobID']) is None
+
+    release_pipeline.set()
+    finished_job = wait_for_status(job_service, job['jobID'], [JobStatus.succeeded.value])
+
+    assert [stage['stage'] for stage in finished_job['stages']] == ['aggregating_posts', 'uploading_posts']
+    assert all(stage['finishedAt'] is not None for stage in finished_job['stages'])
+    assert running_job['stage'] == 'aggregating_posts'
+    assert job_service.get_job_result(job['jobID']) == {'username': 'foncii', 'posts': 10}
+
+def test_identical_submissions_are_deduplicated(job_service):
+    job = job_service.submit('staged', {'instagram_username': 'foncii', 'post_amount': 10})
+    resubmitted_job = job_service.submit('staged', {'post_amount': 10, 'instagram_username': 'foncii'})
+    other_job = job_service.submit('staged', {'instagram_username': 'foncii', 'post_amount': 20})
+
+    assert resubmitted_job['jobID'] == job['jobID']
+    assert other_job['jobID'] != job['jobID']
+
+    release_pipeline.set()
+    wait_for_status(job_service, job['jobID'], [JobStatus.succeeded.value])
+
+    # Recently succeeded jobs are reused as well
+    assert job_service.submit('staged', {'instagram_username': 'foncii', 'post_amount': 10})['jobID'] == job['jobID']
+
+def test_failed_jobs_are_retried_on_resubmission(job_service):
+    job = job_service.submit('failing', {'instagram_username': 'foncii'})
+    failed_job = wait_for_status(job_service, job['jobID'], [JobStatus.failed.value])
+
+    assert failed_job['error'] == "Upstream unavailable"
+    assert job_service.submit('failing', {'instagram_username': 'foncii'})['jobID'] != job['jobID']
+
+def test_pipelines_returning_false_fail_and_are_retried(job_service):
+    job = job_service.submit('rejected_upload', {'instagram_username': 'foncii'})
+    failed_job = wait_for_status(job_service, job['jobID'], [JobStatus.failed.value, JobStatus.succeeded.value])
+
+    assert failed_job['status'] == JobStatus.failed.value
+    assert failed_job['error'] == "Pipeline failed"
+    assert job_service.submit('rejected_upload', {'instagram_username': 'foncii'})['jobID'] != job['jobID']
+
+def test_unsupported_pipelines_are_rejected(job_service):
+    with pytest.raises(ValueError):
+        job_service.submit('unknown', {})
+
+def insert_orphaned_job(job_service, pipeline, parameters, updated_at):
+    # A job left running by a process that crashed mid pipeline
+    with job_service.lock, job_service.connection:
+        job_service.connection.execute(
+            """
+            INSERT INTO jobs (job_id, idempotency_key, pipeline, parameters, status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            ('orphaned', JobService.idempotency_key(pipeline, parameters), pipeline, json.dumps(parameters), JobStatus.running.value, updated_at, updated_at)
+            )
+
+def test_orphaned_jobs_are_requeued_while_workers_run(job_service):
+    parameters = {'instagram_username': 'foncii', 'post_amount': 10}
+    insert_orphaned_job(job_service, 'staged', parameters, current_time_ms() - JOB_STALE_AFTER_MS - 1)
+    job_service.jobs_available.set()
+
+    release_pipeline.set()
+
+    assert wait_for_status(job_service, 'orphaned', [JobStatus.succeeded.value])['status'] == JobStatus.succeeded.value
+
+def test_resubmissions_dont_attach_to_orphaned_jobs(tmp_path):
+    job_service = JobService(database_path=str(tmp_path / "jobs.db"), pipelines={'staged': staged_pipeline})
+    parameters = {'instagram_username': 'foncii', 'post_amount': 10}
+    insert_orphaned_job(job_service, 'staged', parameters, current_time_ms() - JOB_STALE_AFTER_MS - 1)
+
+    # The orphaned run is requeued rather than reported as running forever
+    assert job_service.submit('staged', parameters)['status'] == JobStatus.queued.value
+
+    # Jobs still sending heartbeats are reused as they are
+    other_parameters = {'instagram_username': 'foncii', 'post_amount': 20}
+    with job_service.lock, job_service.connection:
+        job_service.connection.execute("DELETE FROM jobs")
+
+    insert_orphaned_job(job_service, 'staged', other_parameters, current_time_ms())
+
+    assert job_service.submit('staged', other_parameters) == job_service.get_job('orphaned')
+    assert job_service.get_job('orphaned')['status'] == JobStatus.running.value
+
+def test_running_jobs_send_heartbeats(job_service, monkeypatch):
+    monkeypatch.setattr(job_service_module, 'JOB_HEARTBEAT_INTERVAL_MS', 50)
+
+    job = job_service.submit('staged', {'instagram_username': 'foncii', 'post_amount': 10})
+    running_job = wait_for_status(job_service, job['jobID'], [JobStatus.running.value], stage='aggregating_posts')
+    time.sleep(0.3)
+
+    # Still on the same stage, but marked as alive since
+    assert job_service.get_job(job['jobID'])['stage'] == 'aggregating_posts'
+    assert job_service.get_job(job['jobID'])['lastUpdated'] > running_job['lastUpdated']
+
+def test_concurrent_first_requests_share_one_job_service(monkeypatch):
+    created_job_services = []
+
+    class SlowJobService:
+        def __init__(self):
+            # Widens the window two first requests could both create a service in
+            time.sleep(0.05)
+            created_job_services.append(self)
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(app_service, 'JobService', SlowJobService)
+    monkeypatch.setattr(app_service.AppService, 'job_service', None)
+
+    job_services = []
+    requests = [threading.Thread(target=lambda: job_services.append(app_service.AppService.shared_job_service())) for _ in range(4)]
+
+    for request in requests:
+        request.start()
+
+    for request in requests:
+        request.join()
+
+    assert len(created_job_services) == 1
+    assert all(job_service is created_job_services[0] for job_service in job_services)
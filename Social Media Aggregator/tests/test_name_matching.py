@@ -0,0 +1,113 @@
+# Dependencies
+import sys
+import os
+import difflib
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_name_matching.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.name_matching import match_score, match_scores
+from src.services.get_place_id import level_confidence, TRUE_MATCH_SCORE_THRESHOLD
+
+# Regression set of past matches | (Instagram name or handle, Google place name, easy_map classification, is a true match)
+REGRESSION_SET = [
+    # Location names (Yes)
+    ("Carbone", "Carbone", "Yes", True),
+    ("Katz's Delicatessen", "Katz's Delicatessen", "Yes", True),
+    ("Balthazar Restaurant", "Balthazar", "Yes", True),
+    ("Cafe Mogador", "Café Mogador", "Yes", True),
+    ("Joe's Pizza", "Joe's Pizza Broadway", "Yes", True),
+    ("Peter Luger Steak House", "Peter Luger Steak House", "Yes", True),
+    ("L'Artusi", "L'Artusi", "Yes", True),
+    ("Via Carota", "Via Carota", "Yes", True),
+    ("Russ & Daughters", "Russ and Daughters", "Yes", True),
+    ("The Smith", "The Smith", "Yes", True),
+    ("Los Tacos No.1", "Los Tacos No. 1", "Yes", True),
+    ("Lilia Restaurant", "Lilia", "Yes", True),
+    ("Le Bernardin NYC", "Le Bernardin", "Yes", True),
+    ("Raku NYC", "Raku", "Yes", True),
+    ("Dante NYC", "Dante", "Yes", True),
+    ("Thai Diner", "Thai Diner", "Yes", True),
+    ("Soho House", "Sushi Nakazawa", "Yes", False),
+    ("Times Square", "Tim Ho Wan", "Yes", False),
+    # Non-Latin names
+    ("すし匠", "すし匠", "Yes", True),
+    ("Москва", "Москва", "Yes", True),
+    ("すし匠", "ラーメン一蘭", "Yes", False),
+    ("Москва", "Пекин", "Yes", False),
+    ("Москва", "Carbone", "Yes", False),
+    # Known false positives of the original scorer, kept to track them
+    ("Pizza", "Joe's Pizza", "Yes", False),
+    ("Central Park", "Central Perk Coffee", "Yes", False),
+    # Instagram handles (Maybe / No)
+    ("carbonenewyork", "Carbone", "Maybe", True),
+    ("lartusi_nyc", "L'Artusi", "Maybe", True),
+    ("joespizzanyc", "Joe's Pizza", "Maybe", True),
+    ("viacarota", "Via Carota", "Maybe", True),
+    ("katzsdeli", "Katz's Delicatessen", "Maybe", True),
+    ("russanddaughters", "Russ & Daughters", "Maybe", True),
+    ("lucali_bk", "Lucali", "Maybe", True),
+    ("dontangie", "Don Angie", "Maybe", True),
+    ("thaidiner", "Thai Diner", "Maybe", True),
+    ("cafe.mogador", "Café Mogador", "Maybe", True),
+    ("lilianewyork", "Lilia", "Maybe", True),
+    ("rubirosanyc", "Rubirosa", "No", True),
+    ("nytimes", "Nyonya", "Maybe", False),
+    ("timeoutnewyork", "Tim Ho Wan", "Maybe", False),
+    ("infatuation", "In-N-Out", "Maybe", False),
+    ("._", "Carbone", "Maybe", False),
+    ("carbonenewyork", "すし匠", "Maybe", False),
+    # Known false positives of the original scorer, kept to track them
+    ("eater", "Eataly NYC Flatiron", "Maybe", False),
+    ("johnny", "John's of Bleecker Street", "No", False),
+]
+
+CONFIDENCE_LEVEL_RANKING = ['', 'Low', 'Medium', 'High']
+
+# Original difflib based scorer, used as the calibration reference for the existing thresholds
+def legacy_match_score(name, google_name, is_easy_map):
+    if is_easy_map in ['No', 'Maybe', 'Unlikely']:
+        return difflib.SequenceMatcher(None, name.lower(), google_name.replace(' ','').lower()[:len(name)]).ratio()
+    else:
+        return difflib.SequenceMatcher(None, name.lower(), google_name.lower()).ratio()
+
+def confidence_rank(score):
+    return CONFIDENCE_LEVEL_RANKING.index(level_confidence(score))
+
+def test_true_matches_pass_the_match_threshold():
+    for name, google_name, is_easy_map, is_match in REGRESSION_SET:
+        if is_match:
+            assert match_score(name, google_name, is_easy_map) >= TRUE_MATCH_SCORE_THRESHOLD, (name, google_name)
+
+def test_true_matches_keep_their_confidence_level():
+    for name, google_name, is_easy_map, is_match in REGRESSION_SET:
+        if is_match:
+            legacy_score = legacy_match_score(name, google_name, is_easy_map)
+            score = match_score(name, google_name, is_easy_map)
+
+            assert confidence_rank(score) >= confidence_rank(legacy_score), (name, google_name)
+
+def test_rejected_non_matches_stay_rejected():
+    for name, google_name, is_easy_map, is_match in REGRESSION_SET:
+        if not is_match and legacy_match_score(name, google_name, is_easy_map) < TRUE_MATCH_SCORE_THRESHOLD:
+            assert match_score(name, google_name, is_easy_map) < TRUE_MATCH_SCORE_THRESHOLD, (name, google_name)
+
+def test_non_matches_are_never_high_confidence():
+    for name, google_name, is_easy_map, is_match in REGRESSION_SET:
+        if not is_match:
+            assert level_confidence(match_score(name, google_name, is_easy_map)) != 'High', (name, google_name)
+
+def test_batched_scores_match_individual_scores():
+    google_names = [google_name for _, google_name, _, _ in REGRESSION_SET]
+
+    for name, _, is_easy_map, _ in REGRESSION_SET:
+        batched_scores = match_scores(name, google_names, is_easy_map)
+        individual_scores = [match_score(name, google_name, is_easy_map) for google_name in google_names]
+
+        assert batched_scores == pytest.approx(individual_scores, abs=1e-6)
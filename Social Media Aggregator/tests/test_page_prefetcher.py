@@ -0,0 +1,78 @@
+# Dependencies
+import sys
+import os
+import time
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_page_prefetcher.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.page_prefetcher import PagePrefetcher
+
+PAGE_LATENCY_SECONDS = 0.05
+
+class FakePaginatedSource:
+    def __init__(self, page_count: int, fail_at_page: int | None = None):
+        self.page_count = page_count
+        self.fail_at_page = fail_at_page
+        self.pages_fetched = 0
+
+    def fetch_page(self, cursor: str | None):
+        page = int(cursor or 0)
+
+        if page == self.fail_at_page:
+            raise ConnectionError("Upstream unavailable")
+
+        time.sleep(PAGE_LATENCY_SECONDS)
+        self.pages_fetched += 1
+        next_cursor = str(page + 1) if page + 1 < self.page_count else None
+
+        return [page], next_cursor
+
+def test_pages_are_streamed_in_order():
+    source = FakePaginatedSource(page_count=5)
+
+    with PagePrefetcher(source.fetch_page) as pages:
+        streamed_pages = [items for items, _ in pages]
+
+    assert streamed_pages == [[0], [1], [2], [3], [4]]
+
+def test_fetching_overlaps_with_processing():
+    source = FakePaginatedSource(page_count=5)
+    start_time = time.perf_counter()
+
+    with PagePrefetcher(source.fetch_page) as pages:
+        for _ in pages:
+            # Processing takes as long as fetching a page
+            time.sleep(PAGE_LATENCY_SECONDS)
+
+    elapsed_time = time.perf_counter() - start_time
+
+    # Sequential fetch + process would take 10 page latencies
+    assert elapsed_time < 8 * PAGE_LATENCY_SECONDS
+
+def test_stopping_early_cancels_prefetching():
+    source = FakePaginatedSource(page_count=100)
+
+    with PagePrefetcher(source.fetch_page, prefetch_depth=1) as pages:
+        for items, _ in pages:
+            if items == [2]:
+                break
+
+    time.sleep(5 * PAGE_LATENCY_SECONDS)
+
+    # Only the bounded amount of pages ahead of the consumer are ever fetched
+    assert source.pages_fetched <= 6
+
+def test_fetch_errors_are_raised_to_the_consumer():
+    source = FakePaginatedSource(page_count=5, fail_at_page=2)
+
+    with pytest.raises(ConnectionError):
+        with PagePrefetcher(source.fetch_page) as pages:
+            for _ in pages:
+                pass
@@ -0,0 +1,35 @@
+# Dependencies
+import sys
+import os
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_pipeline_benchmark.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from tests.misc.pipeline_benchmark import run_benchmark
+
+# Smoke tests keeping the offline benchmark harness in sync with the pipelines it drives
+def test_ingestion_pipeline_runs_offline():
+    report = run_benchmark(post_count=100, pipeline='ingest')
+
+    assert report['succeeded']
+    assert report['ingestedPostCount'] == 100
+    assert report['upstreamRequests']['google'] == 0
+
+def test_classification_pipeline_runs_offline():
+    report = run_benchmark(post_count=60, pipeline='classify')
+
+    assert report['succeeded']
+    assert report['ingestedPostCount'] == 60
+    assert report['upstreamRequests']['google'] > 0
+    assert set(report['stageSeconds']) == {'aggregating_posts', 'classifying_posts', 'uploading_posts'}
+
+def test_injected_upstream_errors_fail_the_run():
+    report = run_benchmark(post_count=100, pipeline='ingest', error_rate=1)
+
+    assert not report['succeeded']
+    assert report['upstreamErrors']['hikerapi'] > 0
@@ -0,0 +1,89 @@
+# Dependencies
+import sys
+import os
+import time
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_pipeline_metrics.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.pipeline_metrics import MetricsRecorder, record_pipeline_metrics_to, trace_span, increment_counter, process_metrics
+from src.services.pipeline_progress import report_pipeline_stage
+from src.services.stream_buffering import buffered
+from src.services.job_service import JobService, JobStatus
+from tests.misc.pipeline_benchmark import run_benchmark
+
+# Stand-in pipelines
+def instrumented_pipeline(instagram_username: str):
+    report_pipeline_stage('aggregating_posts')
+
+    with trace_span('fetch_page'):
+        increment_counter('upstream_requests.hikerapi')
+
+    return True
+
+def test_runs_record_their_own_spans_and_counters():
+    process_spans_before = process_metrics.snapshot()['spans'].get('fetch_page', {}).get('count', 0)
+    run_metrics = MetricsRecorder()
+
+    def background_stage():
+        # Stages buffered on other threads still record to the same run
+        increment_counter('posts_fetched', 5)
+        yield 1
+
+    with record_pipeline_metrics_to(run_metrics):
+        with trace_span('fetch_page'):
+            time.sleep(0.01)
+
+        list(buffered(background_stage(), buffer_size=1))
+
+    # Recorded outside of any run
+    increment_counter('posts_fetched', 100)
+
+    snapshot = run_metrics.snapshot()
+
+    assert snapshot['counters'] == {'posts_fetched': 5}
+    assert snapshot['spans']['fetch_page']['count'] == 1
+    assert snapshot['spans']['fetch_page']['totalSeconds'] >= 0.01
+    assert process_metrics.snapshot()['spans']['fetch_page']['count'] == process_spans_before + 1
+
+def test_spans_are_recorded_when_the_block_raises():
+    run_metrics = MetricsRecorder()
+
+    with pytest.raises(ValueError), record_pipeline_metrics_to(run_metrics), trace_span('upload_posts'):
+        raise ValueError("Upload failed")
+
+    assert run_metrics.snapshot()['spans']['upload_posts']['count'] == 1
+
+def test_job_status_includes_the_pipeline_metrics(tmp_path):
+    job_service = JobService(database_path=str(tmp_path / "jobs.db"), worker_count=1, pipelines={'instrumented': instrumented_pipeline})
+    job_service.start()
+
+    try:
+        job = job_service.submit('instrumented', {'instagram_username': 'foncii'})
+        deadline = time.time() + 5
+
+        while job_service.get_job(job['jobID'])['status'] != JobStatus.succeeded.value and time.time() < deadline:
+            time.sleep(0.05)
+
+        metrics = job_service.get_job(job['jobID'])['metrics']
+    finally:
+        job_service.stop(timeout=5)
+
+    assert metrics['counters'] == {'upstream_requests.hikerapi': 1}
+    assert metrics['spans']['fetch_page']['count'] == 1
+
+def test_classification_run_records_every_stage_span():
+    report = run_benchmark(post_count=60, pipeline='classify')
+    spans = report['metrics']['spans']
+    counters = report['metrics']['counters']
+
+    assert {'fetch_page', 'parse_posts', 'build_dataframe', 'find_restaurant_for_yes', 'find_restaurant_for_maybe', 'find_restaurant_for_no', 'upload_posts'} <= set(spans)
+    assert counters['posts_fetched'] == counters['posts_uploaded'] == 60
+    assert counters['upstream_requests.google'] > 0
+    assert counters['bytes_sent.foncii'] > 0
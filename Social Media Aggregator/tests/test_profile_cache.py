@@ -0,0 +1,77 @@
+# Dependencies
+import sys
+import os
+import time
+import threading
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_profile_cache.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.ttl_cache import TTLCache
+from src.services.insta_scraper_hiker import InstaScraper
+
+# Stand-ins for the upstream services
+class FakeHikerClient:
+    def __init__(self, latency: float = 0):
+        self.latency = latency
+        self.profile_lookups = 0
+
+    def user_by_username_v1(self, username: str):
+        self.profile_lookups += 1
+        time.sleep(self.latency)
+
+        if username == "unknown":
+            return {'detail': "Target user not found"}
+
+        return {'pk': f"pk_{username}", 'username': username}
+
+@pytest.fixture()
+def client(monkeypatch):
+    monkeypatch.setattr(InstaScraper, 'profile_cache', TTLCache(max_entries=10, ttl_seconds=60))
+    client = FakeHikerClient(latency=0.05)
+    monkeypatch.setattr(InstaScraper, 'create_client', lambda self: client)
+
+    yield client
+
+def test_cache_expires_and_evicts_least_recently_used_entries():
+    cache = TTLCache(max_entries=2, ttl_seconds=0.1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    time.sleep(0.15)
+    assert cache.get("a") is None
+
+def test_profile_lookups_are_shared_across_stages_and_scrapers(client):
+    assert InstaScraper().get_user_info("Foncii")['username'] == "Foncii"
+    assert InstaScraper().get_user_id("foncii") == "pk_Foncii"
+    assert client.profile_lookups == 1
+
+def test_concurrent_lookups_of_the_same_user_collapse_into_one(client):
+    scraper = InstaScraper()
+    threads = [threading.Thread(target=scraper.get_user_id, args=("foncii",)) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client.profile_lookups == 1
+    assert InstaScraper.profile_cache.hits == 7
+
+def test_error_responses_are_not_cached(client):
+    scraper = InstaScraper()
+    scraper.get_user_info("unknown")
+    scraper.get_user_info("unknown")
+
+    assert client.profile_lookups == 2
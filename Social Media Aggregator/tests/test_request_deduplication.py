@@ -0,0 +1,115 @@
+# Dependencies
+import sys
+import os
+import threading
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_request_deduplication.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.app_service as app_service
+from src.services.app_service import AppService, Endpoints, IDEMPOTENCY_KEY_HEADER
+from src.services.request_deduplication import RequestDeduplicator
+
+def test_concurrent_duplicates_attach_to_the_running_request():
+    deduplicator = RequestDeduplicator()
+    request_started = threading.Event()
+    release_request = threading.Event()
+    run_count = 0
+
+    def perform_request():
+        nonlocal run_count
+        run_count += 1
+        request_started.set()
+        release_request.wait(timeout=2)
+
+        return ["post"]
+
+    results = []
+    first_request = threading.Thread(target=lambda: results.append(deduplicator.run("key", perform_request)))
+    first_request.start()
+    request_started.wait(timeout=2)
+
+    duplicate_requests = [threading.Thread(target=lambda: results.append(deduplicator.run("key", perform_request))) for _ in range(3)]
+
+    for duplicate_request in duplicate_requests:
+        duplicate_request.start()
+
+    release_request.set()
+
+    for thread in [first_request, *duplicate_requests]:
+        thread.join(timeout=2)
+
+    assert results == [["post"]] * 4
+    assert run_count == 1
+    # Recently completed, served without running it again
+    assert deduplicator.run("key", perform_request) == ["post"]
+    assert run_count == 1
+
+def test_failures_are_shared_but_not_remembered():
+    deduplicator = RequestDeduplicator()
+
+    def failing_request():
+        raise ValueError("Upstream failure")
+
+    with pytest.raises(ValueError):
+        deduplicator.run("key", failing_request)
+
+    assert deduplicator.run("key", lambda: False) == False
+    assert deduplicator.run("key", lambda: True) == True
+    assert deduplicator.in_flight_requests == {}
+
+def test_endpoint_deduplicates_on_request_parameters_and_idempotency_key(monkeypatch):
+    ingested_accounts = []
+
+    def ingestion_pipeline(instagram_username, foncii_username, post_amount, sync_mode):
+        ingested_accounts.append(instagram_username)
+        return True
+
+    monkeypatch.setattr(app_service.pipeline_driver, 'user_post_ingestion_pipeline', ingestion_pipeline)
+    monkeypatch.setattr(AppService, 'request_deduplicator', RequestDeduplicator())
+    monkeypatch.setattr(AppService, 'stored_api_key', "key")
+    client = AppService.app.test_client()
+
+    def ingest(instagram_username: str, headers = {}):
+        return client.post(
+            Endpoints.ingest_posts_ig.value,
+            json={'instagramUsername': instagram_username, 'fonciiUsername': "foncii", 'postAmount': 10},
+            headers={'API_KEY': "key", **headers}
+            )
+
+    assert ingest("Foncii").status_code == 200
+    assert ingest("foncii").status_code == 200
+    assert ingest("foncii", headers={IDEMPOTENCY_KEY_HEADER: "retry-1"}).status_code == 200
+    assert ingest("someone_else", headers={IDEMPOTENCY_KEY_HEADER: "retry-1"}).status_code == 200
+
+    assert ingested_accounts == ["Foncii", "foncii"]
+
+def test_endpoint_only_syncs_when_sync_mode_is_true(monkeypatch):
+    sync_modes = []
+
+    def ingestion_pipeline(instagram_username, foncii_username, post_amount, sync_mode):
+        sync_modes.append(sync_mode)
+        return True
+
+    monkeypatch.setattr(app_service.pipeline_driver, 'user_post_ingestion_pipeline', ingestion_pipeline)
+    monkeypatch.setattr(AppService, 'request_deduplicator', RequestDeduplicator())
+    monkeypatch.setattr(AppService, 'stored_api_key', "key")
+    client = AppService.app.test_client()
+
+    # Each flag gets its own idempotency key so none of the requests are deduplicated
+    for index, flag in enumerate([True, "True", False, "false", "False", 0, None]):
+        response = client.post(
+            Endpoints.ingest_posts_ig.value,
+            json={'instagramUsername': "foncii", 'fonciiUsername': "foncii", 'postAmount': 10, 'syncMode': flag},
+            headers={'API_KEY': "key", IDEMPOTENCY_KEY_HEADER: f"sync-{index}"}
+            )
+
+        assert response.status_code == 200
+
+    assert sync_modes == [True, True, False, False, False, False, False]
@@ -0,0 +1,65 @@
+# Dependencies
+import sys
+import os
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_restaurant_gazetteer.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from src.services.restaurant_gazetteer import RestaurantGazetteer
+
+@pytest.fixture()
+def gazetteer(tmp_path):
+    gazetteer = RestaurantGazetteer(database_path=str(tmp_path / "gazetteer.db"))
+    gazetteer.record_place("gpid_carbone", "Carbone", "181 Thompson St New York")
+    gazetteer.record_place("gpid_joes_carmine", "Joe's Pizza", "7 Carmine St New York")
+    gazetteer.record_place("gpid_joes_broadway", "Joe's Pizza", "1435 Broadway New York")
+
+    yield gazetteer
+
+def test_handles_resolve_to_indexed_places(gazetteer):
+    match = gazetteer.find_place_for_handle("carbonenewyork")
+
+    assert match["place_id"] == "gpid_carbone"
+    assert gazetteer.find_place_for_handle("eater") is None
+
+def test_names_resolve_to_the_location_at_the_given_address(gazetteer):
+    assert gazetteer.find_place_for_name("Joe's Pizza", address="1435 Broadway New York")["place_id"] == "gpid_joes_broadway"
+    assert gazetteer.find_place_for_name("Joe's Pizza", address="7 Carmine St")["place_id"] == "gpid_joes_carmine"
+    assert gazetteer.find_place_for_name("Joe's Pizza", address="99 Nowhere Ave") is None
+
+def test_names_at_a_different_house_number_on_the_same_street_arent_resolved(gazetteer):
+    gazetteer.record_place("gpid_shake_shack_8th_ave", "Shake Shack", "691 8th Ave New York")
+
+    assert gazetteer.find_place_for_name("Shake Shack", address="691 8th Ave New York")["place_id"] == "gpid_shake_shack_8th_ave"
+    assert gazetteer.find_place_for_name("Shake Shack", address="600 8th Ave New York") is None
+    assert gazetteer.find_place_for_name("Joe's Pizza", address="1453 Broadway New York") is None
+
+def test_usertag_dictionary_import(gazetteer):
+    gazetteer.import_usertag_dictionary({
+        "lartusi_nyc": {"score": 0.9, "place_id": "gpid_lartusi", "name": "L'Artusi", "type": ["restaurant"]},
+        "nike": {"score": 0, "place_id": "", "name": "", "type": ["store"]},
+    })
+
+    assert gazetteer.find_handle("nike")["place_id"] == ""
+    assert gazetteer.find_handle("unknown") is None
+    assert gazetteer.find_place_for_handle("lartusi")["place_id"] == "gpid_lartusi"
+
+def test_index_persists_on_disk(gazetteer):
+    reopened_gazetteer = RestaurantGazetteer(database_path=gazetteer.database_path)
+
+    assert reopened_gazetteer.find_place_for_name("Carbone")["place_id"] == "gpid_carbone"
+
+def test_handles_matching_several_locations_arent_resolved(gazetteer):
+    # Either location of the chain could be the one tagged
+    assert gazetteer.find_place_for_handle("joespizzanyc") is None
+    assert gazetteer.find_place_for_name("Joe's Pizza") is None
+
+    # Places that merely share part of the name aren't mistaken for other locations
+    gazetteer.record_place("gpid_carbonara", "Carbonara Bar", "1 Mott St New York")
+    assert gazetteer.find_place_for_handle("carbonenewyork")["place_id"] == "gpid_carbone"
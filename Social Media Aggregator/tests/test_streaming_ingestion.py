@@ -0,0 +1,93 @@
+# Dependencies
+import sys
+import os
+import threading
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_streaming_ingestion.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.pipeline_driver as pipeline_driver
+from src.services.post_cursor_store import PostCursorStore, CursorPipelines
+from src.services.stream_buffering import buffered, batched
+from tests.test_delta_sync import make_post, FakeInstaScraper
+
+# Stand-ins for the upstream services
+class RecordingFonciiAPIService:
+    def __init__(self, instascraper, fail_on_batch: int | None = None):
+        self.instascraper = instascraper
+        self.fail_on_batch = fail_on_batch
+        # Amount of pages fetched by the time each batch was uploaded
+        self.pages_fetched_per_upload = []
+
+    def ingest_instagram_post_batch(self, username, posts):
+        self.pages_fetched_per_upload.append(self.instascraper.pages_fetched)
+        return len(self.pages_fetched_per_upload) != self.fail_on_batch
+
+@pytest.fixture()
+def cursor_store(monkeypatch, tmp_path):
+    cursor_store = PostCursorStore(database_path=str(tmp_path / "cursors.db"))
+    monkeypatch.setattr(PostCursorStore, 'shared_instance', cursor_store)
+
+    yield cursor_store
+
+def test_buffered_preserves_order_and_reraises_stage_errors():
+    assert list(buffered(iter(range(100)), buffer_size=3)) == list(range(100))
+
+    def failing_stage():
+        yield 1
+        raise ValueError("Upstream failure")
+
+    items = buffered(failing_stage(), buffer_size=3)
+
+    assert next(items) == 1
+    with pytest.raises(ValueError):
+        next(items)
+
+def test_closing_buffered_stream_stops_the_stage():
+    stage_closed = threading.Event()
+
+    def endless_stage():
+        try:
+            while True:
+                yield 1
+        finally:
+            stage_closed.set()
+
+    items = buffered(endless_stage(), buffer_size=2)
+    next(items)
+    items.close()
+
+    assert stage_closed.wait(timeout=2)
+
+def test_batched_keeps_the_remainder():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+def test_first_batch_uploads_before_the_last_page_is_fetched(monkeypatch, cursor_store):
+    posts = [make_post(f"post{i}", days_ago=i) for i in range(400)]
+    instascraper = FakeInstaScraper(posts, page_size=20)
+    api_service = RecordingFonciiAPIService(instascraper)
+    monkeypatch.setattr(pipeline_driver, 'instascraper', instascraper)
+    monkeypatch.setattr(pipeline_driver, 'api_service', api_service)
+
+    assert pipeline_driver.user_post_ingestion_pipeline("foncii", "foncii", post_amount=400)
+    assert len(api_service.pages_fetched_per_upload) == 10
+    # Only the buffered pages and batches run ahead of the first upload
+    assert api_service.pages_fetched_per_upload[0] < 12
+    assert cursor_store.get_cursor(CursorPipelines.ingestion, "foncii", "foncii")['liveSourceUID'] == "post0"
+
+def test_failed_upload_stops_scraping_and_keeps_the_cursor(monkeypatch, cursor_store):
+    posts = [make_post(f"post{i}", days_ago=i) for i in range(400)]
+    instascraper = FakeInstaScraper(posts, page_size=20)
+    api_service = RecordingFonciiAPIService(instascraper, fail_on_batch=1)
+    monkeypatch.setattr(pipeline_driver, 'instascraper', instascraper)
+    monkeypatch.setattr(pipeline_driver, 'api_service', api_service)
+
+    assert pipeline_driver.user_post_ingestion_pipeline("foncii", "foncii", post_amount=400) == False
+    assert instascraper.pages_fetched < 20
+    assert cursor_store.get_cursor(CursorPipelines.ingestion, "foncii", "foncii") == None
@@ -0,0 +1,112 @@
+# Dependencies
+import sys
+import os
+import threading
+import pytest
+
+# Construct Python path env variable
+# Get the directory of the current script (tests/test_usertag_resolution.py)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add the parent directory of the current directory to the Python path
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import src.services.get_place_id as get_place_id
+from src.services.instagram_post import InstagramPost
+from src.services.restaurant_gazetteer import RestaurantGazetteer
+from src.services.rate_limiter import rate_limit_tenant, current_rate_limit_tenant
+from src.services.pipeline_metrics import MetricsRecorder, record_pipeline_metrics_to, increment_counter
+from tests.test_delta_sync import make_post
+
+# Stand-ins for Google and the usertag dictionary stored on GCS
+class RecordingGoogleMaps:
+    def __init__(self, places):
+        # Usertag -> Google place name
+        self.places = places
+        self.lock = threading.Lock()
+        self.queries = []
+
+    def find_place(self, query):
+        usertag = query.split(' ')[0]
+
+        with self.lock:
+            self.queries.append(query)
+
+        if usertag not in self.places:
+            return {'candidates': []}
+
+        return {'candidates': [{'place_id': f"gpid_{usertag}", 'name': self.places[usertag], 'types': ['restaurant']}]}
+
+@pytest.fixture()
+def google_maps(monkeypatch, tmp_path):
+    google_maps = RecordingGoogleMaps({'lartusi': "L'Artusi", 'carbonenyc': "Carbone"})
+    uploaded_dictionaries = []
+    monkeypatch.setattr(get_place_id, 'google_maps_api', google_maps.find_place)
+    monkeypatch.setattr(get_place_id, 'download_json_from_gcs', lambda bucket_name, file_path: {})
+    monkeypatch.setattr(get_place_id, 'upload_dict_to_gcs', lambda bucket_name, dict_data, file_path: uploaded_dictionaries.append(dict(dict_data)))
+    monkeypatch.setattr(RestaurantGazetteer, 'shared_instance', RestaurantGazetteer(database_path=str(tmp_path / "gazetteer.db")))
+    google_maps.uploaded_dictionaries = uploaded_dictionaries
+
+    yield google_maps
+
+def make_tagged_post(code: str, usertags: list[str]):
+    media = make_post(code, days_ago=1)
+    media['usertags'] = [{'user': {'username': usertag}} for usertag in usertags]
+
+    return InstagramPost.from_media(media)
+
+def test_shared_tags_are_resolved_once_and_fanned_out(google_maps):
+    posts = [make_tagged_post(f"post{i}", ['lartusi', 'eater'] if i % 2 else ['lartusi']) for i in range(20)]
+    # Too many tags to be a 'Maybe' post, only resolved offline
+    posts.append(make_tagged_post("crowded", ['lartusi', 'carbonenyc', *[f"friend{i}" for i in range(10)]]))
+
+    df = get_place_id.create_dataframe(posts)
+    df_maybe = df[df.easy_map == 'Maybe'].copy()
+    df_no = df[df.easy_map == 'No'].copy()
+
+    resolved_usertags = get_place_id.resolve_usertags_for_posts(df_maybe, df_no, "bucket", "usertags.json")
+    df_maybe = get_place_id.find_restaurant_for_maybe(df_maybe, "bucket", "usertags.json", resolved_usertags=resolved_usertags)
+    df_no = get_place_id.find_restaurant_for_no(df_no, "bucket", "usertags.json", resolved_usertags=resolved_usertags)
+
+    # One Google lookup per unique 'Maybe' tag, and the dictionary is only saved once
+    assert sorted(query.split(' ')[0] for query in google_maps.queries) == ['eater', 'lartusi']
+    assert len(google_maps.uploaded_dictionaries) == 1
+    # Tags without any Google candidate aren't saved
+    assert set(google_maps.uploaded_dictionaries[0]) == {'lartusi'}
+
+    assert all(place_ids == ['gpid_lartusi'] for place_ids in df_maybe['place_id'])
+    # The 'No' post reuses the tag resolved for the 'Maybe' posts
+    assert list(df_no['place_id']) == [['gpid_lartusi']]
+
+def test_lookups_keep_the_callers_tenant_and_metrics(google_maps, monkeypatch):
+    tenants = []
+
+    def find_place(query):
+        tenants.append(current_rate_limit_tenant.get())
+        increment_counter('upstream_requests.google')
+
+        return google_maps.find_place(query)
+
+    monkeypatch.setattr(get_place_id, 'google_maps_api', find_place)
+    recorder = MetricsRecorder()
+    usertag_queries = {'lartusi': "lartusi New York", 'carbonenyc': "carbonenyc New York"}
+
+    with rate_limit_tenant("bulk_account"), record_pipeline_metrics_to(recorder):
+        get_place_id.resolve_usertags(usertag_queries, {})
+
+    assert tenants == ["bulk_account", "bulk_account"]
+    assert recorder.snapshot()['counters']['upstream_requests.google'] == 2
+
+def test_chain_handles_arent_saved_as_one_of_their_locations(google_maps):
+    gazetteer = RestaurantGazetteer.shared()
+    gazetteer.record_place("gpid_joes_carmine", "Joe's Pizza", "7 Carmine St New York")
+    gazetteer.record_place("gpid_joes_broadway", "Joe's Pizza", "1435 Broadway New York")
+
+    dic_usertags = {}
+    resolved_usertags = get_place_id.resolve_usertags({'joespizza': "joespizza Joe's Pizza New York", 'joespizzanyc': None}, dic_usertags)
+
+    # Looked up on Google with the post's location instead, or left unresolved without one
+    assert [query.split(' ')[0] for query in google_maps.queries] == ['joespizza']
+    assert resolved_usertags['joespizzanyc']['source'] == 'none'
+    assert 'joespizzanyc' not in dic_usertags